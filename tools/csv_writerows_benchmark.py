@@ -0,0 +1,89 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+# This utility measures writing a large query result as CSV (as done by the
+# query tool download) in the blocks of rows using writer.writerows_block,
+# compared to writer.writerows (i.e. preparing each field by the quote
+# strategy).
+
+from __future__ import print_function
+import argparse
+import os
+import sys
+import time
+
+WEB_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'web'
+)
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+
+def writerows_stats(num_rows, block_size):
+    sys.path.insert(0, WEB_DIR)
+    from pgadmin.utils import csv
+
+    column_kinds = [
+        csv.NUMBER_COLUMN, csv.TEXT_COLUMN, csv.NUMBER_COLUMN,
+        csv.TEXT_COLUMN, csv.NUMBER_COLUMN
+    ]
+    block = [
+        [i, u'name %d' % i, i * 0.5, None if i % 3 else u'x"y', True]
+        for i in range(block_size)
+    ]
+    blocks = num_rows // block_size
+
+    rows_output = StringIO()
+    writer = csv.writer(rows_output, quoting=csv.QUOTE_NONNUMERIC)
+    start = time.time()
+    for _ in range(blocks):
+        writer.writerows(block)
+    rows_time = time.time() - start
+
+    block_output = StringIO()
+    writer = csv.writer(block_output, quoting=csv.QUOTE_NONNUMERIC)
+    start = time.time()
+    for _ in range(blocks):
+        writer.writerows_block(block, column_kinds)
+    block_time = time.time() - start
+
+    return {
+        'rows': blocks * block_size,
+        'writerows_time': rows_time,
+        'writerows_block_time': block_time,
+        'same_output': rows_output.getvalue() == block_output.getvalue(),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Measure writing a large result as CSV.'
+    )
+    parser.add_argument(
+        '--rows', type=int, default=1000000,
+        help='Number of the rows to write'
+    )
+    parser.add_argument(
+        '--block-size', type=int, default=2000,
+        help='Number of the rows of each block (i.e. the fetch size)'
+    )
+    args = parser.parse_args()
+
+    stats = writerows_stats(args.rows, args.block_size)
+
+    print('Rows:              {0}'.format(stats['rows']))
+    print('writerows:         {0:.2f}s'.format(stats['writerows_time']))
+    print('writerows_block:   {0:.2f}s ({1:.1f}x)'.format(
+        stats['writerows_block_time'],
+        stats['writerows_time'] / stats['writerows_block_time']
+    ))
+    print('Same output:       {0}'.format(stats['same_output']))
@@ -0,0 +1,111 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+# This utility measures the generation of the profiler report data for a
+# large number of functions, with a simulated network round trip time on
+# each query (using the synthetic plprofiler data of the profiler tests).
+# It is compared to fetching the function definitions using one query per
+# function, as done by the report generation before.
+
+from __future__ import print_function
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+WEB_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'web'
+)
+
+
+def create_app(sqlite_path):
+    sys.path.insert(0, WEB_DIR)
+    os.chdir(WEB_DIR)
+
+    import config
+    config.SERVER_MODE = False
+    config.UPGRADE_CHECK_ENABLED = False
+    config.SQLITE_PATH = sqlite_path
+
+    from logging import WARNING
+    config.CONSOLE_LOG_LEVEL = WARNING
+
+    from pgadmin.model import SCHEMA_VERSION
+    config.SETTINGS_SCHEMA_VERSION = SCHEMA_VERSION
+
+    from pgadmin import create_app
+    return create_app()
+
+
+def per_function_func_defs(conn, func_oids):
+    """
+    Fetch the function definitions using one query per function.
+    """
+    from flask import render_template
+
+    sql = render_template(
+        'profiler/sql/get_func_defs.sql', data_location='shared'
+    )
+    for func_oid in func_oids:
+        conn.execute_async_list(sql, {'func_oids': [func_oid]})
+
+
+def report_stats(num_funcs, round_trip_time):
+    from pgadmin.tools.profiler import _generate_report
+    from pgadmin.tools.profiler.tests.test_report_queries import \
+        FakeProfilerConnection
+
+    conn = FakeProfilerConnection(num_funcs, round_trip_time)
+    start = time.time()
+    _generate_report(conn, 'shared', func_oids={}, opt_top=num_funcs)
+    report_time = time.time() - start
+    report_queries = conn.queries
+
+    conn = FakeProfilerConnection(num_funcs, round_trip_time)
+    start = time.time()
+    per_function_func_defs(conn, conn.func_oids)
+
+    return {
+        'report_time': report_time,
+        'report_queries': report_queries,
+        'per_function_time': time.time() - start,
+        'per_function_queries': conn.queries,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Measure the generation of the profiler report data.'
+    )
+    parser.add_argument(
+        '--functions', type=int, default=500,
+        help='Number of the profiled functions'
+    )
+    parser.add_argument(
+        '--round-trip', type=float, default=2.0, metavar='MS',
+        help='Simulated round trip time of each query (in milliseconds)'
+    )
+    parser.add_argument(
+        '--sqlite-path',
+        default=os.path.join(tempfile.gettempdir(), 'pgadmin4-startup.db'),
+        help='Path of the configuration database to be used'
+    )
+    args = parser.parse_args()
+
+    app = create_app(os.path.abspath(args.sqlite_path))
+    with app.app_context():
+        stats = report_stats(args.functions, args.round_trip / 1000.0)
+
+    print('Report data:                {0:.0f}ms ({1} queries)'.format(
+        stats['report_time'] * 1000, stats['report_queries']
+    ))
+    print('Per function definitions:   {0:.0f}ms ({1} queries)'.format(
+        stats['per_function_time'] * 1000, stats['per_function_queries']
+    ))
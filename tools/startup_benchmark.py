@@ -0,0 +1,100 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+# This utility measures the startup of the pgAdmin application, i.e. the
+# wall time of create_app(), and the number of the modules imported by it.
+# The application is created in the desktop mode, using a separate
+# configuration database (created, and upgraded, by the first run - hence,
+# measure the later runs).
+#
+# Run with 'python -X importtime' (Python 3.7+) to get the import time of
+# each module, or use --profile to save the profile of create_app().
+
+from __future__ import print_function
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+WEB_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'web'
+)
+
+
+def create_app_stats(sqlite_path, profile_file=None):
+    sys.path.insert(0, WEB_DIR)
+    os.chdir(WEB_DIR)
+
+    start = time.time()
+    modules = len(sys.modules)
+
+    import config
+    config.SERVER_MODE = False
+    config.UPGRADE_CHECK_ENABLED = False
+    config.SQLITE_PATH = sqlite_path
+
+    from logging import WARNING
+    config.CONSOLE_LOG_LEVEL = WARNING
+
+    from pgadmin.model import SCHEMA_VERSION
+    config.SETTINGS_SCHEMA_VERSION = SCHEMA_VERSION
+
+    from pgadmin import create_app
+
+    import_time = time.time() - start
+    import_modules = len(sys.modules) - modules
+
+    start = time.time()
+    if profile_file:
+        import cProfile
+        profile = cProfile.Profile()
+        app = profile.runcall(create_app)
+        profile.dump_stats(profile_file)
+    else:
+        app = create_app()
+
+    return {
+        'import_time': import_time,
+        'import_modules': import_modules,
+        'create_app_time': time.time() - start,
+        'create_app_modules': len(sys.modules) - modules - import_modules,
+        'blueprints': len(app.blueprints),
+        'url_rules': len(list(app.url_map.iter_rules())),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Measure the startup time of pgAdmin.'
+    )
+    parser.add_argument(
+        '--sqlite-path',
+        default=os.path.join(tempfile.gettempdir(), 'pgadmin4-startup.db'),
+        help='Path of the configuration database to be used'
+    )
+    parser.add_argument(
+        '--profile', metavar='FILE',
+        help='Save the profile of create_app() to the given file'
+    )
+    args = parser.parse_args()
+
+    stats = create_app_stats(
+        os.path.abspath(args.sqlite_path),
+        os.path.abspath(args.profile) if args.profile else None
+    )
+
+    print('Import pgadmin:  {0:.3f}s ({1} modules)'.format(
+        stats['import_time'], stats['import_modules']
+    ))
+    print('create_app():    {0:.3f}s ({1} modules)'.format(
+        stats['create_app_time'], stats['create_app_modules']
+    ))
+    print('Blueprints:      {0}'.format(stats['blueprints']))
+    print('URL rules:       {0}'.format(stats['url_rules']))
@@ -271,6 +271,20 @@ MAX_QUERY_HIST_STORED = 20
 ##########################################################################
 SESSION_DB_PATH = os.path.join(DATA_DIR, 'sessions')
 
+##########################################################################
+# Server-side session store
+#
+# SESSION_STORE selects how the sessions are stored under SESSION_DB_PATH:
+#
+# 'file'   - One file per session, cached in the memory of each process.
+# 'sqlite' - A single SQLite database (sessions.db), which can be shared by
+#            multiple worker processes. The sessions cached in the memory are
+#            validated against the database, unchanged sessions are not
+#            written again, and the expired sessions are removed using an
+#            index instead of scanning the session files.
+##########################################################################
+SESSION_STORE = 'file'
+
 SESSION_COOKIE_NAME = 'pga4_session'
 
 ##########################################################################
@@ -380,6 +394,129 @@ SQLALCHEMY_TRACK_MODIFICATIONS = False
 ##########################################################################
 ON_DEMAND_RECORD_COUNT = 1000
 
+##########################################################################
+# Number of records to fetch in one batch from the server side cursor, when
+# downloading the query result as a CSV file from the query tool.
+##########################################################################
+QUERY_DOWNLOAD_FETCH_SIZE = 2000
+
+##########################################################################
+# Generate the CSV file downloaded from the query tool on the database
+# server using COPY (query) TO STDOUT, when the query is a single SELECT
+# (VALUES, TABLE or WITH) statement. The file is the same as generated
+# otherwise.
+#
+# COPY runs on a separate connection to the database, with the role,
+# search_path and output settings of the query tool connection. It is not
+# used, when a transaction is open in the query tool, other settings are
+# changed in the session, or temporary objects exist. The custom settings
+# (e.g. used by the row level security policies) can not be detected, hence
+# - enable it only if the queries do not depend on them.
+##########################################################################
+QUERY_DOWNLOAD_USE_COPY = False
+
+##########################################################################
+# Maximum time (in seconds) a poll request of the query tool waits for the
+# running query to finish, before returning the 'Busy' status to the client.
+# The request returns as soon as the query has finished, or the notices or
+# notifications are received. Each waiting request holds a web server
+# thread, set it to 0 to return immediately (the client then polls with an
+# increasing delay).
+##########################################################################
+QUERY_TOOL_LONG_POLL_TIMEOUT = 10
+
+##########################################################################
+# Auto complete metadata cache settings.
+#
+# The catalog metadata (schemas, tables, columns, functions, etc) used by the
+# auto complete feature of the query tool is cached per server, database and
+# search_path. AUTOCOMPLETE_CACHE_TTL is the interval in *seconds* after which
+# the cached metadata is fetched again from the database server, and
+# AUTOCOMPLETE_CACHE_MAX_ENTRIES is the maximum number of databases for which
+# the metadata is kept (least recently used first evicted).
+# Set AUTOCOMPLETE_CACHE_TTL to 0 to disable the cache.
+#
+# AUTOCOMPLETE_CACHE_CHECK_INTERVAL is the interval in *seconds* after which
+# a cheap signature of the catalog is compared with the cached one, and only
+# the objects of the changed schemas are fetched again.
+##########################################################################
+AUTOCOMPLETE_CACHE_TTL = 3600
+AUTOCOMPLETE_CACHE_MAX_ENTRIES = 50
+AUTOCOMPLETE_CACHE_CHECK_INTERVAL = 5
+
+##########################################################################
+# Query tool catalog cache settings.
+#
+# The names of the data types of the query result columns, and the not
+# null/default value information of the columns of a table (when viewing or
+# editing its data) are cached per server and database. The cached data of a
+# database is removed when a statement changing the catalog is run in the
+# query tool (and of a table, when its columns are changed from the browser
+# tree), and expires after QUERY_TOOL_CATALOG_CACHE_TTL *seconds*. The
+# columns of a table are fetched again, if a column is not found in the
+# cache. Set it to 0 to disable the cache.
+##########################################################################
+QUERY_TOOL_CATALOG_CACHE_TTL = 300
+
+##########################################################################
+# Query tool transaction store.
+#
+# The transaction objects of the opened query tool and view data panels are
+# kept in the memory of the pgAdmin process, and the session only stores a
+# reference to them. Set QUERY_TOOL_TRANSACTION_STORE to 'file' to also save
+# them (pickled) under SESSION_DB_PATH, so that they can be restored after a
+# restart of the pgAdmin process, at the cost of a file write every time a
+# transaction changes.
+#
+# Transactions not accessed for SESSION_EXPIRATION_TIME are removed.
+##########################################################################
+QUERY_TOOL_TRANSACTION_STORE = 'memory'
+
+##########################################################################
+# Dashboard sampling settings.
+#
+# The dashboards of the same server (or database), connected to as the same
+# role, share the statistics: the statistics are queried at most once every
+# DASHBOARD_SAMPLE_INTERVAL *seconds* (keep it lower than the smallest graph
+# refresh rate, i.e. 1 second), by the first dashboard asking for them; the
+# other dashboards wait for its query (up to 5 seconds). The
+# last DASHBOARD_SAMPLE_HISTORY samples of the graphs are kept, to fill the
+# graphs of a newly opened dashboard.
+# Set DASHBOARD_SAMPLE_INTERVAL to 0 to query the statistics for every
+# dashboard.
+##########################################################################
+DASHBOARD_SAMPLE_INTERVAL = 0.8
+DASHBOARD_SAMPLE_HISTORY = 600
+
+##########################################################################
+# Count Rows settings of the tables.
+#
+# The Count Rows action of a table first shows the number of rows estimated
+# from the table statistics, refined by counting the rows of a sample of
+# COUNT_ROWS_SAMPLE_PAGES pages of the table (PostgreSQL 9.5 and above).
+# The exact count then runs on a separate connection to the database, and
+# can be cancelled. Each request for the exact count waits up to
+# COUNT_ROWS_POLL_TIMEOUT *seconds* for it to finish. A count not polled
+# for COUNT_ROWS_ABANDON_TIMEOUT *seconds* (e.g. the browser was closed) is
+# cancelled, and its connection released, by the next count request.
+# Set COUNT_ROWS_SAMPLE_PAGES to 0 to not sample the table.
+##########################################################################
+COUNT_ROWS_SAMPLE_PAGES = 100
+COUNT_ROWS_POLL_TIMEOUT = 5
+COUNT_ROWS_ABANDON_TIMEOUT = 30
+
+##########################################################################
+# Table statistics cache settings.
+#
+# The statistics of all the tables of a schema are fetched at once, and the
+# statistics panel of a table is served from this snapshot, kept per
+# server, database and schema for TABLE_STATISTICS_CACHE_TTL *seconds*.
+# The extended statistics of the pgstattuple extension are always fetched
+# for the table. Set it to 0 to fetch the statistics of each table
+# separately.
+##########################################################################
+TABLE_STATISTICS_CACHE_TTL = 10
+
 ##########################################################################
 # Allow users to display Gravatar image for their username in Server mode
 ##########################################################################
@@ -0,0 +1,33 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+"""
+Adding a new column to store the data of the profiler reports
+
+Revision ID: c6974f64df08
+Revises: 9b3ac6be109e
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from pgadmin.model import db
+
+# revision identifiers, used by Alembic.
+revision = 'c6974f64df08'
+down_revision = '9b3ac6be109e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    db.engine.execute(
+        'ALTER TABLE saved_reports ADD COLUMN data BLOB'
+    )
+
+
+def downgrade():
+    pass
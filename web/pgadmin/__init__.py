@@ -33,6 +33,7 @@ from pgadmin.model import db, Role, Server, ServerGroup, \
 from pgadmin.utils import PgAdminModule, driver, KeyManager
 from pgadmin.utils.preferences import Preferences
 from pgadmin.utils.session import create_session_interface, pga_unauthorised
+from pgadmin.utils.url_rule import LazyBuilderRule
 from pgadmin.utils.versioned_template_loader import VersionedTemplateLoader
 from datetime import timedelta
 from pgadmin.setup import get_version, set_version
@@ -52,6 +53,9 @@ elif os.name == 'nt':
 
 
 class PgAdmin(Flask):
+    # Compile the URL builders of the rules on first use, not on startup
+    url_rule_class = LazyBuilderRule
+
     def __init__(self, *args, **kwargs):
         # Set the template loader to a postgres-version-aware loader
         self.jinja_options = ImmutableDict(
@@ -64,6 +68,10 @@ class PgAdmin(Flask):
 
     def find_submodules(self, basemodule):
         for module_name in find_modules(basemodule, True):
+            # The test packages do not have any module, and are loaded by
+            # the test runner
+            if '.tests.' in module_name or module_name.endswith('.tests'):
+                continue
             if module_name in self.config['MODULE_BLACKLIST']:
                 self.logger.info(
                     'Skipping blacklisted module: %s' % module_name
@@ -610,6 +618,10 @@ def create_app(app_name=None):
         app.register_blueprint(module)
         app.register_logout_hook(module)
 
+    # Index the templates of all the modules, used to resolve the versioned
+    # templates
+    app.jinja_env.loader.build_index()
+
     ##########################################################################
     # Handle the desktop login
     ##########################################################################
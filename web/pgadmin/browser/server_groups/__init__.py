@@ -16,10 +16,12 @@ import six
 from flask import request, jsonify
 from flask_babelex import gettext
 from flask_security import current_user, login_required
+from config import PG_DEFAULT_DRIVER
 from pgadmin.browser import BrowserPluginModule
 from pgadmin.browser.utils import NodeView
 from pgadmin.utils.ajax import make_json_response, gone, \
     make_response as ajax_response, bad_request
+from pgadmin.utils.driver import get_driver
 from pgadmin.utils.menu import MenuItem
 from sqlalchemy import exc
 from pgadmin.model import db, ServerGroup
@@ -144,6 +146,8 @@ class ServerGroupView(NodeView):
             try:
                 db.session.delete(sg)
                 db.session.commit()
+                # The servers of the group are also deleted
+                get_driver(PG_DEFAULT_DRIVER).invalidate_server_cache()
             except Exception as e:
                 db.session.rollback()
                 return make_json_response(
@@ -585,6 +585,8 @@ class ServerNode(PGChildNodeView):
                 errormsg=e.message
             )
 
+        get_driver(PG_DEFAULT_DRIVER).invalidate_server_cache(server.id)
+
         # When server is connected, we don't require to update the connection
         # manager. Because - we don't allow to change any of the parameters,
         # which will affect the connections.
@@ -801,6 +803,7 @@ class ServerNode(PGChildNodeView):
             )
             db.session.add(server)
             db.session.commit()
+            get_driver(PG_DEFAULT_DRIVER).invalidate_server_cache(server.id)
 
             connected = False
             user = None
@@ -844,6 +847,8 @@ class ServerNode(PGChildNodeView):
                 if not status:
                     db.session.delete(server)
                     db.session.commit()
+                    get_driver(PG_DEFAULT_DRIVER).invalidate_server_cache(
+                        server.id)
                     return make_json_response(
                         status=401,
                         success=0,
@@ -885,6 +890,8 @@ class ServerNode(PGChildNodeView):
             if server:
                 db.session.delete(server)
                 db.session.commit()
+                get_driver(PG_DEFAULT_DRIVER).invalidate_server_cache(
+                    server.id)
 
             current_app.logger.exception(e)
             return make_json_response(
@@ -28,7 +28,7 @@ from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
 from pgadmin.browser.utils import PGChildNodeView
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
-    make_response as ajax_response, gone
+    make_response as ajax_response, gone, bad_request
 from pgadmin.utils.driver import get_driver
 
 from config import PG_DEFAULT_DRIVER
@@ -375,10 +375,17 @@ class FunctionView(PGChildNodeView, DataTypeReader):
         """
 
         res = []
+        paging = None
+        if fnid is None:
+            status, paging = self.get_nodes_paging()
+            if not status:
+                return bad_request(errormsg=paging)
+
         SQL = render_template(
             "/".join([self.sql_template_path, 'node.sql']),
             scid=scid,
-            fnid=fnid
+            fnid=fnid,
+            paging=paging
         )
         status, rset = self.conn.execute_2darray(SQL)
 
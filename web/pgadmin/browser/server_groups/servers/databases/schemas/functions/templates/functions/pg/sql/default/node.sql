@@ -1,3 +1,4 @@
+{% import 'macros/schemas/nodes.macros' as NODES %}
 SELECT
     pr.oid, pr.proname || '(' || COALESCE(pg_catalog.pg_get_function_identity_arguments(pr.oid), '') || ')' as name,
     lanname, pg_get_userbyid(proowner) as funcowner, description
@@ -18,5 +19,7 @@ WHERE
     AND pronamespace = {{scid}}::oid
 {% endif %}
     AND typname NOT IN ('trigger', 'event_trigger')
+{{ NODES.WHERE(paging, 'pr', 'proname') }}
 ORDER BY
-    proname;
+    pr.proname, pr.oid
+{{ NODES.LIMIT(paging) }};
@@ -1,3 +1,4 @@
+{% import 'macros/schemas/nodes.macros' as NODES %}
 SELECT
     pr.oid,
     CASE WHEN
@@ -25,5 +26,7 @@ WHERE
     AND pronamespace = {{scid}}::oid
 {% endif %}
     AND typname NOT IN ('trigger', 'event_trigger')
+{{ NODES.WHERE(paging, 'pr', 'proname') }}
 ORDER BY
-    proname;
+    pr.proname, pr.oid
+{{ NODES.LIMIT(paging) }};
@@ -1,3 +1,4 @@
+{% import 'macros/schemas/nodes.macros' as NODES %}
 SELECT
     pr.oid, pr.proname || '()' as name,
     lanname, pg_get_userbyid(proowner) as funcowner, description
@@ -18,5 +19,7 @@ WHERE
     AND pronamespace = {{scid}}::oid
 {% endif %}
     AND typname = 'trigger' AND lanname != 'edbspl'
+{{ NODES.WHERE(paging, 'pr', 'proname') }}
 ORDER BY
-    proname;
+    pr.proname, pr.oid
+{{ NODES.LIMIT(paging) }};
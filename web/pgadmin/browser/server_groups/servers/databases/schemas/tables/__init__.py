@@ -11,17 +11,28 @@
 
 import simplejson as json
 import re
+import time
+from threading import Lock
+from weakref import WeakKeyDictionary
 
 import pgadmin.browser.server_groups.servers.databases as database
-from flask import render_template, request, jsonify, url_for
+from flask import render_template, request, jsonify, url_for, current_app
 from flask_babelex import gettext
 from pgadmin.browser.server_groups.servers.databases.schemas.utils \
     import SchemaChildModule, DataTypeReader, VacuumSettings
 from pgadmin.browser.server_groups.servers.utils import parse_priv_to_db
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
-    make_response as ajax_response, gone
+    make_response as ajax_response, gone, bad_request
 from .utils import BaseTableView
 from pgadmin.utils.preferences import Preferences
+from config import COUNT_ROWS_SAMPLE_PAGES, COUNT_ROWS_POLL_TIMEOUT, \
+    COUNT_ROWS_ABANDON_TIMEOUT
+
+
+# Running counts of the table rows, per server manager:
+# connection id => (database id, last polled at)
+_count_rows_polls = WeakKeyDictionary()
+_count_rows_polls_lock = Lock()
 
 
 class TableModule(SchemaChildModule):
@@ -275,7 +286,8 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
         'insert_sql': [{'get': 'insert_sql'}],
         'update_sql': [{'get': 'update_sql'}],
         'delete_sql': [{'get': 'delete_sql'}],
-        'count_rows': [{'get': 'count_rows'}]
+        'count_rows': [{'get': 'count_rows', 'delete': 'cancel_count_rows'}],
+        'schema_stats': [{}, {'get': 'schema_statistics'}]
     })
 
     @BaseTableView.check_precondition
@@ -390,9 +402,13 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
             JSON of available table nodes
         """
         res = []
+        status, paging = self.get_nodes_paging()
+        if not status:
+            return bad_request(errormsg=paging)
+
         SQL = render_template(
             "/".join([self.table_template_path, 'nodes.sql']),
-            scid=scid
+            scid=scid, paging=paging
         )
         status, rset = self.conn.execute_2darray(SQL)
         if not status:
@@ -1578,10 +1594,48 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
         """
         return BaseTableView.get_table_statistics(self, scid, tid)
 
+    @BaseTableView.check_precondition
+    def schema_statistics(self, gid, sid, did, scid):
+        """
+        Returns the statistics snapshot of all the tables of the schema, and
+        of all the indexes if the 'indexes' argument of the request is true.
+        The statistics of a table (without the extended statistics) are
+        served from this snapshot while cached.
+
+        Args:
+            gid: Server Group Id
+            sid: Server Id
+            did: Database Id
+            scid: Schema Id
+        """
+        with_indexes = request.args.get('indexes', 'false') == 'true'
+
+        status, snapshot = super(TableView, self).get_schema_statistics(
+            scid, with_indexes
+        )
+        if not status:
+            return internal_server_error(errormsg=snapshot)
+
+        data = dict(tables=snapshot['tables'])
+        if with_indexes:
+            data['indexes'] = snapshot['indexes']
+
+        return make_json_response(data=data, status=200)
+
     @BaseTableView.check_precondition
     def count_rows(self, gid, sid, did, scid, tid):
         """
         Count the rows of a table.
+
+        The 'mode' argument of the request is one of:
+          * estimate - Estimate the rows from the statistics of the table.
+          * sample - Estimate the rows from a sample of the pages of the
+            table (PostgreSQL 9.5 and above).
+          * exact (default) - Count the rows on a separate connection to the
+            database. The request returns 'running' if the count does not
+            finish within COUNT_ROWS_POLL_TIMEOUT seconds, the count is then
+            polled by requesting it again, or cancelled by cancel_count_rows.
+
         Args:
             gid: Server Group Id
             sid: Server Id
@@ -1591,25 +1645,199 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
 
         Returns the total rows of a table.
         """
-        data = {}
-        data['schema'], data['name'] = \
-            super(TableView, self).get_schema_and_table_name(tid)
+        mode = request.args.get('mode', 'exact')
+
+        self._release_abandoned_counts()
 
+        if mode in ('estimate', 'sample'):
+            return self._estimate_rows(tid, mode == 'sample')
+
+        return self._count_rows(did, tid)
+
+    def _estimate_rows(self, tid, sample):
+        """
+        Estimate the rows of a table, from a sample of its pages if asked
+        for and supported by the server.
+        """
         SQL = render_template(
             "/".join(
-                [self.table_template_path, 'get_table_row_count.sql']
-            ), data=data
+                [self.table_template_path, 'get_table_row_estimate.sql']
+            ), tid=tid
+        )
+        status, res = self.conn.execute_dict(SQL)
+
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        if len(res['rows']) == 0 or res['rows'][0]['pages'] is None:
+            return gone(gettext("The specified table could not be found."))
+
+        estimated_rows = res['rows'][0]['estimated_rows']
+        # bigint values are returned as strings
+        pages = int(res['rows'][0]['pages'])
+
+        if sample and pages and COUNT_ROWS_SAMPLE_PAGES and \
+                self.manager.server_type == 'pg' and \
+                self.manager.version >= 90500:
+            data = {}
+            data['schema'], data['name'] = \
+                super(TableView, self).get_schema_and_table_name(tid)
+
+            SQL = render_template(
+                "/".join(
+                    [self.table_template_path, 'get_table_row_sample.sql']
+                ), data=data,
+                percent=min(100.0, 100.0 * COUNT_ROWS_SAMPLE_PAGES / pages)
+            )
+            status, estimated_rows = self.conn.execute_scalar(SQL)
+
+            if not status:
+                return internal_server_error(errormsg=estimated_rows)
+
+        return make_json_response(
+            status=200,
+            info=gettext("Table rows estimated"),
+            data={'total_rows': estimated_rows, 'estimated': True}
         )
 
-        status, count = self.conn.execute_scalar(SQL)
+    @staticmethod
+    def _count_rows_conn_id(did, tid):
+        """
+        Returns the id of the connection counting the rows of a table.
+        """
+        return u'count_rows-{0}-{1}'.format(did, tid)
+
+    def _count_rows_polled(self, did, conn_id, running):
+        """
+        Record the time the running count of the rows of a table is polled
+        at, or forget it once the count has finished.
+        """
+        with _count_rows_polls_lock:
+            polls = _count_rows_polls.setdefault(self.manager, dict())
+            if running:
+                polls[conn_id] = (did, time.time())
+            else:
+                polls.pop(conn_id, None)
+
+    def _release_abandoned_counts(self):
+        """
+        Cancel the counts of the rows not polled for COUNT_ROWS_ABANDON_TIMEOUT
+        seconds (e.g. the browser was closed meanwhile), and release their
+        connections.
+        """
+        now = time.time()
+        with _count_rows_polls_lock:
+            polls = _count_rows_polls.get(self.manager, dict())
+            abandoned = [
+                (conn_id, did) for conn_id, (did, polled_at) in polls.items()
+                if now - polled_at > COUNT_ROWS_ABANDON_TIMEOUT
+            ]
+            for conn_id, did in abandoned:
+                del polls[conn_id]
+
+        for conn_id, did in abandoned:
+            try:
+                conn = self.manager.connection(did=did, conn_id=conn_id)
+                if conn.connected():
+                    self.conn.cancel_transaction(conn_id, did)
+            except Exception as e:
+                current_app.logger.exception(e)
+            finally:
+                self.manager.release(conn_id=conn_id)
+
+    def _count_rows(self, did, tid):
+        """
+        Start counting the rows of a table on a separate connection, or poll
+        the running count. The connection is released once the count has
+        finished (or failed).
+        """
+        conn_id = self._count_rows_conn_id(did, tid)
+
+        try:
+            conn = self.manager.connection(did=did, conn_id=conn_id)
+        except Exception as e:
+            return internal_server_error(errormsg=str(e))
+
+        running = False
+        try:
+            if not conn.connected():
+                status, msg = conn.connect()
+                if not status:
+                    return internal_server_error(errormsg=str(msg))
+
+                data = {}
+                data['schema'], data['name'] = \
+                    super(TableView, self).get_schema_and_table_name(tid)
+
+                SQL = render_template(
+                    "/".join(
+                        [self.table_template_path, 'get_table_row_count.sql']
+                    ), data=data
+                )
+                status, msg = conn.execute_async(SQL)
+                if not status:
+                    return internal_server_error(errormsg=msg)
+
+            self._count_rows_polled(did, conn_id, True)
+            status, result = conn.poll(timeout=COUNT_ROWS_POLL_TIMEOUT)
+
+            if status in (conn.ASYNC_READ_TIMEOUT, conn.ASYNC_WRITE_TIMEOUT):
+                running = True
+                return make_json_response(
+                    status=200,
+                    info=gettext("Counting the table rows..."),
+                    data={'running': True}
+                )
+        finally:
+            # The count has finished (or failed, or was cancelled)
+            if not running:
+                self._count_rows_polled(did, conn_id, False)
+                self.manager.release(conn_id=conn_id)
 
         if not status:
-            return internal_server_error(errormsg=count)
+            return internal_server_error(errormsg=result)
+
+        if status == conn.ASYNC_EXECUTION_ABORTED:
+            return internal_server_error(
+                errormsg=gettext("Counting the table rows was cancelled.")
+            )
 
         return make_json_response(
             status=200,
             info=gettext("Table rows counted"),
-            data={'total_rows': count}
+            data={'total_rows': result[0][0]}
+        )
+
+    @BaseTableView.check_precondition
+    def cancel_count_rows(self, gid, sid, did, scid, tid):
+        """
+        Cancel the running count of the rows of a table.
+        Args:
+            gid: Server Group Id
+            sid: Server Id
+            did: Database Id
+            scid: Schema Id
+            tid: Table Id
+        """
+        conn_id = self._count_rows_conn_id(did, tid)
+
+        try:
+            conn = self.manager.connection(did=did, conn_id=conn_id)
+        except Exception as e:
+            return internal_server_error(errormsg=str(e))
+
+        # The connection is released by the request polling the count (or,
+        # if not polled anymore, by the next count request)
+        if conn.connected():
+            status, msg = self.conn.cancel_transaction(conn_id, did)
+            if not status:
+                return internal_server_error(errormsg=msg)
+        else:
+            self.manager.release(conn_id=conn_id)
+
+        return make_json_response(
+            status=200,
+            info=gettext("Table rows count cancelled")
         )
 
 
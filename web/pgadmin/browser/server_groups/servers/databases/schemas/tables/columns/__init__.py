@@ -27,6 +27,7 @@ from pgadmin.utils.driver import get_driver
 from config import PG_DEFAULT_DRIVER
 from pgadmin.utils import IS_PY2
 from pgadmin.utils.ajax import ColParamsJSONDecoder
+from pgadmin.tools.sqleditor.utils.catalog_cache import catalog_cache
 # If we are in Python3
 if not IS_PY2:
     unicode = str
@@ -588,6 +589,8 @@ class ColumnsView(PGChildNodeView, DataTypeReader):
                                         'create.sql']),
                               data=data, conn=self.conn)
         status, res = self.conn.execute_scalar(SQL)
+        # The columns of the table are cached by the query tool
+        catalog_cache.invalidate_table(sid, did, tid)
         if not status:
             return internal_server_error(errormsg=res)
 
@@ -663,6 +666,7 @@ class ColumnsView(PGChildNodeView, DataTypeReader):
                                                 'delete.sql']),
                                       data=data, conn=self.conn)
                 status, res = self.conn.execute_scalar(SQL)
+                catalog_cache.invalidate_table(sid, did, tid)
                 if not status:
                     return internal_server_error(errormsg=res)
 
@@ -709,6 +713,7 @@ class ColumnsView(PGChildNodeView, DataTypeReader):
             return SQL
         SQL = SQL.strip('\n').strip(' ')
         status, res = self.conn.execute_scalar(SQL)
+        catalog_cache.invalidate_table(sid, did, tid)
         if not status:
             return internal_server_error(errormsg=res)
 
@@ -247,24 +247,72 @@ define('pgadmin.node.table', [
             obj = this,
             t = pgBrowser.tree,
             i = input.item || t.selected(),
-            d = i && i.length == 1 ? t.itemData(i) : undefined;
+            d = i && i.length == 1 ? t.itemData(i) : undefined,
+            notifier = null;
           if (!d)
             return false;
 
-          // Fetch the total rows of a table
+          var url = obj.generate_url(i, 'count_rows' , d, true),
+            dismissNotifier = function() {
+              if (notifier) {
+                notifier.callback = null;
+                notifier.dismiss();
+                notifier = null;
+              }
+            },
+            countRows = function() {
+              // Poll the count running on the server, until it has finished
+              $.ajax({
+                url: url,
+                type:'GET',
+                data: {mode: 'exact'},
+              })
+                .done(function(res) {
+                  if (res.data.running) {
+                    countRows();
+                    return;
+                  }
+                  dismissNotifier();
+                  Alertify.success(res.info);
+                  d.rows_cnt = res.data.total_rows;
+                  t.unload(i);
+                  t.setInode(i);
+                  t.deselect(i);
+                  setTimeout(function() {
+                    t.select(i);
+                  }, 10);
+                })
+                .fail(function(xhr, status, error) {
+                  dismissNotifier();
+                  Alertify.pgRespErrorNotify(xhr, error);
+                  t.unload(i);
+                });
+            };
+
+          // Show the estimated rows of the table, while the rows are counted
           $.ajax({
-            url: obj.generate_url(i, 'count_rows' , d, true),
+            url: url,
             type:'GET',
+            data: {mode: 'sample'},
           })
             .done(function(res) {
-              Alertify.success(res.info);
-              d.rows_cnt = res.data.total_rows;
-              t.unload(i);
-              t.setInode(i);
-              t.deselect(i);
-              setTimeout(function() {
-                t.select(i);
-              }, 10);
+              notifier = Alertify.message(
+                S(gettext('Estimated rows: %s. Counting the rows of the table (click to cancel)...')).sprintf(
+                  res.data.total_rows
+                ).value(), 0, function(isClicked) {
+                  if (!isClicked)
+                    return;
+                  notifier = null;
+                  $.ajax({
+                    url: url,
+                    type:'DELETE',
+                  })
+                    .fail(function(xhr, status, error) {
+                      Alertify.pgRespErrorNotify(xhr, error);
+                    });
+                }
+              );
+              countRows();
             })
             .fail(function(xhr, status, error) {
               Alertify.pgRespErrorNotify(xhr, error);
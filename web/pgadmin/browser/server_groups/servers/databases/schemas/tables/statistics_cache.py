@@ -0,0 +1,93 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Process wide cache of the statistics snapshots of the schemas.
+
+A snapshot holds the statistics of all the tables (and, if asked for, of all
+the indexes) of a schema, fetched at once. The statistics of a table are
+served from the snapshot, instead of querying them each time the table is
+selected in the browser tree. The snapshots are kept per connection (i.e.
+server and database), and expire after the configured time.
+"""
+
+import time
+from threading import Lock
+
+from config import TABLE_STATISTICS_CACHE_TTL
+
+
+class TableStatisticsCache(object):
+    """
+    class TableStatisticsCache
+
+        Caches the statistics snapshots by the server id, connection id and
+        schema id.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        # (sid, conn_id, scid) => (fetched at, snapshot)
+        self._snapshots = dict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def get(self, sid, conn_id, scid, with_indexes=False):
+        """
+        Returns the cached snapshot of the schema, or None if not cached, or
+        expired, or without the statistics of the indexes when asked for.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._snapshots.get((sid, conn_id, scid))
+
+        if entry is None or time.time() - entry[0] > self.ttl:
+            return None
+
+        snapshot = entry[1]
+        if with_indexes and snapshot['indexes'] is None:
+            return None
+
+        return snapshot
+
+    def put(self, sid, conn_id, scid, snapshot):
+        if not self.enabled:
+            return
+
+        now = time.time()
+
+        with self._lock:
+            # Forget the expired snapshots of the other schemas
+            for key in [k for k, v in self._snapshots.items()
+                        if now - v[0] > self.ttl]:
+                del self._snapshots[key]
+
+            self._snapshots[(sid, conn_id, scid)] = (now, snapshot)
+
+    def invalidate(self, sid, scid=None):
+        """
+        Removes the snapshots of the given schema (or of all the schemas of
+        the server, if not given), e.g. after resetting the statistics.
+        """
+        with self._lock:
+            for key in list(self._snapshots.keys()):
+                if key[0] == sid and (scid is None or key[2] == scid):
+                    del self._snapshots[key]
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+
+table_statistics_cache = TableStatisticsCache(TABLE_STATISTICS_CACHE_TTL)
@@ -0,0 +1,18 @@
+{# Statistics of all the indexes of the schema, as in stats.sql (without the
+   extended statistics), fetched at once #}
+SELECT
+    stat.indexrelid AS oid,
+    stat.indexrelname AS name,
+    stat.relid AS tid,
+    idx_scan AS {{ conn|qtIdent(_('Index scans')) }},
+    idx_tup_read AS {{ conn|qtIdent(_('Index tuples read')) }},
+    idx_tup_fetch AS {{ conn|qtIdent(_('Index tuples fetched')) }},
+    idx_blks_read AS {{ conn|qtIdent(_('Index blocks read')) }},
+    idx_blks_hit AS {{ conn|qtIdent(_('Index blocks hit')) }},
+    pg_relation_size(stat.indexrelid) AS {{ conn|qtIdent(_('Index size')) }}
+FROM
+    pg_stat_all_indexes stat
+    JOIN pg_statio_all_indexes statio ON stat.indexrelid = statio.indexrelid
+WHERE
+    stat.schemaname = (SELECT nspname FROM pg_namespace WHERE oid = {{ scid }}::oid)
+    AND statio.schemaname = stat.schemaname
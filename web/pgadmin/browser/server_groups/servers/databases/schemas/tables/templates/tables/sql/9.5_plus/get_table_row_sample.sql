@@ -0,0 +1,2 @@
+{# Estimate the rows of the table from the rows of a sample of its pages #}
+SELECT (COUNT(*) * 100 / {{ percent }})::bigint FROM {{ conn|qtIdent(data.schema, data.name) }} TABLESAMPLE SYSTEM ({{ percent }});
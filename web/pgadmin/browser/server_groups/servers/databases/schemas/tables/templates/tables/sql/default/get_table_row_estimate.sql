@@ -0,0 +1,19 @@
+{# Estimate the rows of the table, and of the tables inheriting from it (counted
+   by COUNT(*) too), the way the planner does: the rows per page of the last
+   VACUUM/ANALYZE times the current number of pages. #}
+WITH RECURSIVE rels(oid) AS (
+    SELECT {{ tid }}::oid
+    UNION
+    SELECT inh.inhrelid FROM pg_inherits inh JOIN rels ON inh.inhparent = rels.oid
+)
+SELECT
+    sum(CASE WHEN rel.relpages > 0
+        THEN rel.reltuples / rel.relpages * rel.pages
+        ELSE greatest(rel.reltuples, 0) END)::bigint AS estimated_rows,
+    sum(rel.pages)::bigint AS pages
+FROM (
+    SELECT
+        rel.reltuples, rel.relpages,
+        pg_relation_size(rel.oid) / current_setting('block_size')::integer AS pages
+    FROM pg_class rel JOIN rels ON rel.oid = rels.oid
+) rel;
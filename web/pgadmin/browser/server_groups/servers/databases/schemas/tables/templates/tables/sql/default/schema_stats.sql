@@ -0,0 +1,45 @@
+{# Statistics of all the tables of the schema, as in stats.sql (without
+   the extended statistics), fetched at once #}
+SELECT
+    stat.relid AS oid,
+    stat.relname AS name,
+    seq_scan AS {{ conn|qtIdent(_('Sequential scans')) }},
+    seq_tup_read AS {{ conn|qtIdent(_('Sequential tuples read')) }},
+    idx_scan AS {{ conn|qtIdent(_('Index scans')) }},
+    idx_tup_fetch AS {{ conn|qtIdent(_('Index tuples fetched')) }},
+    n_tup_ins AS {{ conn|qtIdent(_('Tuples inserted')) }},
+    n_tup_upd AS {{ conn|qtIdent(_('Tuples updated')) }},
+    n_tup_del AS {{ conn|qtIdent(_('Tuples deleted')) }},
+    n_tup_hot_upd AS {{ conn|qtIdent(_('Tuples HOT updated')) }},
+    n_live_tup AS {{ conn|qtIdent(_('Live tuples')) }},
+    n_dead_tup AS {{ conn|qtIdent(_('Dead tuples')) }},
+    heap_blks_read AS {{ conn|qtIdent(_('Heap blocks read')) }},
+    heap_blks_hit AS {{ conn|qtIdent(_('Heap blocks hit')) }},
+    idx_blks_read AS {{ conn|qtIdent(_('Index blocks read')) }},
+    idx_blks_hit AS {{ conn|qtIdent(_('Index blocks hit')) }},
+    toast_blks_read AS {{ conn|qtIdent(_('Toast blocks read')) }},
+    toast_blks_hit AS {{ conn|qtIdent(_('Toast blocks hit')) }},
+    tidx_blks_read AS {{ conn|qtIdent(_('Toast index blocks read')) }},
+    tidx_blks_hit AS {{ conn|qtIdent(_('Toast index blocks hit')) }},
+    last_vacuum AS {{ conn|qtIdent(_('Last vacuum')) }},
+    last_autovacuum AS {{ conn|qtIdent(_('Last autovacuum')) }},
+    last_analyze AS {{ conn|qtIdent(_('Last analyze')) }},
+    last_autoanalyze AS {{ conn|qtIdent(_('Last autoanalyze')) }},
+    pg_relation_size(stat.relid) AS {{ conn|qtIdent(_('Table size')) }},
+    CASE WHEN cl.reltoastrelid = 0 THEN NULL ELSE pg_relation_size(cl.reltoastrelid)
+        + COALESCE((SELECT SUM(pg_relation_size(indexrelid))
+                        FROM pg_index WHERE indrelid=cl.reltoastrelid)::int8, 0)
+        END AS {{ conn|qtIdent(_('Toast table size')) }},
+    COALESCE((SELECT SUM(pg_relation_size(indexrelid))
+                                FROM pg_index WHERE indrelid=stat.relid)::int8, 0)
+        AS {{ conn|qtIdent(_('Indexes size')) }}
+FROM
+    pg_stat_all_tables stat
+JOIN
+    pg_statio_all_tables statio ON stat.relid = statio.relid
+JOIN
+    pg_class cl ON cl.oid=stat.relid
+WHERE
+    stat.schemaname = (SELECT nspname FROM pg_namespace WHERE oid = {{ scid }}::oid)
+    AND statio.schemaname = stat.schemaname
+    AND cl.relnamespace = {{ scid }}::oid
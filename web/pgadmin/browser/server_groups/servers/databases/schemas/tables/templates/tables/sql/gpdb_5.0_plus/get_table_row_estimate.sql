@@ -0,0 +1,13 @@
+{# Estimate the rows of the table the way the planner does: the rows per page
+   of the last VACUUM/ANALYZE times the current number of pages. #}
+SELECT
+    (CASE WHEN rel.relpages > 0
+        THEN rel.reltuples / rel.relpages * rel.pages
+        ELSE greatest(rel.reltuples, 0) END)::bigint AS estimated_rows,
+    rel.pages::bigint AS pages
+FROM (
+    SELECT
+        rel.reltuples, rel.relpages,
+        pg_relation_size(rel.oid) / current_setting('block_size')::integer AS pages
+    FROM pg_class rel WHERE rel.oid = {{ tid }}::oid
+) rel;
@@ -1,3 +1,4 @@
+{% import 'macros/schemas/nodes.macros' as NODES %}
 SELECT rel.oid, rel.relname AS name,
     (SELECT count(*) FROM pg_trigger WHERE tgrelid=rel.oid) AS triggercount,
     (SELECT count(*) FROM pg_trigger WHERE tgrelid=rel.oid AND tgenabled = 'O') AS has_enable_triggers,
@@ -11,4 +12,6 @@ FROM pg_class rel
     {% if tid %}
       AND rel.oid = {{tid}}::OID
     {% endif %}
-    ORDER BY rel.relname;
+{{ NODES.WHERE(paging, 'rel', 'relname') }}
+    ORDER BY rel.relname, rel.oid
+{{ NODES.LIMIT(paging) }};
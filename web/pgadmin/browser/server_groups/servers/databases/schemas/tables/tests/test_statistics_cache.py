@@ -0,0 +1,128 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import sys
+
+from pgadmin.browser.server_groups.servers.databases.schemas.tables.\
+    statistics_cache import TableStatisticsCache
+from pgadmin.utils.route import BaseTestGenerator
+
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
+SNAPSHOT = {'tables': {'columns': [], 'rows': []}, 'indexes': None}
+SNAPSHOT_WITH_INDEXES = {
+    'tables': {'columns': [], 'rows': []},
+    'indexes': {'columns': [], 'rows': []}
+}
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class TableStatisticsCacheTestCase(BaseTestGenerator):
+    """
+    Cache the statistics snapshots of the schemas per connection.
+    """
+    scenarios = [
+        (
+            'Return the snapshot within the cache time',
+            dict(scenario='cached')
+        ),
+        (
+            'Expire the snapshot after the cache time',
+            dict(scenario='expired')
+        ),
+        (
+            'Do not return a snapshot without the indexes if asked for',
+            dict(scenario='with_indexes')
+        ),
+        (
+            'Invalidate the snapshots of a server',
+            dict(scenario='invalidate')
+        ),
+        (
+            'Do not cache when disabled',
+            dict(scenario='disabled')
+        ),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        self.clock = FakeClock()
+        self.cache = TableStatisticsCache(10)
+
+        with patch(
+            'pgadmin.browser.server_groups.servers.databases.schemas.tables.'
+            'statistics_cache.time', self.clock
+        ):
+            getattr(self, self.scenario)()
+
+    def cached(self):
+        self.cache.put(1, 'DB:postgres', 2200, SNAPSHOT)
+        self.clock.now += 10
+        self.assertIs(self.cache.get(1, 'DB:postgres', 2200), SNAPSHOT)
+
+        # Per connection and schema
+        self.assertIsNone(self.cache.get(1, 'DB:test', 2200))
+        self.assertIsNone(self.cache.get(2, 'DB:postgres', 2200))
+        self.assertIsNone(self.cache.get(1, 'DB:postgres', 2201))
+
+    def expired(self):
+        self.cache.put(1, 'DB:postgres', 2200, SNAPSHOT)
+        self.clock.now += 10.5
+        self.assertIsNone(self.cache.get(1, 'DB:postgres', 2200))
+
+        # The expired snapshots are removed when caching another one
+        self.cache.put(1, 'DB:postgres', 2201, SNAPSHOT)
+        self.assertEqual(
+            list(self.cache._snapshots.keys()), [(1, 'DB:postgres', 2201)]
+        )
+
+    def with_indexes(self):
+        self.cache.put(1, 'DB:postgres', 2200, SNAPSHOT)
+        self.assertIsNone(
+            self.cache.get(1, 'DB:postgres', 2200, with_indexes=True)
+        )
+
+        self.cache.put(1, 'DB:postgres', 2200, SNAPSHOT_WITH_INDEXES)
+        self.assertIs(
+            self.cache.get(1, 'DB:postgres', 2200, with_indexes=True),
+            SNAPSHOT_WITH_INDEXES
+        )
+        self.assertIs(
+            self.cache.get(1, 'DB:postgres', 2200), SNAPSHOT_WITH_INDEXES
+        )
+
+    def invalidate(self):
+        self.cache.put(1, 'DB:postgres', 2200, SNAPSHOT)
+        self.cache.put(1, 'DB:postgres', 2201, SNAPSHOT)
+        self.cache.put(2, 'DB:postgres', 2200, SNAPSHOT)
+
+        self.cache.invalidate(1, 2200)
+        self.assertIsNone(self.cache.get(1, 'DB:postgres', 2200))
+        self.assertIs(self.cache.get(1, 'DB:postgres', 2201), SNAPSHOT)
+
+        self.cache.invalidate(1)
+        self.assertIsNone(self.cache.get(1, 'DB:postgres', 2201))
+        self.assertIs(self.cache.get(2, 'DB:postgres', 2200), SNAPSHOT)
+
+    def disabled(self):
+        self.cache = TableStatisticsCache(0)
+        self.cache.put(1, 'DB:postgres', 2200, SNAPSHOT)
+        self.assertIsNone(self.cache.get(1, 'DB:postgres', 2200))
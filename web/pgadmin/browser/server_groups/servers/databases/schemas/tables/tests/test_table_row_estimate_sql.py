@@ -0,0 +1,102 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import os
+
+import jinja2
+from regression.python_test_utils.sql_template_test_base import \
+    SQLTemplateTestBase
+from regression.python_test_utils.template_helper import file_as_template
+
+NUMBER_OF_ANALYZED_ROWS = 10000
+NUMBER_OF_ROWS = 20000
+NUMBER_OF_CHILD_ROWS = 1000
+
+
+class TestTableRowEstimateSql(SQLTemplateTestBase):
+    """
+    Estimate the rows of a table (including the rows of the tables
+    inheriting from it), changed since it was last analyzed.
+    """
+    scenarios = [
+        (
+            'Estimate the rows from the statistics of the table',
+            dict(template_name='get_table_row_estimate.sql', percent=None)
+        ),
+        (
+            'Estimate the rows from a sample of the pages of the table',
+            dict(template_name='get_table_row_sample.sql', percent=100)
+        ),
+    ]
+
+    def __init__(self):
+        super(TestTableRowEstimateSql, self).__init__()
+        self.table_id = -1
+        self.total_rows = 0
+        self.server_version = 0
+
+    def test_setup(self, connection, cursor):
+        self.server_version = connection.server_version
+        cursor.execute(
+            "INSERT INTO test_table (some_column, value) "
+            "SELECT 'row ' || g, g FROM generate_series(1, {0}) g".format(
+                NUMBER_OF_ANALYZED_ROWS
+            )
+        )
+        cursor.execute("ANALYZE test_table")
+        cursor.execute(
+            "INSERT INTO test_table (some_column, value) "
+            "SELECT 'row ' || g, g FROM generate_series(1, {0}) g".format(
+                NUMBER_OF_ROWS - NUMBER_OF_ANALYZED_ROWS
+            )
+        )
+
+        cursor.execute(
+            "CREATE TABLE test_table_child () INHERITS (test_table)"
+        )
+        cursor.execute(
+            "INSERT INTO test_table_child (some_column, value) "
+            "SELECT 'row ' || g, g FROM generate_series(1, {0}) g".format(
+                NUMBER_OF_CHILD_ROWS
+            )
+        )
+        cursor.execute("ANALYZE test_table_child")
+
+        cursor.execute("SELECT 'test_table'::regclass::oid")
+        self.table_id = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM test_table")
+        self.total_rows = int(cursor.fetchone()[0])
+
+    def generate_sql(self, version):
+        file_path = os.path.join(os.path.dirname(__file__), "..", "templates",
+                                 "tables", "sql")
+        template_file = self.get_template_file(version, file_path,
+                                               self.template_name)
+        if template_file is None:
+            # TABLESAMPLE is not supported by the server
+            return "SELECT NULL"
+
+        jinja2.filters.FILTERS['qtIdent'] = \
+            lambda conn, *args: '.'.join(args)
+        template = file_as_template(template_file)
+
+        return template.render(
+            tid=self.table_id, percent=self.percent,
+            data={'schema': 'public', 'name': 'test_table'}, conn=None
+        )
+
+    def assertions(self, fetch_result, descriptions):
+        if self.percent is None:
+            # The rows per page of the last ANALYZE times the current pages
+            self.assertAlmostEqual(
+                int(fetch_result[0][0]), self.total_rows,
+                delta=self.total_rows * 0.1
+            )
+        elif self.server_version >= 90500:
+            self.assertEqual(int(fetch_result[0][0]), self.total_rows)
@@ -10,6 +10,9 @@
 import os
 import sys
 
+import jinja2
+from config import PG_DEFAULT_DRIVER
+from pgadmin.utils.driver import DriverRegistry
 from regression.python_test_utils.sql_template_test_base import \
     SQLTemplateTestBase
 from regression.python_test_utils.template_helper import file_as_template
@@ -32,7 +35,12 @@ class TestTablesNodeSql(SQLTemplateTestBase):
                                  "tables", "sql")
         template_file = self.get_template_file(version, file_path,
                                                "nodes.sql")
-        template = file_as_template(template_file)
+        jinja2.filters.FILTERS['qtLiteral'] = \
+            DriverRegistry.create(PG_DEFAULT_DRIVER).qtLiteral
+        template = file_as_template(
+            template_file,
+            os.path.join(os.path.dirname(__file__), "..", "..", "templates")
+        )
         public_schema_id = 2200
         sql = template.render(scid=public_schema_id)
         return sql
@@ -0,0 +1,113 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import os
+
+import jinja2
+from config import PG_DEFAULT_DRIVER
+from pgadmin.utils.driver import DriverRegistry
+from regression.python_test_utils.sql_template_test_base import \
+    SQLTemplateTestBase
+from regression.python_test_utils.template_helper import file_as_template
+
+TABLE_NAMES = ['paging_a', 'paging_b', 'paging_c', 'pagingxd']
+
+
+class TestTablesNodesPagingSql(SQLTemplateTestBase):
+    """
+    Fetch the table nodes of a schema by pages (after the given table, ordered
+    by name), and filtered by name.
+    """
+    scenarios = [
+        (
+            'Fetch the first page of the table nodes',
+            dict(limit=2, after=None, name_filter=None,
+                 expected=['paging_a', 'paging_b'])
+        ),
+        (
+            'Fetch the next page of the table nodes',
+            dict(limit=2, after='paging_b', name_filter=None,
+                 expected=['paging_c', 'pagingxd'])
+        ),
+        (
+            'Fetch the last page of the table nodes',
+            dict(limit=2, after='pagingxd', name_filter=None,
+                 expected=['test_table'])
+        ),
+        (
+            'Fetch the next page of the table nodes after a dropped table',
+            dict(limit=2, after='paging_bb', name_filter=None,
+                 expected=['paging_c', 'pagingxd'])
+        ),
+        (
+            'Fetch the table nodes filtered by name',
+            dict(limit=None, after=None, name_filter='%G\\_%',
+                 expected=['paging_a', 'paging_b', 'paging_c'])
+        ),
+        (
+            'Fetch the next page of the table nodes filtered by name',
+            dict(limit=1, after='paging_a', name_filter='%G\\_%',
+                 expected=['paging_b'])
+        ),
+    ]
+
+    def __init__(self):
+        super(TestTablesNodesPagingSql, self).__init__()
+        self.schema_id = -1
+        self.table_ids = dict()
+        self.dropped_id = None
+
+    def test_setup(self, connection, cursor):
+        for table_name in TABLE_NAMES:
+            cursor.execute("CREATE TABLE public.{0} ()".format(table_name))
+
+        cursor.execute(
+            "SELECT c.relname, c.oid, c.relnamespace FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = 'public' AND c.relkind = 'r'"
+        )
+        for name, oid, schema_id in cursor.fetchall():
+            self.table_ids[name] = oid
+            self.schema_id = schema_id
+
+        cursor.execute("CREATE TABLE public.paging_bb ()")
+        cursor.execute("SELECT 'public.paging_bb'::regclass::oid")
+        self.dropped_id = cursor.fetchone()[0]
+        cursor.execute("DROP TABLE public.paging_bb")
+
+    def generate_sql(self, version):
+        file_path = os.path.join(os.path.dirname(__file__), "..", "templates",
+                                 "tables", "sql")
+        template_file = self.get_template_file(version, file_path,
+                                               "nodes.sql")
+        jinja2.filters.FILTERS['qtLiteral'] = \
+            DriverRegistry.create(PG_DEFAULT_DRIVER).qtLiteral
+        template = file_as_template(
+            template_file,
+            os.path.join(os.path.dirname(__file__), "..", "..", "templates")
+        )
+
+        return template.render(
+            scid=self.schema_id,
+            paging=dict(
+                limit=self.limit,
+                after=self.table_ids.get(self.after, self.dropped_id)
+                if self.after else None,
+                after_name=self.after,
+                name_filter=self.name_filter
+            )
+        )
+
+    def assertions(self, fetch_result, descriptions):
+        name_index = [description.name for description in descriptions] \
+            .index('name')
+
+        self.assertEqual(
+            [row[name_index] for row in fetch_result], self.expected
+        )
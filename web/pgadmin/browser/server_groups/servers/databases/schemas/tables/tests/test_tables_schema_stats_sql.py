@@ -0,0 +1,78 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import os
+
+import jinja2
+from regression.python_test_utils.sql_template_test_base import \
+    SQLTemplateTestBase
+from regression.python_test_utils.template_helper import file_as_template
+
+
+class TestTablesSchemaStatsSql(SQLTemplateTestBase):
+    """
+    Fetch the statistics of all the tables (indexes) of the schema, the same
+    as fetched for a table (index).
+    """
+    scenarios = [
+        (
+            'Fetch the statistics of the tables of the schema',
+            dict(template_dir='tables')
+        ),
+        (
+            'Fetch the statistics of the indexes of the schema',
+            dict(template_dir='indexes')
+        ),
+    ]
+
+    def __init__(self):
+        super(TestTablesSchemaStatsSql, self).__init__()
+        self.object_id = -1
+        self.expected = None
+
+    def _render(self, version, filename, **kwargs):
+        file_path = os.path.join(os.path.dirname(__file__), "..", "templates",
+                                 self.template_dir, "sql")
+        template_file = self.get_template_file(version, file_path, filename)
+        jinja2.filters.FILTERS['qtIdent'] = \
+            lambda conn, value: '"{0}"'.format(value)
+        template = file_as_template(template_file)
+
+        return template.render(conn=None, _=lambda s: s, **kwargs)
+
+    def test_setup(self, connection, cursor):
+        cursor.execute("CREATE INDEX test_table_idx ON test_table (value)")
+        cursor.execute("SELECT 'test_table'::regclass::oid, "
+                       "'test_table_idx'::regclass::oid")
+        table_id, index_id = cursor.fetchone()
+        self.object_id = table_id if self.template_dir == 'tables' else \
+            index_id
+
+        sql = self._render(
+            connection.server_version, 'stats.sql', tid=table_id,
+            idx=index_id, is_pgstattuple=False
+        )
+        cursor.execute(sql)
+        self.expected = dict(
+            zip([desc[0] for desc in cursor.description], cursor.fetchone())
+        )
+
+    def generate_sql(self, version):
+        return self._render(version, 'schema_stats.sql', scid=2200)
+
+    def assertions(self, fetch_result, descriptions):
+        names = [desc[0] for desc in descriptions]
+        rows = [dict(zip(names, row)) for row in fetch_result]
+
+        row = [row for row in rows if row['oid'] == self.object_id][0]
+        self.assertEqual(row['name'], 'test_table' if
+                         self.template_dir == 'tables' else 'test_table_idx')
+
+        for name, value in self.expected.items():
+            self.assertEqual(row[name], value)
@@ -10,6 +10,7 @@
 """ Implements Utility class for Table and Partitioned Table. """
 
 import re
+import time
 from functools import wraps
 import simplejson as json
 from flask import render_template, jsonify, request
@@ -24,6 +25,9 @@ from pgadmin.browser.server_groups.servers.databases.schemas.utils \
 from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
 from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.server_groups.servers.databases.schemas.tables.\
+    statistics_cache import table_statistics_cache
+from pgadmin.tools.sqleditor.utils.catalog_cache import catalog_cache
 from pgadmin.utils import IS_PY2
 from pgadmin.utils.compile_template_name import compile_template_path
 from pgadmin.utils.driver import get_driver
@@ -70,6 +74,10 @@ class BaseTableView(PGChildNodeView, BasePartitionTable):
       - Returns the statistics for a particular table if tid is specified,
         otherwise it will return statistics for all the tables in that
         schema.
+
+    * get_schema_statistics(self, scid, with_indexes, refresh):
+      - Returns the (cached) statistics snapshot of all the tables, and
+        optionally the indexes, of the schema.
     * get_reverse_engineered_sql(self, did, scid, tid, main_sql, data):
       - This function will creates reverse engineered sql for
         the table object.
@@ -776,6 +784,57 @@ class BaseTableView(PGChildNodeView, BasePartitionTable):
         schema.
         """
 
+        is_pgstattuple = False
+        if tid is not None:
+            # Check if pgstattuple extension is already created?
+            # if created then only add extended stats
+            status, is_pgstattuple = self.conn.execute_scalar("""
+            SELECT (count(extname) > 0) AS is_pgstattuple
+            FROM pg_extension
+            WHERE extname='pgstattuple'
+            """)
+            if not status:
+                return internal_server_error(errormsg=is_pgstattuple)
+
+        # Serve the statistics of the table from the snapshot of the schema,
+        # unless the extended statistics (pgstattuple) are to be fetched
+        if tid is not None and not is_pgstattuple and \
+                table_statistics_cache.enabled and \
+                self.manager.server_type != 'gpdb':
+            requested_at = time.time()
+            status, snapshot = self.get_schema_statistics(scid)
+            if not status:
+                return internal_server_error(errormsg=snapshot)
+
+            # The table may have been created after the cached snapshot, which
+            # is then refreshed (once). The tables missing from the refreshed
+            # snapshot (e.g. the partitioned tables, before PostgreSQL 14) are
+            # remembered, not to refresh it again for each request.
+            if tid not in snapshot['table_rows'] and \
+                    tid not in snapshot['missing_tids'] and \
+                    snapshot['fetched_at'] < requested_at:
+                status, snapshot = self.get_schema_statistics(
+                    scid, refresh=True
+                )
+                if not status:
+                    return internal_server_error(errormsg=snapshot)
+
+            row = snapshot['table_rows'].get(tid)
+            if row is None:
+                snapshot['missing_tids'].add(tid)
+            else:
+                columns = snapshot['tables']['columns']
+                return make_json_response(
+                    data={
+                        'columns': columns,
+                        'rows': [dict(
+                            (col['name'], row[col['name']])
+                            for col in columns
+                        )]
+                    },
+                    status=200
+                )
+
         # Fetch schema name
         status, schema_name = self.conn.execute_scalar(
             render_template(
@@ -797,16 +856,6 @@ class BaseTableView(PGChildNodeView, BasePartitionTable):
         else:
             # For Individual table stats
 
-            # Check if pgstattuple extension is already created?
-            # if created then only add extended stats
-            status, is_pgstattuple = self.conn.execute_scalar("""
-            SELECT (count(extname) > 0) AS is_pgstattuple
-            FROM pg_extension
-            WHERE extname='pgstattuple'
-            """)
-            if not status:
-                return internal_server_error(errormsg=is_pgstattuple)
-
             # Fetch Table name
             status, table_name = self.conn.execute_scalar(
                 render_template(
@@ -834,6 +883,73 @@ class BaseTableView(PGChildNodeView, BasePartitionTable):
             status=200
         )
 
+    def get_schema_statistics(self, scid, with_indexes=False, refresh=False):
+        """
+        Returns the statistics snapshot of all the tables (and of all the
+        indexes, if asked for) of the schema, from the cache if not older
+        than TABLE_STATISTICS_CACHE_TTL.
+
+        Args:
+            scid: Schema Id
+            with_indexes: Fetch the statistics of the indexes too
+            refresh: Fetch the statistics even if cached
+
+        Returns:
+            status, snapshot (or the error message)
+        """
+        snapshot = None if refresh else table_statistics_cache.get(
+            self.manager.sid, self.conn.conn_id, scid, with_indexes
+        )
+        if snapshot is not None:
+            return True, snapshot
+
+        status, res = self.conn.execute_dict(
+            render_template(
+                "/".join([self.table_template_path, 'schema_stats.sql']),
+                conn=self.conn, scid=scid
+            )
+        )
+        if not status:
+            return False, res
+
+        # Not the statistics, but the table (index) identifiers
+        internal_columns = ('oid', 'name', 'tid')
+
+        snapshot = {
+            'tables': {
+                'columns': [col for col in res['columns']
+                            if col['name'] not in internal_columns],
+                'rows': res['rows']
+            },
+            'indexes': None,
+            'table_rows': dict((row['oid'], row) for row in res['rows']),
+            # The tables not found in the snapshot
+            'missing_tids': set(),
+            'fetched_at': time.time()
+        }
+
+        if with_indexes:
+            status, res = self.conn.execute_dict(
+                render_template(
+                    "/".join([self.index_template_path, 'schema_stats.sql']),
+                    conn=self.conn, scid=scid
+                )
+            )
+            if not status:
+                return False, res
+
+            snapshot['indexes'] = {
+                'columns': [col for col in res['columns']
+                            if col['name'] not in internal_columns],
+                'rows': res['rows']
+            }
+
+        table_statistics_cache.put(
+            self.manager.sid, self.conn.conn_id, scid, snapshot
+        )
+
+        return True, snapshot
+
     def get_reverse_engineered_sql(self, did, scid, tid, main_sql, data):
         """
         This function will creates reverse engineered sql for
@@ -1173,6 +1289,8 @@ class BaseTableView(PGChildNodeView, BasePartitionTable):
             if not status:
                 return internal_server_error(errormsg=res)
 
+            table_statistics_cache.invalidate(self.manager.sid, scid)
+
             return make_json_response(
                 success=1,
                 info=gettext("Table statistics have been reset"),
@@ -2016,6 +2134,8 @@ class BaseTableView(PGChildNodeView, BasePartitionTable):
 
             SQL = SQL.strip('\n').strip(' ')
             status, rest = self.conn.execute_scalar(SQL)
+            # The columns of the table may have been changed
+            catalog_cache.invalidate_table(sid, did, tid)
             if not status:
                 return internal_server_error(errormsg=rest)
 
@@ -2374,6 +2494,7 @@ class BaseTableView(PGChildNodeView, BasePartitionTable):
             conn=self.conn
         )
         status, res = self.conn.execute_scalar(SQL)
+        catalog_cache.invalidate_table(sid, did, tid)
         if not status:
             return status, res
 
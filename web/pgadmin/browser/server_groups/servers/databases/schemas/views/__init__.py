@@ -23,7 +23,7 @@ from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
 from pgadmin.browser.utils import PGChildNodeView
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
-    make_response as ajax_response, gone
+    make_response as ajax_response, gone, bad_request
 from pgadmin.utils.driver import get_driver
 
 """
@@ -373,8 +373,12 @@ class ViewNode(PGChildNodeView, VacuumSettings):
         Lists all views under the Views Collection node
         """
         res = []
+        status, paging = self.get_nodes_paging()
+        if not status:
+            return bad_request(errormsg=paging)
+
         SQL = render_template("/".join(
-            [self.template_path, 'sql/nodes.sql']), scid=scid)
+            [self.template_path, 'sql/nodes.sql']), scid=scid, paging=paging)
         status, rset = self.conn.execute_2darray(SQL)
         if not status:
             return internal_server_error(errormsg=rset)
@@ -1,3 +1,4 @@
+{% import 'macros/schemas/nodes.macros' as NODES %}
 SELECT
     c.oid,
     c.relname AS name
@@ -8,6 +9,8 @@ WHERE
     AND c.oid = {{vid}}::oid
 {% elif scid %}
     AND c.relnamespace = {{scid}}::oid
+{{ NODES.WHERE(paging, 'c', 'relname') }}
 ORDER BY
-    c.relname
+    c.relname, c.oid
+{{ NODES.LIMIT(paging) }}
 {% endif %}
\ No newline at end of file
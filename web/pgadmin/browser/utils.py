@@ -331,6 +331,57 @@ class NodeView(with_metaclass(MethodViewType, View)):
 
 
 class PGChildNodeView(NodeView):
+    @staticmethod
+    def get_nodes_paging():
+        """
+        Returns the paging arguments of the request for the nodes of a
+        collection, i.e. (all optional):
+            limit - Maximum number of the nodes to return
+            after - Oid of the last node of the previous page, the nodes are
+                    ordered by name (and oid)
+            after_name - Name of the last node of the previous page (required
+                         with after)
+            filter - Return only the nodes with the name containing it (case
+                     insensitive)
+
+        Returns:
+            status, dict of limit, after, after_name and name_filter (the
+            ILIKE pattern) (or the error message)
+        """
+        args = flask.request.args
+        paging = dict(limit=None, after=None, after_name=None,
+                      name_filter=None)
+
+        for arg in ('limit', 'after'):
+            value = args.get(arg)
+            if value:
+                try:
+                    paging[arg] = int(value)
+                except ValueError:
+                    return False, gettext(
+                        "Invalid value for the '{0}' argument."
+                    ).format(arg)
+                if paging[arg] <= 0:
+                    return False, gettext(
+                        "Invalid value for the '{0}' argument."
+                    ).format(arg)
+
+        if paging['after']:
+            paging['after_name'] = args.get('after_name')
+            if paging['after_name'] is None:
+                return False, gettext(
+                    "The '{0}' argument is required with the '{1}' argument."
+                ).format('after_name', 'after')
+
+        name_filter = args.get('filter')
+        if name_filter:
+            paging['name_filter'] = u'%{0}%'.format(
+                name_filter.replace('\\', '\\\\').replace('%', '\\%')
+                .replace('_', '\\_')
+            )
+
+        return True, paging
+
     def children(self, **kwargs):
         """Build a list of treeview nodes from the child nodes."""
 
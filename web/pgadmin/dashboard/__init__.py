@@ -8,6 +8,7 @@
 ##########################################################################
 
 """A blueprint module implementing the dashboard frame."""
+from collections import OrderedDict
 from functools import wraps
 from flask import render_template, url_for, Response, g, request
 from flask_babelex import gettext
@@ -20,6 +21,7 @@ from pgadmin.utils.ajax import precondition_required
 from pgadmin.utils.driver import get_driver
 from pgadmin.utils.menu import Panel
 from pgadmin.utils.preferences import Preferences
+from pgadmin.dashboard.sampler import dashboard_sampler
 
 from config import PG_DEFAULT_DRIVER
 
@@ -158,6 +160,9 @@ class DashboardModule(PgAdminModule):
             'dashboard.dashboard_stats',
             'dashboard.dashboard_stats_sid',
             'dashboard.dashboard_stats_did',
+            'dashboard.dashboard_stats_history',
+            'dashboard.dashboard_stats_history_sid',
+            'dashboard.dashboard_stats_history_did',
             'dashboard.activity',
             'dashboard.get_activity_by_server_id',
             'dashboard.get_activity_by_database_id',
@@ -315,6 +320,30 @@ def index(sid=None, did=None):
         )
 
 
+def _server_key():
+    """
+    Returns the key of the server (and the role connected as), against which
+    the statistics are shared by the dashboards. The servers connected to
+    through an SSH tunnel are told apart by the tunnel host and port.
+    """
+    tunnel = (g.manager.tunnel_host, g.manager.tunnel_port) \
+        if g.manager.use_ssh_tunnel else None
+    return (g.manager.host, g.manager.hostaddr, g.manager.port,
+            g.manager.service, tunnel, g.manager.user, g.manager.role)
+
+
+def _sampler_key(did):
+    return _server_key(), g.conn.db if did else None
+
+
+def _untranslated(message):
+    """
+    Used as the gettext function while rendering the SQL of the shared
+    samples - the labels are translated for each dashboard instead.
+    """
+    return message
+
+
 def get_data(sid, did, template):
     """
     Generic function to get server stats based on an SQL template
@@ -331,20 +360,35 @@ def get_data(sid, did, template):
     if not sid:
         return internal_server_error(errormsg='Server ID not specified.')
 
-    sql = render_template(
-        "/".join([g.template_path, template]), did=did
+    def query():
+        sql = render_template(
+            "/".join([g.template_path, template]), did=did
+        )
+        status, res = g.conn.execute_dict(sql)
+        return status, res['rows'] if status else res
+
+    status, res = dashboard_sampler.get_result(
+        _sampler_key(did), template, query
     )
-    status, res = g.conn.execute_dict(sql)
 
     if not status:
         return internal_server_error(errormsg=res)
 
     return ajax_response(
-        response=res['rows'],
+        response=res,
         status=200
     )
 
 
+def _translate_charts(charts):
+    return dict(
+        (chart_name, OrderedDict(
+            (gettext(label), value) for label, value in chart_data
+        ))
+        for chart_name, chart_data in charts.items()
+    )
+
+
 @blueprint.route('/dashboard_stats',
                  endpoint='dashboard_stats')
 @blueprint.route('/dashboard_stats/<int:sid>',
@@ -362,15 +406,29 @@ def dashboard_stats(sid=None, did=None):
         if not sid:
             return internal_server_error(errormsg='Server ID not specified.')
 
-        sql = render_template(
-            "/".join([g.template_path, 'dashboard_stats.sql']), did=did,
-            chart_names=chart_names,
+        def sample(sample_chart_names):
+            sql = render_template(
+                "/".join([g.template_path, 'dashboard_stats.sql']), did=did,
+                chart_names=sample_chart_names, _=_untranslated
+            )
+            status, res = g.conn.execute_dict(sql)
+            if not status:
+                return status, res
+
+            return True, dict(
+                (chart_row['chart_name'], list(json.loads(
+                    chart_row['chart_data'], object_pairs_hook=OrderedDict
+                ).items()))
+                for chart_row in res['rows']
+            )
+
+        status, charts = dashboard_sampler.get_charts(
+            _sampler_key(did), chart_names, sample
         )
-        status, res = g.conn.execute_dict(sql)
+        if not status:
+            return internal_server_error(errormsg=charts)
 
-        for chart_row in res['rows']:
-            resp_data[chart_row['chart_name']] = \
-                json.loads(chart_row['chart_data'])
+        resp_data = _translate_charts(charts)
 
     return ajax_response(
         response=resp_data,
@@ -378,6 +436,39 @@ def dashboard_stats(sid=None, did=None):
     )
 
 
+@blueprint.route('/dashboard_stats_history',
+                 endpoint='dashboard_stats_history')
+@blueprint.route('/dashboard_stats_history/<int:sid>',
+                 endpoint='dashboard_stats_history_sid')
+@blueprint.route('/dashboard_stats_history/<int:sid>/<int:did>',
+                 endpoint='dashboard_stats_history_did')
+@login_required
+@check_precondition
+def dashboard_stats_history(sid=None, did=None):
+    """
+    Returns the recent values of the given graphs (sampled for any of the
+    dashboards of the server), the oldest first, to fill the graphs of a
+    newly opened dashboard.
+    """
+    if not sid:
+        return internal_server_error(errormsg='Server ID not specified.')
+
+    chart_names = [
+        chart_name for chart_name in
+        request.args.get('chart_names', '').split(',') if chart_name
+    ]
+    refresh_rate = max(request.args.get('refresh_rate', 1, type=int), 1)
+
+    history = dashboard_sampler.get_history(
+        _sampler_key(did), chart_names, refresh_rate
+    )
+
+    return ajax_response(
+        response=[_translate_charts(charts) for charts in history],
+        status=200
+    )
+
+
 @blueprint.route('/activity/', endpoint='activity')
 @blueprint.route('/activity/<int:sid>', endpoint='get_activity_by_server_id')
 @blueprint.route(
@@ -460,6 +551,9 @@ def cancel_query(sid=None, did=None, pid=None):
     if not status:
         return internal_server_error(errormsg=res)
 
+    # Show the change in the activity of the dashboards
+    dashboard_sampler.invalidate_results(_server_key())
+
     return ajax_response(
         response=gettext("Success") if res else gettext("Failed"),
         status=200
@@ -487,6 +581,9 @@ def terminate_session(sid=None, did=None, pid=None):
     if not status:
         return internal_server_error(errormsg=res)
 
+    # Show the change in the activity of the dashboards
+    dashboard_sampler.invalidate_results(_server_key())
+
     return ajax_response(
         response=gettext("Success") if res else gettext("Failed"),
         status=200
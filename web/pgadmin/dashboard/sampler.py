@@ -0,0 +1,280 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Shared sampling of the dashboard statistics.
+
+The dashboards of the same server (or database), connected to as the same
+role, share the statistics. The graph statistics (of all the graphs) are
+queried at most once per sampling interval, by the first dashboard asking
+for them, and the other dashboards are served from the last sample. The
+samples are kept in a ring buffer, to fill the graphs of a newly opened
+dashboard with the recent history. The results of the activity, locks,
+prepared transactions and configuration queries are shared the same way.
+
+The statistics are queried outside of the locks, the other dashboards wait
+for the running query (for a while), instead of querying them again.
+"""
+
+import time
+from collections import deque
+from threading import Lock, Event
+
+from config import DASHBOARD_SAMPLE_INTERVAL, DASHBOARD_SAMPLE_HISTORY
+
+# Names of the graphs, sampled together
+CHART_NAMES = ('session_stats', 'tps_stats', 'ti_stats', 'to_stats',
+               'bio_stats')
+
+# Number of the points shown by a graph
+MAX_CHART_POINTS = 101
+
+# Seconds to wait for the statistics being queried for another dashboard,
+# before querying them on the own connection
+SAMPLE_WAIT_TIMEOUT = 5
+
+
+class DashboardSamples(object):
+    """
+    class DashboardSamples
+
+        Samples of the statistics of a server (or a database).
+    """
+
+    def __init__(self, max_samples):
+        # chart name => labels of the values of the chart
+        self.labels = dict()
+        # (sampled at, {chart name => values of the chart})
+        self.samples = deque(maxlen=max_samples)
+        # query name => (queried at, result)
+        self.results = dict()
+        # query name => event set when the running query has finished
+        self.running = dict()
+        self.last_used = time.time()
+        self.lock = Lock()
+
+    def add_sample(self, sampled_at, charts):
+        values = dict()
+        for chart_name, chart_data in charts.items():
+            self.labels[chart_name] = tuple(label for label, _ in chart_data)
+            values[chart_name] = tuple(value for _, value in chart_data)
+        self.samples.append((sampled_at, values))
+
+    def chart_data(self, values, chart_names):
+        return dict(
+            (chart_name, list(zip(self.labels[chart_name],
+                                  values[chart_name])))
+            for chart_name in chart_names if chart_name in values
+        )
+
+
+class DashboardSampler(object):
+    """
+    class DashboardSampler
+
+        Keeps the samples of the statistics against the key of the server
+        (i.e. the server, and the role connected as), and the database.
+    """
+
+    def __init__(self, interval, max_samples,
+                 wait_timeout=SAMPLE_WAIT_TIMEOUT):
+        self.interval = interval
+        self.max_samples = max_samples
+        self.wait_timeout = wait_timeout
+        self._samples = dict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self):
+        return self.interval > 0
+
+    def _get_samples(self, key):
+        now = time.time()
+        # Forget the servers not asked for statistics for the whole history
+        expire_before = now - self.interval * self.max_samples
+
+        with self._lock:
+            for old_key in [k for k, v in self._samples.items()
+                            if v.last_used < expire_before]:
+                del self._samples[old_key]
+
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = DashboardSamples(self.max_samples)
+                self._samples[key] = samples
+            samples.last_used = now
+
+        return samples
+
+    def get_charts(self, key, chart_names, sample_func):
+        """
+        Returns the latest values of the given graphs, sampling the
+        statistics of all the graphs if the last sample is older than the
+        sampling interval.
+
+        Args:
+            key: (server key, database name) of the statistics
+            chart_names: Names of the graphs
+            sample_func: Function returning the status, and the list of
+                (label, value) pairs per chart name (or the error message),
+                of the given graphs
+
+        Returns:
+            status, [(label, value)...] per chart name (or the error message)
+        """
+        if not self.enabled:
+            return sample_func(chart_names)
+
+        samples = self._get_samples(key)
+
+        def fresh_sample():
+            if samples.samples and \
+                    time.time() - samples.samples[-1][0] < self.interval:
+                return samples.chart_data(samples.samples[-1][1],
+                                          chart_names)
+
+        def add_sample(charts):
+            samples.add_sample(time.time(), charts)
+            return samples.chart_data(samples.samples[-1][1], chart_names)
+
+        return self._shared_query(
+            samples, None, fresh_sample, lambda: sample_func(CHART_NAMES),
+            add_sample, lambda: sample_func(chart_names)
+        )
+
+    def get_history(self, key, chart_names, step,
+                    max_points=MAX_CHART_POINTS):
+        """
+        Returns the recent values of the given graphs, the oldest first.
+
+        Args:
+            key: (server key, database name) of the statistics
+            chart_names: Names of the graphs
+            step: Seconds between the values (i.e. the graph refresh rate)
+            max_points: Maximum number of the values
+
+        Returns:
+            list of the [(label, value)...] per chart name
+        """
+        if not self.enabled:
+            return []
+
+        samples = self._get_samples(key)
+        history = []
+
+        with samples.lock:
+            next_at = None
+            for sampled_at, values in reversed(samples.samples):
+                # The samples are not taken exactly on time
+                if next_at is not None and sampled_at > next_at:
+                    continue
+                history.append(samples.chart_data(values, chart_names))
+                if len(history) >= max_points:
+                    break
+                next_at = sampled_at - step + self.interval / 2.0
+
+        history.reverse()
+        return history
+
+    def get_result(self, key, name, query_func):
+        """
+        Returns the result of the given query (e.g. the activity), running
+        it if the last result is older than the sampling interval.
+
+        Args:
+            key: (server key, database name) of the statistics
+            name: Name of the query
+            query_func: Function returning the status, and the result (or
+                the error message) of the query
+
+        Returns:
+            status, result (or the error message)
+        """
+        if not self.enabled:
+            return query_func()
+
+        samples = self._get_samples(key)
+
+        def fresh_result():
+            queried_at, result = samples.results.get(name, (0, None))
+            if time.time() - queried_at < self.interval:
+                return result
+
+        def add_result(result):
+            samples.results[name] = (time.time(), result)
+            return result
+
+        return self._shared_query(
+            samples, name, fresh_result, query_func, add_result, query_func
+        )
+
+    def _shared_query(self, samples, name, fresh, query, add, own_query):
+        """
+        Returns the fresh result of the shared query (under the lock of the
+        samples), or runs it (outside of the lock). If the query is already
+        running for another dashboard, waits for its result. When the wait
+        times out, or the query fails, the own query is run (e.g. to report
+        the error of the own connection), and its result is not shared.
+
+        Returns:
+            status, result (or the error message)
+        """
+        with samples.lock:
+            result = fresh()
+            if result is not None:
+                return True, result
+
+            running = samples.running.get(name)
+            if running is None:
+                running = samples.running[name] = Event()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            running.wait(self.wait_timeout)
+            with samples.lock:
+                result = fresh()
+            if result is not None:
+                return True, result
+            return own_query()
+
+        try:
+            status, result = query()
+            if status:
+                with samples.lock:
+                    result = add(result)
+        finally:
+            with samples.lock:
+                samples.running.pop(name, None)
+            running.set()
+
+        return status, result
+
+    def invalidate_results(self, server_key):
+        """
+        Removes the query results of the given server (and its databases),
+        e.g. after cancelling a query or terminating a session.
+        """
+        with self._lock:
+            invalidated = [v for k, v in self._samples.items()
+                           if k[0] == server_key]
+
+        for samples in invalidated:
+            with samples.lock:
+                samples.results.clear()
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+dashboard_sampler = DashboardSampler(
+    DASHBOARD_SAMPLE_INTERVAL, DASHBOARD_SAMPLE_HISTORY
+)
@@ -414,7 +414,8 @@ define('pgadmin.dashboard', [
           return(`Seconds ago: ${parseInt(currVal.x * refresh)}</br>
                   Value: ${currVal.y}`);
         },
-        curr_epoch=commonUtils.getEpoch();
+        curr_epoch=commonUtils.getEpoch(),
+        new_chart_names = [];
 
       self.stopChartsPoller();
 
@@ -447,10 +448,15 @@ define('pgadmin.dashboard', [
             'refresh_on': curr_epoch,
             'refresh_rate': self.preferences[chart_config.refresh_pref_name],
           };
+          new_chart_names.push(chart_config.chart_name);
         }
       });
 
-      self.startChartsPoller(self.chart_store, self.sid, self.did);
+      self.fillChartsHistory(
+        self.chart_store, new_chart_names, self.sid, self.did
+      ).always(function() {
+        self.startChartsPoller(self.chart_store, self.sid, self.did);
+      });
     },
 
     getStatsUrl: function(sid=-1, did=-1, chart_names=[]) {
@@ -461,6 +467,35 @@ define('pgadmin.dashboard', [
       return base_url;
     },
 
+    getStatsHistoryUrl: function(sid=-1, did=-1, chart_name='', refresh_rate=1) {
+      let base_url = url_for('dashboard.dashboard_stats_history');
+      base_url += '/' + sid;
+      base_url += (did > 0) ? ('/' + did) : '';
+      base_url += '?chart_names=' + chart_name + '&refresh_rate=' + refresh_rate;
+      return base_url;
+    },
+
+    // Fill the new charts with the recent values sampled on the server
+    fillChartsHistory: function(chart_store, chart_names, sid, did) {
+      let self = this;
+
+      return $.when.apply($, chart_names.map((chart_name) => {
+        let chart = chart_store[chart_name];
+
+        return $.ajax({
+          url: self.getStatsHistoryUrl(sid, did, chart_name, chart.refresh_rate),
+          type: 'GET',
+        })
+          .done(function(resp) {
+            resp.map((charts) => {
+              if (charts[chart_name]) {
+                self.updateChart(chart.chart_obj, charts[chart_name]);
+              }
+            });
+          });
+      }));
+    },
+
     updateChart: function(chart_obj, new_data){
       // Dataset format:
       // [
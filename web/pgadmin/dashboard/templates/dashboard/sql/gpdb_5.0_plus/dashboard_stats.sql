@@ -1,13 +1,29 @@
 /*pga4dash*/
+{% set db_stats = 'tps_stats' in chart_names or 'ti_stats' in chart_names or 'to_stats' in chart_names or 'bio_stats' in chart_names %}
+{% if db_stats %}
+WITH db_stats AS (
+    SELECT
+        sum(xact_commit) AS xact_commit,
+        sum(xact_rollback) AS xact_rollback,
+        sum(tup_inserted) AS tup_inserted,
+        sum(tup_updated) AS tup_updated,
+        sum(tup_deleted) AS tup_deleted,
+        sum(tup_fetched) AS tup_fetched,
+        sum(tup_returned) AS tup_returned,
+        sum(blks_read) AS blks_read,
+        sum(blks_hit) AS blks_hit
+    FROM pg_stat_database{% if did %} WHERE datid = {{ did }}{% endif %}
+)
+{% endif %}
 {% set add_union = false %}
 {% if 'session_stats' in chart_names %}
 {% set add_union = true %}
 SELECT 'session_stats' AS chart_name, row_to_json(t) AS chart_data
 FROM (SELECT
-   (SELECT count(*) FROM pg_stat_activity{% if did %} WHERE datid = {{ did }} {% endif %}) AS "{{ _('Total') }}",
-   (SELECT count(*) FROM pg_stat_activity WHERE current_query NOT LIKE '<IDLE>%'{% if did %} AND datid = {{ did }} {% endif %})  AS "{{ _('Active') }}",
-   (SELECT count(*) FROM pg_stat_activity WHERE current_query LIKE '<IDLE>%'{% if did %} AND datid =  {{ did }} {% endif %})  AS "{{ _('Idle') }}"
-) t
+   count(*) AS "{{ _('Total') }}",
+   count(CASE WHEN current_query NOT LIKE '<IDLE>%' THEN 1 END) AS "{{ _('Active') }}",
+   count(CASE WHEN current_query LIKE '<IDLE>%' THEN 1 END) AS "{{ _('Idle') }}"
+FROM pg_stat_activity{% if did %} WHERE datid = {{ did }}{% endif %}) t
 {% endif %}
 {% if add_union and 'tps_stats' in chart_names %}
 UNION ALL
@@ -16,10 +32,10 @@ UNION ALL
 {% set add_union = true %}
 SELECT 'tps_stats' AS chart_name, row_to_json(t) AS chart_data
 FROM (SELECT
-   (SELECT sum(xact_commit) + sum(xact_rollback) FROM pg_stat_database{% if did %} WHERE datname = (SELECT datname FROM pg_database WHERE oid = {{ did }}){% endif %}) AS "{{ _('Transactions') }}",
-   (SELECT sum(xact_commit) FROM pg_stat_database{% if did %} WHERE datname = (SELECT datname FROM pg_database WHERE oid = {{ did }}){% endif %}) AS "{{ _('Commits') }}",
-   (SELECT sum(xact_rollback) FROM pg_stat_database{% if did %} WHERE datname = (SELECT datname FROM pg_database WHERE oid = {{ did }}){% endif %}) AS "{{ _('Rollbacks') }}"
-) t
+   xact_commit + xact_rollback AS "{{ _('Transactions') }}",
+   xact_commit AS "{{ _('Commits') }}",
+   xact_rollback AS "{{ _('Rollbacks') }}"
+FROM db_stats) t
 {% endif %}
 {% if add_union and 'ti_stats' in chart_names %}
 UNION ALL
@@ -28,10 +44,10 @@ UNION ALL
 {% set add_union = true %}
 SELECT 'ti_stats' AS chart_name, row_to_json(t) AS chart_data
 FROM (SELECT
-   (SELECT sum(tup_inserted) FROM pg_stat_database{% if did %} WHERE datname = (SELECT datname FROM pg_database WHERE oid = {{ did }}){% endif %}) AS "{{ _('Inserts') }}",
-   (SELECT sum(tup_updated) FROM pg_stat_database{% if did %} WHERE datname = (SELECT datname FROM pg_database WHERE oid = {{ did }}){% endif %}) AS "{{ _('Updates') }}",
-   (SELECT sum(tup_deleted) FROM pg_stat_database{% if did %} WHERE datname = (SELECT datname FROM pg_database WHERE oid = {{ did }}){% endif %}) AS "{{ _('Deletes') }}"
-) t
+   tup_inserted AS "{{ _('Inserts') }}",
+   tup_updated AS "{{ _('Updates') }}",
+   tup_deleted AS "{{ _('Deletes') }}"
+FROM db_stats) t
 {% endif %}
 {% if add_union and 'to_stats' in chart_names %}
 UNION ALL
@@ -40,9 +56,9 @@ UNION ALL
 {% set add_union = true %}
 SELECT 'to_stats' AS chart_name, row_to_json(t) AS chart_data
 FROM (SELECT
-   (SELECT sum(tup_fetched) FROM pg_stat_database{% if did %} WHERE datname = (SELECT datname FROM pg_database WHERE oid = {{ did }}){% endif %}) AS "{{ _('Fetched') }}",
-   (SELECT sum(tup_returned) FROM pg_stat_database{% if did %} WHERE datname = (SELECT datname FROM pg_database WHERE oid = {{ did }}){% endif %}) AS "{{ _('Returned') }}"
-) t
+   tup_fetched AS "{{ _('Fetched') }}",
+   tup_returned AS "{{ _('Returned') }}"
+FROM db_stats) t
 {% endif %}
 {% if add_union and 'bio_stats' in chart_names %}
 UNION ALL
@@ -51,7 +67,7 @@ UNION ALL
 {% set add_union = true %}
 SELECT 'bio_stats' AS chart_name, row_to_json(t) AS chart_data
 FROM (SELECT
-   (SELECT sum(blks_read) FROM pg_stat_database{% if did %} WHERE datname = (SELECT datname FROM pg_database WHERE oid = {{ did }}){% endif %}) AS "{{ _('Reads') }}",
-   (SELECT sum(blks_hit) FROM pg_stat_database{% if did %} WHERE datname = (SELECT datname FROM pg_database WHERE oid = {{ did }}){% endif %}) AS "{{ _('Hits') }}"
-) t
+   blks_read AS "{{ _('Reads') }}",
+   blks_hit AS "{{ _('Hits') }}"
+FROM db_stats) t
 {% endif %}
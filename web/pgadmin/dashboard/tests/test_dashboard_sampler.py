@@ -0,0 +1,240 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import sys
+import threading
+
+from pgadmin.dashboard.sampler import DashboardSampler, CHART_NAMES
+from pgadmin.utils.route import BaseTestGenerator
+
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
+SERVER_KEY = ('localhost', None, 5432, None, None, 'postgres', None)
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class DashboardSamplerTestCase(BaseTestGenerator):
+    """
+    Share the dashboard statistics sampled once per sampling interval.
+    """
+    scenarios = [
+        (
+            'Share the sample within the sampling interval',
+            dict(scenario='shared_sample')
+        ),
+        (
+            'Sample again after the sampling interval',
+            dict(scenario='new_sample')
+        ),
+        (
+            'Do not keep the sample on error',
+            dict(scenario='sample_error')
+        ),
+        (
+            'Return the history at the graph refresh rate',
+            dict(scenario='history')
+        ),
+        (
+            'Share the activity within the sampling interval',
+            dict(scenario='shared_result')
+        ),
+        (
+            'Wait for the sample being queried for another dashboard',
+            dict(scenario='wait_sample')
+        ),
+        (
+            'Sample on the own connection when the wait times out',
+            dict(scenario='wait_timeout')
+        ),
+        (
+            'Sample for every request when disabled',
+            dict(scenario='disabled')
+        ),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        self.clock = FakeClock()
+        self.sampler = DashboardSampler(1, 10)
+        self.calls = []
+
+        with patch('pgadmin.dashboard.sampler.time', self.clock):
+            getattr(self, self.scenario)()
+
+    def _sample(self, chart_names):
+        self.calls.append(chart_names)
+        return True, dict(
+            (chart_name, [('Total', len(self.calls)), ('Idle', 0)])
+            for chart_name in chart_names
+        )
+
+    def _get(self, key=(SERVER_KEY, None), chart_names=('session_stats',)):
+        status, charts = self.sampler.get_charts(
+            key, chart_names, self._sample
+        )
+        self.assertTrue(status)
+        return charts
+
+    def shared_sample(self):
+        charts = self._get()
+        self.clock.now += 0.5
+        self.assertEqual(self._get(chart_names=('bio_stats',)), {
+            'bio_stats': [('Total', 1), ('Idle', 0)]
+        })
+        self.assertEqual(charts, {
+            'session_stats': [('Total', 1), ('Idle', 0)]
+        })
+
+        # All the graphs are sampled together
+        self.assertEqual(self.calls, [CHART_NAMES])
+
+        # The statistics of a database are sampled separately
+        self._get(key=(SERVER_KEY, 'postgres'))
+        self.assertEqual(len(self.calls), 2)
+
+    def new_sample(self):
+        self._get()
+        self.clock.now += 1
+        self.assertEqual(
+            self._get(), {'session_stats': [('Total', 2), ('Idle', 0)]}
+        )
+
+    def sample_error(self):
+        status, msg = self.sampler.get_charts(
+            (SERVER_KEY, None), ('session_stats',),
+            lambda chart_names: (False, 'connection lost')
+        )
+        self.assertFalse(status)
+        self.assertEqual(msg, 'connection lost')
+
+        self.assertEqual(
+            self._get(), {'session_stats': [('Total', 1), ('Idle', 0)]}
+        )
+        self.assertEqual(
+            self.sampler.get_history((SERVER_KEY, None), ['session_stats'], 1),
+            [{'session_stats': [('Total', 1), ('Idle', 0)]}]
+        )
+
+    def history(self):
+        # Sampled every second (a bit late sometimes), 12 times, i.e. more
+        # than kept
+        for delay in (0, 1, 1.2, 1, 1, 1, 1, 1, 1.1, 1, 1, 1):
+            self.clock.now += delay
+            self._get()
+
+        history = self.sampler.get_history(
+            (SERVER_KEY, None), ['session_stats'], 1
+        )
+        self.assertEqual(
+            [charts['session_stats'][0][1] for charts in history],
+            list(range(3, 13))
+        )
+
+        history = self.sampler.get_history(
+            (SERVER_KEY, None), ['session_stats', 'tps_stats'], 3
+        )
+        self.assertEqual(
+            [charts['tps_stats'][0][1] for charts in history],
+            [3, 6, 9, 12]
+        )
+
+        history = self.sampler.get_history(
+            (SERVER_KEY, None), ['session_stats'], 1, max_points=2
+        )
+        self.assertEqual(len(history), 2)
+
+    def shared_result(self):
+        def query():
+            self.calls.append('activity')
+            return True, [{'pid': len(self.calls)}]
+
+        key = (SERVER_KEY, 'postgres')
+        self.assertEqual(
+            self.sampler.get_result(key, 'activity.sql', query),
+            (True, [{'pid': 1}])
+        )
+        self.clock.now += 0.5
+        self.assertEqual(
+            self.sampler.get_result(key, 'activity.sql', query),
+            (True, [{'pid': 1}])
+        )
+
+        # e.g. after terminating a session
+        self.sampler.invalidate_results(SERVER_KEY)
+        self.assertEqual(
+            self.sampler.get_result(key, 'activity.sql', query),
+            (True, [{'pid': 2}])
+        )
+
+    def _start_slow_sample(self):
+        """
+        Starts sampling for another dashboard, in a thread, and returns the
+        event finishing its query.
+        """
+        started = threading.Event()
+        finish = threading.Event()
+
+        def slow_sample(chart_names):
+            started.set()
+            finish.wait(5)
+            return self._sample(chart_names)
+
+        self.thread = threading.Thread(
+            target=self.sampler.get_charts,
+            args=((SERVER_KEY, None), ('session_stats',), slow_sample)
+        )
+        self.thread.start()
+        self.assertTrue(started.wait(5))
+        return finish
+
+    def wait_sample(self):
+        finish = self._start_slow_sample()
+        threading.Timer(0.1, finish.set).start()
+
+        # The lock is not held while sampling, the running query is waited
+        # for, and its sample shared
+        self.assertEqual(
+            self._get(), {'session_stats': [('Total', 1), ('Idle', 0)]}
+        )
+        self.thread.join()
+        self.assertEqual(self.calls, [CHART_NAMES])
+
+    def wait_timeout(self):
+        self.sampler.wait_timeout = 0.1
+        finish = self._start_slow_sample()
+
+        # Only the requested graphs are sampled on the own connection
+        self.assertEqual(
+            self._get(), {'session_stats': [('Total', 1), ('Idle', 0)]}
+        )
+        finish.set()
+        self.thread.join()
+        self.assertEqual(self.calls, [('session_stats',), CHART_NAMES])
+
+    def disabled(self):
+        self.sampler = DashboardSampler(0, 10)
+        self._get()
+        self._get()
+        self.assertEqual(self.calls, [('session_stats',)] * 2)
+        self.assertEqual(
+            self.sampler.get_history((SERVER_KEY, None), ['session_stats'], 1),
+            []
+        )
@@ -0,0 +1,180 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import os
+
+import simplejson as json
+from flask import Flask, render_template
+from jinja2 import FileSystemLoader
+
+from pgadmin.utils.route import BaseTestGenerator
+from regression.python_test_utils import test_utils
+
+CHART_NAMES = ['session_stats', 'tps_stats', 'ti_stats', 'to_stats',
+               'bio_stats']
+
+NUMBER_OF_BACKENDS = 5000
+NUMBER_OF_DATABASES = 1000
+
+
+class DashboardStatsSQLTestCase(BaseTestGenerator):
+    """
+    Run the graph statistics query (dashboard_stats.sql), on the statistics
+    views and on the simulated statistics views of a large server.
+    """
+    scenarios = [
+        (
+            'Graph statistics of the server',
+            dict(chart_names=CHART_NAMES, simulated=False)
+        ),
+        (
+            'Graph statistics of the database statistics only',
+            dict(chart_names=['tps_stats', 'bio_stats'], simulated=False)
+        ),
+        (
+            'Graph statistics of a simulated large server',
+            dict(chart_names=CHART_NAMES, simulated=True)
+        ),
+    ]
+
+    def setUp(self):
+        self.conn = test_utils.get_db_connection(
+            self.server['db'],
+            self.server['username'],
+            self.server['db_password'],
+            self.server['host'],
+            self.server['port'],
+            self.server['sslmode']
+        )
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _sql(self, did=None):
+        with FakeApp().app_context():
+            return render_template(
+                'dashboard/sql/default/dashboard_stats.sql',
+                chart_names=self.chart_names, did=did, _=lambda s: s
+            )
+
+    def _stats(self, did=None, sql=None):
+        if sql is None:
+            sql = self._sql(did)
+
+        cursor = self.conn.cursor()
+        cursor.execute(sql)
+        return dict(
+            (chart_name, json.loads(chart_data)
+             if not isinstance(chart_data, dict) else chart_data)
+            for chart_name, chart_data in cursor.fetchall()
+        )
+
+    def _simulate_stats_views(self):
+        # The temporary tables are looked up before the catalog
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "CREATE TEMPORARY TABLE pg_stat_activity AS "
+            "SELECT g AS pid, (g % {1} + 1)::oid AS datid, "
+            "(ARRAY['active', 'idle', 'idle in transaction'])[g % 3 + 1] "
+            "AS state FROM generate_series(1, {0}) g".format(
+                NUMBER_OF_BACKENDS, NUMBER_OF_DATABASES
+            )
+        )
+        cursor.execute(
+            "CREATE TEMPORARY TABLE pg_stat_database AS "
+            "SELECT g::oid AS datid, 'db' || g AS datname, "
+            "g::bigint AS xact_commit, 1::bigint AS xact_rollback, "
+            "g::bigint AS tup_inserted, g::bigint AS tup_updated, "
+            "g::bigint AS tup_deleted, g::bigint AS tup_fetched, "
+            "g::bigint AS tup_returned, g::bigint AS blks_read, "
+            "g::bigint AS blks_hit FROM generate_series(1, {0}) g".format(
+                NUMBER_OF_DATABASES
+            )
+        )
+
+    def _check_sql(self):
+        db_stats = any(chart_name != 'session_stats'
+                       for chart_name in self.chart_names)
+        session_stats = 'session_stats' in self.chart_names
+
+        for did in (None, 7):
+            sql = self._sql(did)
+            # The database statistics are read once, for all the graphs
+            self.assertEqual(sql.count('WITH db_stats AS ('), int(db_stats))
+            self.assertEqual(
+                sql.count('FROM pg_stat_database'), int(db_stats)
+            )
+            self.assertEqual(
+                sql.count('FROM db_stats'),
+                len(self.chart_names) - int(session_stats)
+            )
+            # The sessions are counted by state in one scan
+            self.assertEqual(
+                sql.count('FROM pg_stat_activity'), int(session_stats)
+            )
+            self.assertEqual(
+                sql.count('count(CASE WHEN state = '), 2 * int(session_stats)
+            )
+            if did:
+                self.assertEqual(
+                    sql.count('WHERE datid = 7'),
+                    int(db_stats) + int(session_stats)
+                )
+            else:
+                self.assertNotIn('WHERE datid', sql)
+
+    def runTest(self):
+        self._check_sql()
+
+        if not self.simulated:
+            stats = self._stats()
+            self.assertEqual(sorted(stats.keys()), sorted(self.chart_names))
+
+            tps_stats = stats['tps_stats']
+            self.assertEqual(
+                tps_stats['Transactions'],
+                tps_stats['Commits'] + tps_stats['Rollbacks']
+            )
+            if 'session_stats' in stats:
+                session_stats = stats['session_stats']
+                self.assertGreaterEqual(
+                    session_stats['Total'],
+                    session_stats['Active'] + session_stats['Idle']
+                )
+            return
+
+        self._simulate_stats_views()
+
+        stats = self._stats()
+        self.assertEqual(stats['session_stats'], {
+            'Total': NUMBER_OF_BACKENDS,
+            'Active': NUMBER_OF_BACKENDS // 3,
+            'Idle': NUMBER_OF_BACKENDS // 3 + 1,
+        })
+        self.assertEqual(
+            stats['tps_stats']['Rollbacks'], NUMBER_OF_DATABASES
+        )
+
+        stats = self._stats(did=7)
+        self.assertEqual(
+            stats['session_stats']['Total'],
+            NUMBER_OF_BACKENDS // NUMBER_OF_DATABASES
+        )
+        self.assertEqual(stats['bio_stats'], {'Reads': 7, 'Hits': 7})
+
+        self.conn.rollback()
+
+
+class FakeApp(Flask):
+    def __init__(self):
+        super(FakeApp, self).__init__('')
+        self.jinja_loader = FileSystemLoader(
+            os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                         os.pardir, 'templates')
+        )
@@ -0,0 +1,60 @@
+{# ============= Fetch the signature of the catalog objects per schema, used to detect the changes ============= #}
+{# Every DDL statement inserts, updates or deletes the catalog rows, which changes their count, maximum oid or xmin #}
+{% if schema_names %}
+WITH nsp AS (
+    SELECT oid, nspname FROM pg_catalog.pg_namespace
+    WHERE nspname IN ({{schema_names}})
+)
+SELECT nsp.nspname schema_name,
+    sig.object_type,
+    sig.signature
+FROM (
+    SELECT c.relnamespace nspoid,
+        CASE WHEN c.relkind IN ('r', 'p') THEN 'tables' ELSE 'views' END object_type,
+        'r' || count(*)::text || ':' || max(c.oid::text::bigint)::text || ':' ||
+            max(c.xmin::text::bigint)::text signature
+    FROM pg_catalog.pg_class c
+    WHERE c.relkind = ANY(array['r', 'p', 'v', 'm'])
+        AND c.relnamespace IN (SELECT oid FROM nsp)
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT c.relnamespace,
+        CASE WHEN c.relkind IN ('r', 'p') THEN 'tables' ELSE 'views' END,
+        'a' || count(*)::text || ':' || max(a.xmin::text::bigint)::text
+    FROM pg_catalog.pg_attribute a
+        INNER JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+    WHERE c.relkind = ANY(array['r', 'p', 'v', 'm'])
+        AND c.relnamespace IN (SELECT oid FROM nsp)
+        AND a.attnum > 0
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT fk.connamespace, 'tables',
+        'f' || count(*)::text || ':' || max(fk.oid::text::bigint)::text || ':' ||
+            max(fk.xmin::text::bigint)::text
+    FROM pg_catalog.pg_constraint fk
+    WHERE fk.contype = 'f' AND fk.connamespace IN (SELECT oid FROM nsp)
+    GROUP BY 1
+    UNION ALL
+    SELECT p.pronamespace, 'functions',
+        'p' || count(*)::text || ':' || max(p.oid::text::bigint)::text || ':' ||
+            max(p.xmin::text::bigint)::text
+    FROM pg_catalog.pg_proc p
+    WHERE p.pronamespace IN (SELECT oid FROM nsp)
+    GROUP BY 1
+    UNION ALL
+    SELECT t.typnamespace, 'datatypes',
+        't' || count(*)::text || ':' || max(t.oid::text::bigint)::text || ':' ||
+            max(t.xmin::text::bigint)::text
+    FROM pg_catalog.pg_type t
+    WHERE t.typnamespace IN (SELECT oid FROM nsp)
+    GROUP BY 1
+) sig
+    INNER JOIN nsp ON nsp.oid = sig.nspoid
+UNION ALL
+{% endif %}
+SELECT NULL::name schema_name,
+    'schemas'::text object_type,
+    'n' || count(*)::text || ':' || max(n.oid::text::bigint)::text || ':' ||
+        max(n.xmin::text::bigint)::text signature
+FROM pg_catalog.pg_namespace n
+ORDER BY 1, 2, 3
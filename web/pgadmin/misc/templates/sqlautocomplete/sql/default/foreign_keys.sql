@@ -24,4 +24,5 @@ JOIN pg_catalog.pg_class      t_p ON t_p.oid = fk.confrelid
 JOIN pg_catalog.pg_namespace  s_p ON s_p.oid = t_p.relnamespace
 JOIN pg_catalog.pg_class      t_c ON t_c.oid = fk.conrelid
 JOIN pg_catalog.pg_namespace  s_c ON s_c.oid = t_c.relnamespace
-WHERE fk.contype = 'f' AND s_p.nspname IN ({{schema_names}})
+WHERE fk.contype = 'f' AND (s_p.nspname IN ({{schema_names}}) OR
+    s_c.nspname IN ({{schema_names}}))
@@ -29,7 +29,7 @@ from flask_sqlalchemy import SQLAlchemy
 #
 ##########################################################################
 
-SCHEMA_VERSION = 24
+SCHEMA_VERSION = 25
 
 ##########################################################################
 #
@@ -325,4 +325,7 @@ class ProfilerSavedReports(db.Model):
     dbname = db.Column(db.String(), nullable=False)
     time = db.Column(db.String(), nullable=False)
     duration = db.Column(db.Integer(), nullable=False)
+    # Path of the HTML file of the reports saved before the report data
     path = db.Column(db.String(), nullable=False)
+    # Report data (compressed JSON)
+    data = db.Column(db.LargeBinary(), nullable=True)
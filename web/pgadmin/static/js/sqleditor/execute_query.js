@@ -117,7 +117,9 @@ class ExecuteQuery {
     axios.get(
       url_for('sqleditor.poll', {
         'trans_id': self.sqlServerObject.transId,
-      })
+      }),
+      // Let the server wait for the query to complete
+      {params: {'long_poll': 1}}
     ).then(
       (httpMessage) => {
         self.updateSqlEditorLastTransactionStatus(httpMessage.data.data.transaction_status);
@@ -140,8 +142,13 @@ class ExecuteQuery {
           if ('notifies' in httpMessage.data.data)
             self.sqlServerObject.update_notifications(httpMessage.data.data.notifies);
         } else if (ExecuteQuery.isQueryStillRunning(httpMessage)) {
-          // If status is Busy then poll the result by recursive call to the poll function
-          this.delayedPoll();
+          // If status is Busy then poll the result by recursive call to the poll function,
+          // without a delay if the server has already waited for the result.
+          if (httpMessage.data.data.long_poll) {
+            self.poll();
+          } else {
+            this.delayedPoll();
+          }
           self.sqlServerObject.setIsQueryRunning(true);
           if (httpMessage.data.data.result) {
             self.sqlServerObject.update_msg_history(httpMessage.data.data.status, httpMessage.data.data.result, false);
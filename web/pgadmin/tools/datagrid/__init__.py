@@ -11,7 +11,6 @@
 MODULE_NAME = 'datagrid'
 
 import simplejson as json
-import pickle
 import random
 
 from threading import Lock
@@ -20,6 +19,11 @@ from werkzeug.useragents import UserAgent
 from flask import current_app as app
 from flask_security import login_required
 from pgadmin.tools.sqleditor.command import *
+from pgadmin.tools.sqleditor.utils.copy_csv_download import \
+    copy_connection_id
+from pgadmin.tools.sqleditor.utils.transaction_registry import \
+    register_grid_transaction, get_grid_transaction, \
+    remove_grid_transaction
 from pgadmin.utils import PgAdminModule
 from pgadmin.utils.ajax import make_json_response, bad_request, \
     internal_server_error
@@ -81,8 +85,9 @@ class DataGridModule(PgAdminModule):
         """
         with query_tool_close_session_lock:
             if 'gridData' in session:
-                for trans_id in session['gridData']:
+                for trans_id in list(session['gridData']):
                     close_query_tool_session(trans_id)
+                    remove_grid_transaction(trans_id)
 
                 # Delete all grid data from session variable
                 del session['gridData']
@@ -186,20 +191,9 @@ def initialize_datagrid(cmd_type, obj_type, sgid, sid, did, obj_id):
     # Create a unique id for the transaction
     trans_id = str(random.randint(1, 9999999))
 
-    if 'gridData' not in session:
-        sql_grid_data = dict()
-    else:
-        sql_grid_data = session['gridData']
-
-    # Use pickle to store the command object which will be used later by the
-    # sql grid module.
-    sql_grid_data[trans_id] = {
-        # -1 specify the highest protocol version available
-        'command_obj': pickle.dumps(command_obj, -1)
-    }
-
-    # Store the grid dictionary into the session variable
-    session['gridData'] = sql_grid_data
+    # Register the command object which will be used later by the sql grid
+    # module, the session only stores the reference to it.
+    register_grid_transaction(trans_id, {'command_obj': command_obj})
 
     return make_json_response(
         data={
@@ -277,11 +271,10 @@ def panel(trans_id, is_query_tool, editor_title):
     # Fetch the server details
     bgcolor = None
     fgcolor = None
-    if 'gridData' in session and str(trans_id) in session['gridData']:
+    session_obj = get_grid_transaction(trans_id)
+    if session_obj is not None:
         # Fetch the object for the specified transaction id.
-        # Use pickle.loads function to get the command object
-        session_obj = session['gridData'][str(trans_id)]
-        trans_obj = pickle.loads(session_obj['command_obj'])
+        trans_obj = session_obj['command_obj']
         s = Server.query.filter_by(id=trans_obj.sid).first()
         if s and s.bgcolor:
             # If background is set to white means we do not have to change
@@ -392,25 +385,14 @@ def initialize_query_tool(sgid, sid, did=None):
     # Create a unique id for the transaction
     trans_id = str(random.randint(1, 9999999))
 
-    if 'gridData' not in session:
-        sql_grid_data = dict()
-    else:
-        sql_grid_data = session['gridData']
-
     # Set the value of auto commit and auto rollback specified in Preferences
     pref = Preferences.module('sqleditor')
     command_obj.set_auto_commit(pref.preference('auto_commit').get())
     command_obj.set_auto_rollback(pref.preference('auto_rollback').get())
 
-    # Use pickle to store the command object which will be used
-    # later by the sql grid module.
-    sql_grid_data[trans_id] = {
-        # -1 specify the highest protocol version available
-        'command_obj': pickle.dumps(command_obj, -1)
-    }
-
-    # Store the grid dictionary into the session variable
-    session['gridData'] = sql_grid_data
+    # Register the command object which will be used later by the sql grid
+    # module, the session only stores the reference to it.
+    register_grid_transaction(trans_id, {'command_obj': command_obj})
 
     return make_json_response(
         data={
@@ -442,9 +424,8 @@ def close(trans_id):
         try:
             close_query_tool_session(trans_id)
             # Remove the information of unique transaction id from the
-            # session variable.
-            grid_data.pop(str(trans_id), None)
-            session['gridData'] = grid_data
+            # session variable, and the transaction registry.
+            remove_grid_transaction(trans_id)
         except Exception as e:
             app.logger.error(e)
             return internal_server_error(errormsg=str(e))
@@ -503,9 +484,11 @@ def close_query_tool_session(trans_id):
     :return:
     """
 
-    cmd_obj_str = session['gridData'][str(trans_id)]['command_obj']
-    # Use pickle.loads function to get the command object
-    cmd_obj = pickle.loads(cmd_obj_str)
+    session_obj = get_grid_transaction(trans_id)
+    if session_obj is None:
+        return
+
+    cmd_obj = session_obj['command_obj']
 
     # if connection id is None then no need to release the connection
     if cmd_obj.conn_id is not None:
@@ -519,3 +502,6 @@ def close_query_tool_session(trans_id):
             if conn.connected():
                 conn.cancel_transaction(cmd_obj.conn_id, cmd_obj.did)
                 manager.release(did=cmd_obj.did, conn_id=cmd_obj.conn_id)
+
+            # Release the connection used for the CSV download (if any)
+            manager.release(conn_id=copy_connection_id(cmd_obj.conn_id))
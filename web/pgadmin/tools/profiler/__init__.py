@@ -20,7 +20,7 @@ import os
 from flask import url_for, Response, render_template, request, session, \
     current_app
 from flask_babelex import gettext
-from flask_security import login_required
+from flask_security import login_required, current_user
 from werkzeug.useragents import UserAgent
 
 from pgadmin.utils import PgAdminModule, \
@@ -35,7 +35,12 @@ from pgadmin.settings import get_setting
 from config import PG_DEFAULT_DRIVER
 from pgadmin.model import db, ProfilerSavedReports, ProfilerFunctionArguments
 from pgadmin.tools.profiler.utils.profiler_instance import ProfilerInstance
-from pgadmin.tools.profiler.utils.profiler_report import plprofiler_report
+from pgadmin.tools.profiler.utils.report_store import pack_report_data, \
+    unpack_report_data, report_html_cache
+from pgadmin.tools.profiler.utils.report_diff import diff_reports
+from pgadmin.tools.profiler.utils.flamegraph import generate_flamegraph
+from pgadmin.tools.profiler.utils.monitor_jobs import monitor_jobs, \
+    JOB_RUNNING
 from pgadmin.utils.preferences import Preferences
 
 ASYNC_OK = 1
@@ -99,8 +104,10 @@ class ProfilerModule(PgAdminModule):
                 'profiler.init_for_database', 'profiler.init_for_function',
                 'profiler.initialize_target_for_function',
                 'profiler.initialize_target_indirect',
-                'profiler.start_monitor', 'profiler.start_execution',
+                'profiler.start_monitor', 'profiler.monitor_status',
+                'profiler.start_execution',
                 'profiler.show_report', 'profiler.delete_report',
+                'profiler.compare_reports',
                 'profiler.get_src', 'profiler.get_parameters',
                 'profiler.get_reports',
                 'profiler.set_arguments', 'profiler.get_arguments',
@@ -641,6 +648,8 @@ def start_monitor(trans_id):
     start_monitor(trans_id)
 
     Starts to monitor the database that corresponds with the transaction id
+    in the background. The client polls for the report using the
+    monitor_status endpoint.
 
     Parameters:
         trans_id
@@ -659,9 +668,11 @@ def start_monitor(trans_id):
             }
         )
 
-    duration = pfl_inst.profiler_data['duration']
-    interval = pfl_inst.profiler_data['interval']
-    pid = pfl_inst.profiler_data['pid']
+    duration = int(pfl_inst.profiler_data['duration'])
+
+    # The preferences are read for the current user, hence - it can not be
+    # done in the background job.
+    opt_top = Preferences('profiler').preference('profiler_top_k').get()
 
     # Create asynchronous connection using random connection id.
     exe_conn_id = str(random.randint(1, 9999999))
@@ -678,6 +689,88 @@ def start_monitor(trans_id):
     if not status:
         return internal_server_error(errormsg=str(msg))
 
+    job, started = monitor_jobs.start(
+        _monitor_job_key(trans_id), duration, _monitor_database, conn,
+        pfl_inst.profiler_data, pfl_inst.config, opt_top
+    )
+
+    return make_json_response(
+        data={
+            'status': 'Started' if started else 'Running',
+            'duration': job.duration,
+            'elapsed': job.elapsed
+        }
+    )
+
+
+@blueprint.route(
+    '/monitor_status/<int:trans_id>', methods=['GET'],
+    endpoint='monitor_status'
+)
+@login_required
+def monitor_status(trans_id):
+    """
+    monitor_status(trans_id)
+
+    Returns the status of the monitoring started for the transaction id, and
+    the headers of the generated report once it has finished.
+
+    Parameters:
+        trans_id
+        - Transaction ID
+    """
+    job = monitor_jobs.pop_finished(_monitor_job_key(trans_id))
+
+    if job is None:
+        return make_json_response(
+            data={
+                'status': 'ERROR',
+                'result': gettext(
+                    'Could not find the monitoring job for the given '
+                    'transaction_id'
+                )
+            }
+        )
+
+    if job.status == JOB_RUNNING:
+        return make_json_response(
+            data={
+                'status': 'Running',
+                'duration': job.duration,
+                'elapsed': job.elapsed
+            }
+        )
+
+    return make_json_response(data=job.result)
+
+
+def _monitor_job_key(trans_id):
+    return current_user.id, trans_id
+
+
+def _monitor_database(conn, profiler_data, config, opt_top):
+    """
+    _monitor_database(conn, profiler_data, config, opt_top)
+
+    Enables the profiling for the duration given by the user, and generates
+    the report from the collected data. This is run as a background job.
+
+    Parameters:
+        conn
+        - Connected connection object to run queries on the server
+        profiler_data
+        - The profiling parameters of the transaction (duration, interval,
+          pid, etc.)
+        config
+        - Report options such as name/title/desc
+        opt_top
+        - Number of the functions to include in the report
+    Returns:
+        The data to be sent to the client
+    """
+    interval = profiler_data['interval']
+    pid = profiler_data['pid']
+
     status, res = conn.execute_async_list("""
                     SELECT N.nspname
                     FROM pg_catalog.pg_extension E
@@ -700,14 +793,15 @@ def start_monitor(trans_id):
             'SELECT pl_profiler_set_collect_interval(' + str(interval) + ')')
         conn.execute_async('RESET search_path')
         try:
-            time.sleep(int(duration))
+            time.sleep(int(profiler_data['duration']))
             conn.execute_async('SET search_path to ' + namespace)
-            report_data = _generate_report(conn, 'shared', func_oids={})
+            report_data = _generate_report(
+                conn, 'shared', func_oids={}, opt_top=opt_top)
             report_headers = _save_report(report_data,
-                                     pfl_inst.config,
+                                     config,
                                      conn.as_dict()['database'],
-                                     pfl_inst.profiler_data['profile_type'],
-                                     int(pfl_inst.profiler_data['duration']))
+                                     profiler_data['profile_type'],
+                                     int(profiler_data['duration']))
         except Exception as e:
 
             result = 'Error while generating report'
@@ -716,31 +810,25 @@ def start_monitor(trans_id):
                 ' were run during the monitoring duration)'):
                 result = str(e)
             current_app.logger.exception(e)
-            return make_json_response(
-                data={
-                    'status': 'ERROR',
-                    'result': result,
-                }
-            )
-    except Exception as e:
-        current_app.logger.exception(e)
-        return make_json_response(
-            data={
+            return {
                 'status': 'ERROR',
+                'result': result,
             }
-        )
+    except Exception as e:
+        current_app.logger.exception(e)
+        return {
+            'status': 'ERROR',
+        }
     finally:
         conn.execute_async('SET search_path to ' + namespace)
         conn.execute_async('SELECT pl_profiler_set_enabled_global(false)')
         conn.execute_async('SELECT pl_profiler_set_enabled_pid(0)')
         conn.execute_async('RESET search_path')
 
-    return make_json_response(
-        data={
-            'status': 'Success',
-            'report_headers': report_headers
-        }
-    )
+    return {
+        'status': 'Success',
+        'report_headers': report_headers
+    }
 
 
 @blueprint.route(
@@ -925,9 +1013,9 @@ def close_profiler_session(_trans_id, close_all=False):
             pfl_inst.clear()
 
 
-def _generate_report(conn, data_location, func_oids=None):
+def _generate_report(conn, data_location, func_oids=None, opt_top=None):
     """
-    _generate_report(trans_id)
+    _generate_report(conn, data_location, func_oids, opt_top)
 
     This method is used to generate HTML report data in our sqlite database
 
@@ -939,12 +1027,16 @@ def _generate_report(conn, data_location, func_oids=None):
         data_location
         - Either 'local' or 'shared', which is determined by the type
           of profiling
+        opt_top
+        - Number of the functions to include in the report, read from the
+          Preferences module if not given
     Returns:
         dictionary containing information about the performance profile
     """
 
     # Get the value for top_k set by the user from the Preferences module
-    opt_top = Preferences('profiler').preference('profiler_top_k').get()
+    if opt_top is None:
+        opt_top = Preferences('profiler').preference('profiler_top_k').get()
     if opt_top <= 0:
         raise Exception("Value for top_k is less than 1. Please change "
                         "value to be greater than or equal to 1.")
@@ -1008,7 +1100,8 @@ def _generate_report(conn, data_location, func_oids=None):
 
     # ----
     # The view for linestats is extremely inefficient. We select
-    # all of it once and cache it in a hash table.
+    # it once for all the selected functions and cache it in a hash
+    # table.
     # ----
     sql = render_template(
         "/".join([template_path,
@@ -1016,16 +1109,30 @@ def _generate_report(conn, data_location, func_oids=None):
         data_location=data_location
     )
     linestats = {}
-    status, result = conn.execute_async_list(sql)
+    status, result = conn.execute_async_list(sql, {'func_oids': func_oids})
     for row in result:
-        if row['func_oid'] not in linestats:
-            linestats[row['func_oid']] = []
-        linestats[row['func_oid']].append((row['func_oid'],
-                                          (row['line_number']),
-                                          (row['exec_count']),
-                                          (row['total_time']),
-                                          (row['longest_time']),
-                                          row['source']))
+        lines = linestats.get(row['func_oid'])
+        if lines is None:
+            lines = linestats[row['func_oid']] = []
+        lines.append({
+            'line_number': int(row['line_number']),
+            'source': row['source'],
+            'exec_count': int(row['exec_count']),
+            'total_time': int(row['total_time']),
+            'longest_time': int(row['longest_time']),
+        })
+
+    # ----
+    # Get the function definitions and overall stats of all the
+    # selected functions at once.
+    # ----
+    sql = render_template(
+        "/".join([template_path,
+                  'get_func_defs.sql']),
+        data_location=data_location
+    )
+    status, result = conn.execute_async_list(sql, {'func_oids': func_oids})
+    func_rows = dict((int(row['oid']), row) for row in result)
 
     # ----
     # Build a list of function definitions in the order, specified
@@ -1035,51 +1142,21 @@ def _generate_report(conn, data_location, func_oids=None):
     # ----
     func_defs = []
     for func_oid in func_oids:
-        sql = render_template(
-            "/".join([template_path,
-                      'get_func_defs.sql']),
-            data_location=data_location,
-            func_oid=func_oid
-        )
-
-        # ----
-        # First get the function definition and overall stats.
-        # ----
-        status, result = conn.execute_async_list(sql)
-        row = result[0]
+        row = func_rows.get(func_oid)
         if row is None:
             raise Exception("function with Oid %d not found\n" % func_oid)
 
-        # ----
-        # With that we can start the definition.
-        # ----
-        func_def = {
+        source = linestats.get(func_oid, [])
+        func_defs.append({
                 'funcoid': func_oid,
                 'schema': row['nspname'],
                 'funcname': row['proname'],
                 'funcresult': row['pg_get_function_result'],
                 'funcargs': row['pg_get_function_arguments'],
-                'total_time': linestats[func_oid][0][3],
+                'total_time': source[0]['total_time'] if source else 0,
                 'self_time': int(row['self_time']),
-                'source': [],
-            }
-
-        # ----
-        # Add all the source code lines to that.
-        # ----
-        for row in linestats[func_oid]:
-            func_def['source'].append({
-                    'line_number': int(row[1]),
-                    'source': row[5],
-                    'exec_count': int(row[2]),
-                    'total_time': int(row[3]),
-                    'longest_time': int(row[4]),
-                })
-
-        # ----
-        # Add this function to the list of function definitions.
-        # ----
-        func_defs.append(func_def)
+                'source': source,
+            })
 
     # ----
     # Get the callgraph data.
@@ -1091,16 +1168,17 @@ def _generate_report(conn, data_location, func_oids=None):
     )
     status, result = conn.execute_async_list(sql)
 
-    flamedata = ""
+    flamedata = []
     callgraph = []
     for row in result:
-        flamedata += \
-            str(row['array_to_string']) + " " + str(row['us_self']) + "\n"
+        flamedata.append(
+            "{0} {1}\n".format(row['array_to_string'], row['us_self']))
         callgraph.append((row['stack'],
                           int(row['call_count']),
                           int(row['us_total']),
                           int(row['us_children']),
                           int(row['us_self'])))
+    flamedata = "".join(flamedata)
 
     overflow_flags = {
         'callgraph_overflow': False,
@@ -1137,7 +1215,8 @@ def _save_report(report_data, config, dbname, profile_type, duration):
     """
     _save_report(report_data, config, dbname, profile_type, duration)
 
-    Generatins a HTML report and saves it internally
+    Saves the report data internally, the HTML report is generated from it
+    when the report is shown
 
     Parameters:
         report_data
@@ -1157,58 +1236,32 @@ def _save_report(report_data, config, dbname, profile_type, duration):
     report_data['config'] = config
 
     now = datetime.now().strftime("%Y-%m-%d | %H:%M")
-    path = os.path.dirname(os.path.abspath(current_app.root_path))
-    path = os.path.join(path, 'pgadmin', 'instance')
-    path = os.path.join(path, config['name'] + '@' + now + '.html')
-
-    report = ProfilerSavedReports.query.filter_by(path=path).first()
-
-    # To prevent duplicate reports with the same filename
-    # This would happen if the same profile was run multiple times in a minute
-    # This function works by checking if there is a report with the given path
-    # and continuously updating the search path with '(a)', where a increments
-    # until there is a file with the given path
-    version = ''
-    while report is not None:
-        if version == '':
-            version = '(a)'
-            path = path[:-5] + version + '.html'
-        else:
-            version = chr(ord(path[-7]) + 1)
-            path = path[:-7] + version + path[-6:]
-
-        report = ProfilerSavedReports.query.filter_by(path=path).first()
 
     try:
-        with open(path, 'w') as output_fd:
-            report = plprofiler_report()
-            report.generate(report_data, output_fd)
-
-            output_fd.close()
-
-            profile_report = ProfilerSavedReports(
-                name=config['name'],
-                direct=False if profile_type == 'indirect' else True,
-                dbname=dbname,
-                time=now,
-                duration=duration,
-                path=path
-            )
+        profile_report = ProfilerSavedReports(
+            name=config['name'],
+            direct=False if profile_type == 'indirect' else True,
+            dbname=dbname,
+            time=now,
+            duration=duration,
+            path='',
+            data=pack_report_data(report_data)
+        )
 
-            db.session.add(profile_report)
-            db.session.commit()
+        db.session.add(profile_report)
+        db.session.commit()
 
-            return {
-                'name': profile_report.name,
-                'database': profile_report.dbname,
-                'time': profile_report.time,
-                'profile_type': profile_report.direct,
-                'duration': profile_report.duration,
-                'report_id': profile_report.rid
-                    }
+        return {
+            'name': profile_report.name,
+            'database': profile_report.dbname,
+            'time': profile_report.time,
+            'profile_type': profile_report.direct,
+            'duration': profile_report.duration,
+            'report_id': profile_report.rid
+        }
     except Exception as e:
+        db.session.rollback()
         current_app.logger.exception(e)
-        os.remove(path)
 
 
 @blueprint.route(
@@ -1222,7 +1275,8 @@ def delete_report(report_id):
 
     Deletes the report with the given report id from PgAdmin4. This includes
     deleting the report data from the internal sqlite3 database and removing
-    it from the file system.
+    the HTML file of the reports saved before the report data from the file
+    system.
 
     Parameters:
         report_id
@@ -1249,6 +1303,14 @@ def delete_report(report_id):
         )
 
     db.session.commit()
+    report_html_cache.remove(report_id)
+
+    if not path:
+        return make_json_response(
+            data={
+                'status': 'Success'
+            }
+        )
 
     try:
         os.remove(path)
@@ -1275,7 +1337,8 @@ def show_report(report_id):
     """
     show_report(report_id)
 
-    Finds the saved HTML report that corresponds to the given report id
+    Renders the HTML report from the saved report data that corresponds to
+    the given report id
 
     Parameters:
         report_id
@@ -1285,10 +1348,20 @@ def show_report(report_id):
     """
     report = ProfilerSavedReports.query.filter_by(rid=report_id).first()
 
-    path = report.path
-
     if report is None:
         raise Exception('PgAdmin4 could not find the specified report')
+
+    if report.data is not None:
+        return Response(
+            report_html_cache.get(
+                report_id, lambda: unpack_report_data(report.data)
+            ),
+            mimetype="text/html"
+        )
+
+    # Reports saved as the HTML files
+    path = report.path
+
     if not os.path.exists(path):
         raise Exception('The selected report could not be found by PgAdmin4')
 
@@ -1298,6 +1371,66 @@ def show_report(report_id):
         return Response(report_data, mimetype="text/html")
 
 
+@blueprint.route(
+    '/compare_reports/<int:base_report_id>/<int:report_id>',
+    methods=['GET'], endpoint='compare_reports'
+)
+@login_required
+def compare_reports(base_report_id, report_id):
+    """
+    compare_reports(base_report_id, report_id)
+
+    Compares the saved report data of the given reports, to see the changes
+    in the performance of the profiled functions
+
+    Parameters:
+        base_report_id
+        - The id of the report to compare with (i.e. the earlier report)
+        report_id
+        - The id of the report to compare
+    Returns:
+        Per function and per line differences of the self_time, total_time
+        and exec_count, and the differential flame graph (SVG)
+    """
+    reports_data = []
+    for rid in (base_report_id, report_id):
+        report = ProfilerSavedReports.query.filter_by(rid=rid).first()
+
+        if report is None:
+            return make_json_response(
+                data={
+                    'status': 'ERROR',
+                    'result': gettext(
+                        'PgAdmin4 could not find the specified report')
+                }
+            )
+        if report.data is None:
+            return make_json_response(
+                data={
+                    'status': 'ERROR',
+                    'result': gettext(
+                        'The report "{0}" was saved by an earlier version '
+                        'of pgAdmin and cannot be compared.'
+                    ).format(report.name)
+                }
+            )
+        reports_data.append(unpack_report_data(report.data))
+
+    result = diff_reports(*reports_data)
+    result['flamegraph'] = generate_flamegraph(
+        result.pop('flamedata'),
+        title=gettext('Differential Flame Graph'),
+        width=int(reports_data[1]['config']['svg_width'])
+    )
+
+    return make_json_response(
+        data={
+            'status': 'Success',
+            'result': result
+        }
+    )
+
+
 @blueprint.route(
     '/get_arguments/<int:sid>/<int:did>/<int:scid>/<int:func_id>',
     methods=['GET'], endpoint='get_arguments'
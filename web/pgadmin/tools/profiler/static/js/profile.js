@@ -138,32 +138,20 @@ define([
                 },
               })
                 .done(function(res) {
-                  pgTools.Profile.docker.finishLoading();
-
-                  if(res.data.status === 'Success') {
-                    controller._add_new_report(res.data.report_headers);
-
-                  }
-                  else if(res.data.status === 'NotConnected') {
-                    Alertify.alert(
-                      gettext('Profiler Error'),
-                      gettext('Not Connected.')
-                    );
-                  } else if (res.data.status === 'ERROR') {
-                    Alertify.alert(
-                      gettext('Profiler Error'),
-                      gettext(res.data.result)
+                  // The monitoring runs in the background on the server,
+                  // poll for the report once it is expected to be ready.
+                  if(res.data.status === 'Started' ||
+                     res.data.status === 'Running') {
+                    controller._poll_monitor(
+                      trans_id, (res.data.duration - res.data.elapsed) * 1000
                     );
+                    return;
                   }
+
+                  controller._finish_monitor(res);
                 })
                 .fail(function() {
-                  pgTools.Profile.docker.finishLoading();
-                  $('.profiler-container').removeClass('show_progress');
-
-                  Alertify.alert(
-                    gettext('Profiler Error'),
-                    gettext('Error while monitoring.')
-                  );
+                  controller._fail_monitor();
                 });
             }
             else if(res.data.status == 'Not Connected') {
@@ -182,6 +170,70 @@ define([
           });
       },
 
+      /**
+       * Polls the server for the status of the background monitoring, until
+       * the report has been generated (or the monitoring has failed)
+       *
+       * @param {int} trans_id The unique transaction id for the already
+       *                       initialize profiling instance
+       * @param {int} delay    Time to wait (in milliseconds) before polling
+       */
+      _poll_monitor : function(trans_id, delay) {
+        setTimeout(() => {
+          $.ajax({
+            url    : url_for('profiler.monitor_status', { 'trans_id': trans_id }),
+            method : 'GET',
+          })
+            .done(function(res) {
+              if(res.data.status === 'Running') {
+                controller._poll_monitor(trans_id, 1000);
+                return;
+              }
+
+              controller._finish_monitor(res);
+            })
+            .fail(function() {
+              controller._fail_monitor();
+            });
+        }, Math.max(delay, 1000));
+      },
+
+      /**
+       * Hides the loading wheel, and adds the generated report or shows the
+       * error of the monitoring
+       *
+       * @param {Object} res The response of the monitoring status request
+       */
+      _finish_monitor : function(res) {
+        pgTools.Profile.docker.finishLoading();
+
+        if(res.data.status === 'Success') {
+          controller._add_new_report(res.data.report_headers);
+
+        }
+        else if(res.data.status === 'NotConnected') {
+          Alertify.alert(
+            gettext('Profiler Error'),
+            gettext('Not Connected.')
+          );
+        } else if (res.data.status === 'ERROR') {
+          Alertify.alert(
+            gettext('Profiler Error'),
+            gettext(res.data.result)
+          );
+        }
+      },
+
+      _fail_monitor : function() {
+        pgTools.Profile.docker.finishLoading();
+        $('.profiler-container').removeClass('show_progress');
+
+        Alertify.alert(
+          gettext('Profiler Error'),
+          gettext('Error while monitoring.')
+        );
+      },
+
       /**
        * Updates the results panel for the profiling window
        *
@@ -18,4 +18,4 @@ SELECT P.oid, N.nspname, P.proname,
 FROM pg_catalog.pg_proc P
   JOIN pg_catalog.pg_namespace N ON N.oid = P.pronamespace
   LEFT JOIN SELF ON SELF.func_oid = P.oid
-WHERE P.oid = {{ func_oid }}
+WHERE P.oid = ANY(%(func_oids)s)
@@ -1,4 +1,4 @@
-{### Fetch the linestats for each line ###}
+{### Fetch the linestats for each line of the given functions ###}
 
 SELECT L.func_oid, L.line_number,
     sum(L.exec_count)::bigint AS exec_count,
@@ -9,15 +9,16 @@ SELECT L.func_oid, L.line_number,
 {% if data_location == 'local' %}
 
 FROM pl_profiler_linestats_local() L
-JOIN pl_profiler_funcs_source(pl_profiler_func_oids_local()) S
+JOIN pl_profiler_funcs_source(%(func_oids)s::oid[]) S
 
 {% elif data_location == 'shared' %}
 
 FROM pl_profiler_linestats_shared() L
-JOIN pl_profiler_funcs_source(pl_profiler_func_oids_shared()) S
+JOIN pl_profiler_funcs_source(%(func_oids)s::oid[]) S
 {% endif %}
 
    ON S.func_oid = L.func_oid
    AND S.line_number = L.line_number
+WHERE L.func_oid = ANY(%(func_oids)s)
 GROUP BY L.func_oid, L.line_number, S.source
 ORDER BY L.func_oid, L.line_number
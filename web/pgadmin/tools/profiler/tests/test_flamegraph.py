@@ -0,0 +1,135 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import re
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.tools.profiler.utils.flamegraph import generate_flamegraph
+
+FLAME_DATA = """public.f() oid=1 100
+public.f() oid=1;public.g() oid=2 50
+public.f() oid=1;public.h() oid=3 0.04
+a-x 7
+a;b 3
+a 2
+R&D<x> 5
+invalid line
+"""
+
+FRAME_RE = re.compile(
+    r'<title>(.*?) \(.*?</title><rect x="([\d.]+)" y="(\d+)" '
+    r'width="([\d.]+)"'
+)
+
+
+class FlameGraphTest(BaseTestGenerator):
+    """
+    Test the frames of the flame graph match the ones generated by the
+    flamegraph.pl script for the same input.
+    """
+    scenarios = [
+        ('Flame graph with the default width', dict(
+            width=1200,
+            expected_height=114,
+            # (function, x, y, width) generated by flamegraph.pl
+            expected_frames=[
+                ('all', '10.0', '65', '1180.0'),
+                ('R&amp;D(x)', '10.0', '49', '35.3'),
+                ('a', '45.3', '49', '14.1'),
+                ('a-x', '59.4', '49', '49.5'),
+                ('a', '108.9', '49', '21.2'),
+                ('public.f() oid=1', '130.1', '49', '1059.9'),
+                ('b', '108.9', '33', '21.2'),
+                ('public.g() oid=2', '836.5', '33', '353.2'),
+                ('public.h() oid=3', '1189.7', '33', '0.3'),
+            ]
+        )),
+        ('Flame graph omitting the narrow frames', dict(
+            width=300,
+            expected_height=114,
+            expected_frames=[
+                ('all', '10.0', '65', '280.0'),
+                ('R&amp;D(x)', '10.0', '49', '8.4'),
+                ('a', '18.4', '49', '3.3'),
+                ('a-x', '21.7', '49', '11.8'),
+                ('a', '33.5', '49', '5.0'),
+                ('public.f() oid=1', '38.5', '49', '251.5'),
+                ('b', '33.5', '33', '5.0'),
+                ('public.g() oid=2', '206.1', '33', '83.8'),
+            ]
+        )),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        svg = generate_flamegraph(FLAME_DATA, 'Test <report>', self.width)
+
+        self.assertIn(
+            'width="{0}" height="{1}"'.format(
+                self.width, self.expected_height), svg
+        )
+        self.assertIn('>Test &lt;report&gt;</text>', svg)
+
+        frames = sorted(
+            FRAME_RE.findall(svg),
+            key=lambda frame: (-int(frame[2]), float(frame[1]))
+        )
+        self.assertEqual(frames, self.expected_frames)
+
+
+class FlameGraphLargeTest(BaseTestGenerator):
+    """
+    Test the flame graph of a large call graph.
+    """
+    scenarios = [
+        ('Flame graph of 2000 stacks', dict(
+            num_funcs=200, depth=5, num_stacks=2000
+        )),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        lines = []
+        for i in range(self.num_stacks):
+            stack = ';'.join(
+                'public.f{0}() oid={0}'.format((i * (level + 7)) %
+                                               self.num_funcs)
+                for level in range(1 + i % self.depth)
+            )
+            lines.append('{0} {1}'.format(stack, 1 + i % 1000))
+        samples = sum(1 + i % 1000 for i in range(self.num_stacks))
+
+        svg = generate_flamegraph('\n'.join(lines), 'Large <graph>')
+
+        self.assertTrue(svg.startswith('<?xml version="1.0"'))
+        self.assertTrue(svg.endswith('</svg>\n'))
+        # A row of the frames per stack level, and the root frame
+        self.assertIn(
+            'width="1200" height="{0}"'.format((self.depth + 1) * 16 + 66),
+            svg
+        )
+        self.assertIn('>Large &lt;graph&gt;</text>', svg)
+        self.assertIn(
+            '<title>all ({0:,} samples, 100%)</title>'.format(samples), svg
+        )
+
+        frames = FRAME_RE.findall(svg)
+        self.assertEqual(
+            svg.count('<g class="func_g"'), len(frames)
+        )
+        self.assertEqual(
+            len(set(y for _func, _x, y, _width in frames)), self.depth + 1
+        )
+        for func, x, _y, width in frames:
+            self.assertTrue(func == 'all' or func.startswith('public.f'))
+            self.assertLessEqual(float(x) + float(width), 1190.05)
@@ -8,6 +8,7 @@
 ##########################################################################
 
 import json
+import time
 
 from flask_babelex import gettext
 
@@ -28,7 +29,8 @@ class IndirectProfilingTest(BaseTestGenerator):
                 '/profiler/profile/{0}',
                 '/profiler/get_src/{0}',
                 '/profiler/get_parameters/{0}',
-                '/profiler/start_monitor/{0}'
+                '/profiler/start_monitor/{0}',
+                '/profiler/monitor_status/{0}'
             ],
         }),
     ]
@@ -192,6 +194,20 @@ class IndirectProfilingTest(BaseTestGenerator):
 
         ### start_monitor tests ###
         response = self.tester.post(self.urls[5].format(trans_id))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['data']['status'], 'Started')
+        self.assertEqual(response.json['data']['duration'], TEST_DURATION)
+
+        # The monitoring runs in the background
+        response = self.tester.get(self.urls[6].format(trans_id))
+        self.assertEqual(response.json['data']['status'], 'Running')
+
+        time.sleep(TEST_DURATION)
+        for _ in range(30):
+            response = self.tester.get(self.urls[6].format(trans_id))
+            if response.json['data']['status'] != 'Running':
+                break
+            time.sleep(TEST_INTERVAL)
 
         # Case of no functions called
         self.assertEqual(
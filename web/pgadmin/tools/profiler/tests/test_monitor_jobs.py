@@ -0,0 +1,75 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import time
+from threading import Event
+
+from flask import Flask
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.tools.profiler.utils.monitor_jobs import MonitorJobRegistry, \
+    JOB_RUNNING, JOB_FINISHED
+
+
+class MonitorJobRegistryTest(BaseTestGenerator):
+    """
+    Test the background jobs of the indirect profiling.
+    """
+    scenarios = [
+        ('Job finishing with the result', dict(
+            raise_error=False,
+            expected_result={'status': 'Success', 'report_headers': {}}
+        )),
+        ('Job failing with an exception', dict(
+            raise_error=True,
+            expected_result={'status': 'ERROR'}
+        )),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        app = Flask(__name__)
+        registry = MonitorJobRegistry()
+        release = Event()
+
+        def target(result):
+            release.wait(5)
+            if self.raise_error:
+                raise Exception('monitoring failed')
+            return result
+
+        key = (1, 1234)
+        with app.app_context():
+            job, started = registry.start(
+                key, 10, target, self.expected_result)
+            self.assertTrue(started)
+            self.assertEqual(job.status, JOB_RUNNING)
+
+            # Does not start another job while running
+            same_job, started = registry.start(key, 10, target, None)
+            self.assertFalse(started)
+            self.assertIs(same_job, job)
+
+        # The job is not removed, until it has finished
+        self.assertIs(registry.pop_finished(key), job)
+        self.assertEqual(len(registry), 1)
+
+        release.set()
+        for _ in range(50):
+            if job.status == JOB_FINISHED:
+                break
+            time.sleep(0.1)
+
+        self.assertEqual(job.status, JOB_FINISHED)
+        self.assertEqual(job.result, self.expected_result)
+        self.assertIs(registry.pop_finished(key), job)
+        self.assertEqual(len(registry), 0)
+        self.assertIsNone(registry.pop_finished(key))
@@ -0,0 +1,114 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.tools.profiler.utils.report_diff import diff_reports
+from pgadmin.tools.profiler.utils.flamegraph import generate_flamegraph
+
+
+def _func_def(funcoid, funcname, self_time, lines):
+    return {
+        'funcoid': funcoid,
+        'schema': 'public',
+        'funcname': funcname,
+        'funcresult': 'integer',
+        'funcargs': 'a integer',
+        'total_time': lines[0][2],
+        'self_time': self_time,
+        'source': [
+            {'line_number': line_number, 'source': source,
+             'exec_count': exec_count, 'total_time': total_time,
+             'longest_time': total_time}
+            for line_number, exec_count, total_time, source in lines
+        ],
+    }
+
+
+BASE_REPORT = {
+    'func_defs': [
+        _func_def(16384, 'slow', 900, [
+            (0, 10, 1000, ''),
+            (1, 10, 100, 'BEGIN'),
+            (2, 10, 900, 'PERFORM pg_sleep(0.1);'),
+        ]),
+        _func_def(16385, 'removed', 50, [(0, 5, 50, '')]),
+    ],
+    'flamedata': 'public.slow() oid=16384 900\n'
+                 'public.slow() oid=16384;public.removed() oid=16385 50\n',
+}
+
+REPORT = {
+    'func_defs': [
+        _func_def(17000, 'slow', 200, [
+            (0, 10, 300, ''),
+            (1, 10, 100, 'BEGIN'),
+            (2, 10, 200, 'PERFORM pg_sleep(0.02);'),
+        ]),
+    ],
+    'flamedata': 'public.slow() oid=17000 200\n',
+}
+
+
+class ReportDiffTest(BaseTestGenerator):
+    """
+    Test the comparison of the data of two reports.
+    """
+    scenarios = [
+        ('Compare the reports of a function created again', dict(
+            base_data=BASE_REPORT,
+            report_data=REPORT,
+            expected_functions=[
+                # funcname, base funcoid, funcoid, self_time,
+                # total_time and exec_count deltas
+                ('slow', 16384, 17000, -700, -700, 0),
+                ('removed', 16385, None, -50, -50, -5),
+            ],
+            expected_lines={
+                'slow': [
+                    # line number, total_time delta, source changed
+                    (0, -700, False),
+                    (1, 0, False),
+                    (2, -700, True),
+                ],
+                'removed': [(0, -50, False)],
+            },
+            expected_flamedata='public.slow() 900 200\n'
+                               'public.slow();public.removed() 50 0\n',
+        )),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        result = diff_reports(self.base_data, self.report_data)
+
+        self.assertEqual(
+            [(f['funcname'], f['base_funcoid'], f['funcoid'],
+              f['self_time']['delta'], f['total_time']['delta'],
+              f['exec_count']['delta'])
+             for f in result['functions']],
+            self.expected_functions
+        )
+        for function in result['functions']:
+            self.assertEqual(
+                [(line['line_number'], line['total_time']['delta'],
+                  line['source_changed'])
+                 for line in function['lines']],
+                self.expected_lines[function['funcname']]
+            )
+        self.assertEqual(result['flamedata'], self.expected_flamedata)
+
+        # The decreased self time of the function is shown in blue
+        svg = generate_flamegraph(result['flamedata'])
+        self.assertIn(
+            '<title>public.slow() (200 samples, 100.00%; -350.00%)</title>',
+            svg
+        )
+        self.assertIn('fill="rgb(0,0,255)"', svg)
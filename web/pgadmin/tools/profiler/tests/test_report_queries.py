@@ -0,0 +1,110 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import time
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.tools.profiler import _generate_report
+
+LINES_PER_FUNCTION = 20
+
+
+class FakeProfilerConnection(object):
+    """
+    Returns the synthetic plprofiler data for the queries run by
+    _generate_report, and sleeps for the given round trip time (in seconds)
+    on each query.
+    """
+
+    def __init__(self, num_funcs, round_trip_time=0):
+        self.func_oids = list(range(16384, 16384 + num_funcs))
+        self.round_trip_time = round_trip_time
+        self.queries = 0
+
+    def execute_async_list(self, query, params=None):
+        self.queries += 1
+        if self.round_trip_time:
+            time.sleep(self.round_trip_time)
+
+        if 'pl_profiler_linestats' in query:
+            return True, [
+                {'func_oid': oid, 'line_number': line, 'exec_count': 10,
+                 'total_time': 1000 - line, 'longest_time': 5,
+                 'source': 'line %d' % line}
+                for oid in params['func_oids']
+                for line in range(LINES_PER_FUNCTION)
+            ]
+        if 'pg_get_function_result' in query:
+            return True, [
+                {'oid': oid, 'nspname': 'public', 'proname': 'f%d' % oid,
+                 'pg_get_function_result': 'integer',
+                 'pg_get_function_arguments': 'a integer',
+                 'self_time': 100}
+                for oid in params['func_oids']
+            ]
+        if 'array_to_string' in query:
+            return True, [
+                {'array_to_string': 'public.f%d() oid=%d' % (oid, oid),
+                 'stack': [oid], 'call_count': 1, 'us_total': 100,
+                 'us_children': 0, 'us_self': 100}
+                for oid in self.func_oids
+            ]
+        if 'overflow' in query:
+            return True, [{
+                'pl_profiler_callgraph_overflow': False,
+                'pl_profiler_functions_overflow': False,
+                'pl_profiler_lines_overflow': False,
+            }]
+        if 'unnest' in query:
+            return True, [
+                {'oid': oid, 'nspname': 'public', 'proname': 'f%d' % oid}
+                for oid in self.func_oids
+            ]
+        # Top functions by the self time
+        return True, [
+            {'func_oid': oid, 'us_self': 100}
+            for oid in self.func_oids[:params[0]]
+        ]
+
+
+class ProfilerReportQueriesTest(BaseTestGenerator):
+    """
+    Generate the report data for a large number of profiled functions, with
+    a number of queries not depending on the number of functions.
+
+    The function definitions used to be fetched using one query per
+    function (see tools/profiler_report_benchmark.py for the timing).
+    """
+    scenarios = [
+        ('Report data for 500 functions', dict(num_funcs=500)),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        conn = FakeProfilerConnection(self.num_funcs)
+
+        with self.app.app_context():
+            report = _generate_report(
+                conn, 'shared', func_oids={}, opt_top=self.num_funcs)
+
+        self.assertEqual(len(report['func_defs']), self.num_funcs)
+        self.assertEqual(
+            [f['funcoid'] for f in report['func_defs']], conn.func_oids
+        )
+        func_def = report['func_defs'][0]
+        self.assertEqual(len(func_def['source']), LINES_PER_FUNCTION)
+        self.assertEqual(func_def['total_time'], 1000)
+        self.assertEqual(
+            len(report['flamedata'].splitlines()), self.num_funcs
+        )
+
+        # The number of queries does not depend on the number of functions
+        self.assertLessEqual(conn.queries, 6)
@@ -0,0 +1,73 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.tools.profiler import _generate_report
+from pgadmin.tools.profiler.utils.report_store import pack_report_data, \
+    unpack_report_data, render_report, ReportHTMLCache
+from pgadmin.tools.profiler.tests.test_report_queries import \
+    FakeProfilerConnection
+
+REPORT_CONFIG = {
+    'name': 'test_report',
+    'title': 'Test report',
+    'tabstop': '8',
+    'svg_width': '1200',
+    'table_width': '80%',
+    'desc': '<p>Test report</p>',
+}
+
+
+class ReportStoreTest(BaseTestGenerator):
+    """
+    Test the report data is saved as compressed JSON, and the HTML rendered
+    from it is cached.
+    """
+    scenarios = [
+        ('Report of 100 functions', dict(num_funcs=100)),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        with self.app.app_context():
+            report_data = _generate_report(
+                FakeProfilerConnection(self.num_funcs), 'shared',
+                func_oids={}, opt_top=self.num_funcs
+            )
+        report_data['config'] = REPORT_CONFIG
+
+        data = pack_report_data(report_data)
+        saved_data = unpack_report_data(data)
+        self.assertEqual(saved_data['func_defs'], report_data['func_defs'])
+
+        html = render_report(report_data)
+        self.assertEqual(render_report(saved_data), html)
+        self.assertLess(len(data), len(html))
+
+        rendered = []
+
+        def get_report_data():
+            rendered.append(True)
+            return unpack_report_data(data)
+
+        cache = ReportHTMLCache(max_reports=1)
+        self.assertEqual(cache.get(1, get_report_data), html)
+        self.assertEqual(cache.get(1, get_report_data), html)
+        self.assertEqual(len(rendered), 1)
+
+        # The least recently shown report is removed
+        cache.get(2, get_report_data)
+        self.assertEqual(len(cache), 1)
+        cache.get(1, get_report_data)
+        self.assertEqual(len(rendered), 3)
+
+        cache.remove(1)
+        self.assertEqual(len(cache), 0)
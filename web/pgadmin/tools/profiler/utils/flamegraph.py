@@ -0,0 +1,550 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# flamegraph.py - a port of flamegraph.pl, flame stack grapher.
+#
+# Copyright 2011 Joyent, Inc.  All rights reserved.
+# Copyright 2011 Brendan Gregg.  All rights reserved.
+#
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License (the "License").
+# You may not use this file except in compliance with the License.
+#
+# You can obtain a copy of the license at docs/cddl1.txt or
+# http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing permissions
+# and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL HEADER in each
+# file and include the License file at docs/cddl1.txt.
+# If applicable, add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your own identifying
+# information: Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+#
+# Portions Copyright (C) 2019, The pgAdmin Development Team
+#
+# 21-Nov-2013   Shawn Sterling  Added consistent palette file option
+# 17-Mar-2013   Tim Bunce       Added options and more tunables.
+# 15-Dec-2011   Dave Pacheco    Support for frames with whitespace.
+# 10-Sep-2011   Brendan Gregg   Created this.
+#
+##########################################################################
+
+"""
+Generate the flame graph (SVG) of the profiler report call graph.
+
+This is a port of the flamegraph.pl script (by Brendan Gregg), distributed
+under the terms of its licence (CDDL, see the header above). It is used with
+its default settings, except the colors of the frames are chosen from the
+hash of the function names (--hash), so the graph of a report is the same
+every time it is rendered. The input is the folded stacks, one stack per line:
+
+    outer_func;inner_func 123
+
+The frames are built by merging the sorted stacks in one pass (the same way
+flamegraph.pl does it), so the position and the width of the frames match
+the ones of the flamegraph.pl output.
+"""
+
+import re
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+__all__ = ['generate_flamegraph', 'write_flamegraph']
+
+# Tunables (the defaults of flamegraph.pl)
+FONT_TYPE = 'Verdana'
+FONT_SIZE = 12
+# Average width of a character relative to the font size
+FONT_WIDTH = 0.59
+FRAME_HEIGHT = 16
+# Frames narrower than this (in pixels) are omitted
+MIN_WIDTH = 0.1
+NAME_TYPE = 'Function:'
+COUNT_NAME = 'samples'
+BG_COLOR1 = '#eeeeee'
+BG_COLOR2 = '#eeeeb0'
+
+# Internals
+YPAD1 = FONT_SIZE * 4
+YPAD2 = FONT_SIZE * 2 + 10
+XPAD = 10
+FRAME_PAD = 1
+
+STACK_RE = re.compile(r'^(.*)\s+?(\d+(?:\.\d*)?)$')
+
+SVG_HEADER = """<?xml version="1.0" standalone="no"?>
+<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN" \
+"http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">
+<svg version="1.1" width="%(width)s" height="%(height)s" onload="init(evt)" \
+viewBox="0 0 %(width)s %(height)s" xmlns="http://www.w3.org/2000/svg" \
+xmlns:xlink="http://www.w3.org/1999/xlink">
+"""
+
+SVG_SCRIPT = """<defs >
+    <linearGradient id="background" y1="0" y2="1" x1="0" x2="0" >
+        <stop stop-color="%(bg_color1)s" offset="5%%" />
+        <stop stop-color="%(bg_color2)s" offset="95%%" />
+    </linearGradient>
+</defs>
+<style type="text/css">
+    .func_g:hover { stroke:black; stroke-width:0.5; cursor:pointer; }
+</style>
+<script type="text/ecmascript">
+<![CDATA[
+    var details, svg;
+    function init(evt) {
+        details = document.getElementById("details").firstChild;
+        svg = document.getElementsByTagName("svg")[0];
+    }
+    function s(info) { details.nodeValue = "%(name_type)s " + info; }
+    function c() { details.nodeValue = ' '; }
+    function find_child(parent, name, attr) {
+        var children = parent.childNodes;
+        for (var i=0; i<children.length;i++) {
+            if (children[i].tagName == name)
+                return (attr != undefined) ?
+                    children[i].attributes[attr].value : children[i];
+        }
+        return;
+    }
+    function orig_save(e, attr, val) {
+        if (e.attributes["_orig_"+attr] != undefined) return;
+        if (e.attributes[attr] == undefined) return;
+        if (val == undefined) val = e.attributes[attr].value;
+        e.setAttribute("_orig_"+attr, val);
+    }
+    function orig_load(e, attr) {
+        if (e.attributes["_orig_"+attr] == undefined) return;
+        e.attributes[attr].value = e.attributes["_orig_"+attr].value;
+        e.removeAttribute("_orig_"+attr);
+    }
+    function update_text(e) {
+        var r = find_child(e, "rect");
+        var t = find_child(e, "text");
+        var w = parseFloat(r.attributes["width"].value) -3;
+        var txt = find_child(e, "title").textContent.replace(/\\([^(]*\\)/,"");
+        t.attributes["x"].value = parseFloat(r.attributes["x"].value) +3;
+
+        // Smaller than this size won't fit anything
+        if (w < 2*%(font_size)s*%(font_width)s) {
+            t.textContent = "";
+            return;
+        }
+
+        t.textContent = txt;
+        // Fit in full text width
+        if (/^ *$/.test(txt) || t.getSubStringLength(0, txt.length) < w)
+            return;
+
+        for (var x=txt.length-2; x>0; x--) {
+            if (t.getSubStringLength(0, x+2) <= w) {
+                t.textContent = txt.substring(0,x) + "..";
+                return;
+            }
+        }
+        t.textContent = "";
+    }
+    function zoom_reset(e) {
+        if (e.attributes != undefined) {
+            orig_load(e, "x");
+            orig_load(e, "width");
+        }
+        if (e.childNodes == undefined) return;
+        for(var i=0, c=e.childNodes; i<c.length; i++) {
+            zoom_reset(c[i]);
+        }
+    }
+    function zoom_child(e, x, ratio) {
+        if (e.attributes != undefined) {
+            if (e.attributes["x"] != undefined) {
+                orig_save(e, "x");
+                e.attributes["x"].value =
+                    (parseFloat(e.attributes["x"].value) - x - %(xpad)s) *
+                    ratio + %(xpad)s;
+                if(e.tagName == "text")
+                    e.attributes["x"].value =
+                        find_child(e.parentNode, "rect", "x") + 3;
+            }
+            if (e.attributes["width"] != undefined) {
+                orig_save(e, "width");
+                e.attributes["width"].value =
+                    parseFloat(e.attributes["width"].value) * ratio;
+            }
+        }
+
+        if (e.childNodes == undefined) return;
+        for(var i=0, c=e.childNodes; i<c.length; i++) {
+            zoom_child(c[i], x-%(xpad)s, ratio);
+        }
+    }
+    function zoom_parent(e) {
+        if (e.attributes) {
+            if (e.attributes["x"] != undefined) {
+                orig_save(e, "x");
+                e.attributes["x"].value = %(xpad)s;
+            }
+            if (e.attributes["width"] != undefined) {
+                orig_save(e, "width");
+                e.attributes["width"].value =
+                    parseInt(svg.width.baseVal.value) - (%(xpad)s*2);
+            }
+        }
+        if (e.childNodes == undefined) return;
+        for(var i=0, c=e.childNodes; i<c.length; i++) {
+            zoom_parent(c[i]);
+        }
+    }
+    function zoom(node) {
+        var attr = find_child(node, "rect").attributes;
+        var width = parseFloat(attr["width"].value);
+        var xmin = parseFloat(attr["x"].value);
+        var xmax = parseFloat(xmin + width);
+        var ymin = parseFloat(attr["y"].value);
+        var ratio = (svg.width.baseVal.value - 2*%(xpad)s) / width;
+
+        // XXX: Workaround for JavaScript float issues (fix me)
+        var fudge = 0.0001;
+
+        var unzoombtn = document.getElementById("unzoom");
+        unzoombtn.style["opacity"] = "1.0";
+
+        var el = document.getElementsByTagName("g");
+        for(var i=0;i<el.length;i++){
+            var e = el[i];
+            var a = find_child(e, "rect").attributes;
+            var ex = parseFloat(a["x"].value);
+            var ew = parseFloat(a["width"].value);
+            // Is it an ancestor
+            if (%(inverted)s == 0) {
+                var upstack = parseFloat(a["y"].value) > ymin;
+            } else {
+                var upstack = parseFloat(a["y"].value) < ymin;
+            }
+            if (upstack) {
+                // Direct ancestor
+                if (ex <= xmin && (ex+ew+fudge) >= xmax) {
+                    e.style["opacity"] = "0.5";
+                    zoom_parent(e);
+                    e.onclick = function(e){unzoom(); zoom(this);};
+                    update_text(e);
+                }
+                // not in current path
+                else
+                    e.style["display"] = "none";
+            }
+            // Children maybe
+            else {
+                // no common path
+                if (ex < xmin || ex + fudge >= xmax) {
+                    e.style["display"] = "none";
+                }
+                else {
+                    zoom_child(e, xmin, ratio);
+                    e.onclick = function(e){zoom(this);};
+                    update_text(e);
+                }
+            }
+        }
+    }
+    function unzoom() {
+        var unzoombtn = document.getElementById("unzoom");
+        unzoombtn.style["opacity"] = "0.0";
+
+        var el = document.getElementsByTagName("g");
+        for(i=0;i<el.length;i++) {
+            el[i].style["display"] = "block";
+            el[i].style["opacity"] = "1";
+            zoom_reset(el[i]);
+            update_text(el[i]);
+        }
+    }
+]]>
+</script>
+"""
+
+
+def _escape(value):
+    return value.replace('&', '&amp;').replace('<', '&lt;')\
+        .replace('>', '&gt;')
+
+
+def _number(value):
+    """Format the number the way perl prints it."""
+    return '%.15g' % value
+
+
+def _format_count(value):
+    return '{0:,.0f}'.format(value)
+
+
+def _name_hash(name):
+    """
+    Generate a vector hash for the name, weighting early over later
+    characters, to pick the same colors for the function across the
+    flame graphs.
+    """
+    vector = 0.0
+    weight = 1.0
+    max_vector = 1.0
+    mod = 10
+
+    # If the module name is present, truncate it
+    module_end = name.find('`', 1)
+    if module_end != -1:
+        name = name[module_end + 1:]
+
+    for char in name:
+        vector += (ord(char) % mod) / float(mod - 1) * weight
+        mod += 1
+        max_vector += weight
+        weight *= 0.70
+        if mod > 12:
+            break
+
+    return 1 - vector / max_vector
+
+
+def _hot_color(name):
+    v1 = _name_hash(name)
+    v2 = _name_hash(name[::-1])
+    return 'rgb({0},{1},{2})'.format(
+        205 + int(50 * v2), int(230 * v1), int(55 * v2)
+    )
+
+
+def _delta_color(delta, max_delta):
+    """
+    Returns the color of the frame in the differential flame graph, red for
+    the increased and blue for the decreased samples.
+    """
+    red = green = blue = 255
+    if delta > 0:
+        green = blue = int(210 * (max_delta - delta) / max_delta)
+    elif delta < 0:
+        red = green = int(210 * (max_delta + delta) / max_delta)
+    return 'rgb({0},{1},{2})'.format(red, green, blue)
+
+
+def _parse_stacks(data):
+    """
+    Parse the folded stacks.
+
+    A line may have two sample counts (of the differential flame graph), the
+    second one is used for the width of the frame, and the difference from
+    the first one for its color.
+
+    Returns:
+        list of the sorted (frames, samples, delta) of the valid lines,
+        maximum (absolute) delta
+    """
+    stacks = []
+    max_delta = 1
+    for line in sorted(data.splitlines()):
+        match = STACK_RE.match(line)
+        if match is None:
+            continue
+
+        stack, samples = match.groups()
+        samples = float(samples)
+        delta = None
+
+        match = STACK_RE.match(stack)
+        if match is not None:
+            stack, base_samples = match.groups()
+            delta = samples - float(base_samples)
+            max_delta = max(max_delta, abs(delta))
+
+        stacks.append((
+            [''] + stack.replace('<', '(').replace('>', ')').split(';'),
+            samples, delta
+        ))
+    return stacks, max_delta
+
+
+def _merge_frames(stacks):
+    """
+    Merge the sorted stacks into the frames.
+
+    A frame is opened for every function, which is not on the same depth of
+    the previous stack, and closed when the next stack differs at its (or a
+    lower) depth. The delta of a stack is added to its last frame.
+
+    Returns:
+        list of the (func, depth, start time, end time, delta) of the
+        frames, total time
+    """
+    frames = []
+    # [func, start time, delta] of the open frames, indexed by the depth
+    opened = []
+    time = 0
+
+    for stack, samples, delta in stacks + [([], 0, None)]:
+        same = 0
+        for func, start, frame_delta in opened:
+            if same >= len(stack) or func != stack[same]:
+                break
+            same += 1
+
+        for depth in range(len(opened) - 1, same - 1, -1):
+            func, start, frame_delta = opened.pop()
+            frames.append((func, depth, start, time, frame_delta))
+
+        for depth in range(same, len(stack)):
+            opened.append([
+                stack[depth], time,
+                None if delta is None else
+                delta if depth == len(stack) - 1 else 0
+            ])
+
+        time += samples
+
+    return frames, time
+
+
+def write_flamegraph(outfd, data, title='Flame Graph', width=1200):
+    """
+    Write the flame graph of the folded stacks as SVG.
+
+    Args:
+        outfd: File object to write the SVG to
+        data: Folded stacks
+        title: Title of the graph
+        width: Width of the image (in pixels)
+    """
+    stacks, max_delta = _parse_stacks(data)
+    frames, total_time = _merge_frames(stacks)
+
+    if not total_time:
+        image_height = FONT_SIZE * 5
+        outfd.write(SVG_HEADER % dict(width=width, height=image_height))
+        outfd.write(
+            '<text text-anchor="middle" x="%.2f" y="%s" font-size="%s" '
+            'font-family="%s" fill="rgb(0,0,0)"  >'
+            'ERROR: No valid input provided to flamegraph.</text>\n' % (
+                int(width / 2), FONT_SIZE * 2, FONT_SIZE + 2, FONT_TYPE
+            )
+        )
+        outfd.write('</svg>\n')
+        return
+
+    width_per_time = float(width - 2 * XPAD) / total_time
+    min_width_time = MIN_WIDTH / width_per_time
+
+    # Prune the frames that are too narrow
+    frames = [
+        frame for frame in frames
+        if frame[3] - frame[2] >= min_width_time
+    ]
+    max_depth = max(frame[1] for frame in frames)
+    image_height = max_depth * FRAME_HEIGHT + YPAD1 + YPAD2
+
+    outfd.write(SVG_HEADER % dict(width=width, height=image_height))
+    outfd.write(SVG_SCRIPT % dict(
+        bg_color1=BG_COLOR1, bg_color2=BG_COLOR2, name_type=NAME_TYPE,
+        font_size=FONT_SIZE, font_width=FONT_WIDTH, xpad=XPAD, inverted=0
+    ))
+    outfd.write(
+        '<rect x="0.0" y="0" width="%.1f" height="%.1f" '
+        'fill="url(#background)"  />\n' % (width, image_height)
+    )
+    outfd.write(
+        '<text text-anchor="middle" x="%.2f" y="%s" font-size="%s" '
+        'font-family="%s" fill="rgb(0,0,0)"  >%s</text>\n' % (
+            int(width / 2), FONT_SIZE * 2, FONT_SIZE + 5, FONT_TYPE,
+            _escape(title)
+        )
+    )
+    outfd.write(
+        '<text text-anchor="" x="%.2f" y="%s" font-size="%s" '
+        'font-family="%s" fill="rgb(0,0,0)" id="details" > </text>\n' % (
+            XPAD, _number(image_height - YPAD2 / 2.0), FONT_SIZE, FONT_TYPE
+        )
+    )
+    outfd.write(
+        '<text text-anchor="" x="%.2f" y="%s" font-size="%s" '
+        'font-family="%s" fill="rgb(0,0,0)" id="unzoom" onclick="unzoom()" '
+        'style="opacity:0.0;cursor:pointer" >Reset Zoom</text>\n' % (
+            XPAD, FONT_SIZE * 2, FONT_SIZE, FONT_TYPE
+        )
+    )
+
+    char_width = FONT_SIZE * FONT_WIDTH
+    colors = dict()
+    for func, depth, start, end, delta in frames:
+        x1 = XPAD + start * width_per_time
+        x2 = XPAD + end * width_per_time
+        y1 = image_height - YPAD2 - (depth + 1) * FRAME_HEIGHT + FRAME_PAD
+        y2 = image_height - YPAD2 - depth * FRAME_HEIGHT
+
+        samples = round(end - start)
+        if func == '' and depth == 0:
+            info = 'all ({0} {1}, 100%)'.format(
+                _format_count(samples), COUNT_NAME
+            )
+        else:
+            info = '{0} ({1} {2}, {3:.2f}%)'.format(
+                _escape(func), _format_count(samples), COUNT_NAME,
+                100 * samples / total_time
+            )
+            if delta is not None:
+                info = '{0}; {1}%)'.format(
+                    info[:-1], '{0:+.2f}'.format(100 * delta / total_time)
+                    if delta > 0 else '{0:.2f}'.format(
+                        100 * delta / total_time)
+                )
+
+        chars = int((x2 - x1) / char_width)
+        text = ''
+        if chars >= 3:
+            # Room for one character plus two dots
+            text = func[:chars]
+            if chars < len(func):
+                text = text[:-2] + '..'
+            text = _escape(text)
+
+        x1_str = '%.1f' % x1
+        x2_str = '%.1f' % x2
+        outfd.write(
+            '<g class="func_g" onmouseover="s(\'{info_js}\')" '
+            'onmouseout="c()" onclick="zoom(this)">\n'
+            '<title>{info}</title><rect x="{x}" y="{y}" width="{w:.1f}" '
+            'height="{h:.1f}" fill="{color}" rx="2" ry="2" />\n'
+            '<text text-anchor="" x="{text_x:.2f}" y="{text_y}" '
+            'font-size="{font_size}" font-family="{font_type}" '
+            'fill="rgb(0,0,0)"  >{text}</text>\n'
+            '</g>\n'.format(
+                info=info,
+                info_js=info.replace('\\', '\\\\').replace("'", "\\'")
+                .replace('"', '&quot;'),
+                x=x1_str, y=y1,
+                w=float(x2_str) - float(x1_str), h=y2 - y1,
+                color=_delta_color(delta, max_delta)
+                if delta is not None else colors.get(func) or
+                colors.setdefault(func, _hot_color(func)),
+                text_x=x1 + 3, text_y=_number(3 + (y1 + y2) / 2.0),
+                font_size=FONT_SIZE, font_type=FONT_TYPE, text=text
+            )
+        )
+
+    outfd.write('</svg>\n')
+
+
+def generate_flamegraph(data, title='Flame Graph', width=1200):
+    """
+    Generate the flame graph of the folded stacks.
+
+    Returns:
+        SVG of the flame graph
+    """
+    output = StringIO()
+    write_flamegraph(output, data, title, width)
+    return output.getvalue()
@@ -0,0 +1,134 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Background jobs of the indirect (monitoring) profiling.
+
+The monitoring of a database runs for the duration given by the user, which
+is often a few minutes. Instead of holding the HTTP request (and the web
+server worker serving it) for that long, the monitoring and the generation
+of the report are run in a worker thread, and the client polls for the
+status of the job.
+"""
+
+import time
+from threading import Lock, Thread
+
+from flask import current_app
+
+# Status of the monitoring job
+JOB_RUNNING = 'Running'
+JOB_FINISHED = 'Finished'
+
+
+class MonitorJob(object):
+    """
+    class MonitorJob
+
+        Holds the state of a monitoring job. The result is the data to be
+        sent to the client, once the job has finished.
+    """
+
+    def __init__(self, duration):
+        self.duration = duration
+        self.status = JOB_RUNNING
+        self.result = None
+        self.started_at = time.time()
+        self.finished_at = None
+
+    @property
+    def elapsed(self):
+        return int((self.finished_at or time.time()) - self.started_at)
+
+    def finish(self, result):
+        self.result = result
+        self.finished_at = time.time()
+        self.status = JOB_FINISHED
+
+
+class MonitorJobRegistry(object):
+    """
+    class MonitorJobRegistry
+
+        Runs the monitoring jobs in the worker threads, and keeps their
+        state against the given key until the result is collected by the
+        client, or it has not been collected within the given time (in
+        seconds) after the job has finished.
+    """
+
+    def __init__(self, max_unclaimed_time=3600):
+        self.max_unclaimed_time = max_unclaimed_time
+        self._jobs = dict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def start(self, key, duration, target, *args):
+        """
+        Start a job running target(*args) within the application context,
+        unless a job is already running against the given key.
+
+        Returns:
+            The MonitorJob, and whether it was started by this call
+        """
+        with self._lock:
+            self._remove_unclaimed()
+
+            job = self._jobs.get(key)
+            if job is not None and job.status == JOB_RUNNING:
+                return job, False
+
+            job = self._jobs[key] = MonitorJob(duration)
+
+        app = current_app._get_current_object()
+        thread = Thread(target=self._run, args=(app, job, target, args))
+        thread.daemon = True
+        thread.start()
+
+        return job, True
+
+    @staticmethod
+    def _run(app, job, target, args):
+        with app.app_context():
+            try:
+                result = target(*args)
+            except Exception as e:
+                app.logger.exception(e)
+                result = {'status': 'ERROR'}
+            job.finish(result)
+
+    def get(self, key):
+        """
+        Returns the job for the given key, or None if not found.
+        """
+        with self._lock:
+            return self._jobs.get(key)
+
+    def pop_finished(self, key):
+        """
+        Returns the job for the given key, and removes it from the registry
+        if it has finished (i.e. its result has been collected).
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status == JOB_FINISHED:
+                del self._jobs[key]
+            return job
+
+    def _remove_unclaimed(self):
+        expired = time.time() - self.max_unclaimed_time
+        for key in [
+            key for key, job in self._jobs.items()
+            if job.status == JOB_FINISHED and job.finished_at < expired
+        ]:
+            del self._jobs[key]
+
+
+monitor_jobs = MonitorJobRegistry()
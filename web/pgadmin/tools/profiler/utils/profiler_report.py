@@ -1,11 +1,15 @@
 #!/usr/bin/env python
 
 import base64
-import cgi
-import os
-import subprocess
 import sys
 
+try:
+    from html import escape
+except ImportError:
+    from cgi import escape
+
+from .flamegraph import write_flamegraph
+
 __all__ = ['plprofiler_report']
 
 class plprofiler_report:
@@ -18,7 +22,7 @@ class plprofiler_report:
 
         self.out("<html>")
         self.out("<head>")
-        self.out("  <title>%s</title>" %(cgi.escape(config['title']), ))
+        self.out("  <title>%s</title>" %(escape(config['title'], False), ))
         self.out(HTML_SCRIPT)
         self.out(HTML_STYLE)
         self.out("</head>")
@@ -27,7 +31,7 @@ class plprofiler_report:
 
         self.out("<h2>PL/pgSQL Call Graph</h2>")
         self.out("<center>")
-        self.out(self.generate_flamegraph(config, report_data['flamedata']))
+        self.generate_flamegraph(config, report_data['flamedata'])
         self.out("</center>")
 
         if not report_data['func_oids_by_user']:
@@ -109,7 +113,7 @@ class plprofiler_report:
             if line['line_number'] == 0:
                 src = "<b>--&nbsp;Function&nbsp;Totals</b>"
             else:
-                src = cgi.escape(line['source'].expandtabs(int(config['tabstop']))).replace(" ", "&nbsp;")
+                src = escape(line['source'].expandtabs(int(config['tabstop'])), False).replace(" ", "&nbsp;")
             self.out("""  <tr>""")
             self.out("""    <td align="right"><code>{val}</code></td>""".format(val = line['line_number']))
             self.out("""    <td align="right">{val}</td>""".format(val = line['exec_count']))
@@ -123,21 +127,8 @@ class plprofiler_report:
         self.out("</div>")
 
     def generate_flamegraph(self, config, data):
-        path = os.path.dirname(os.path.abspath(__file__))
-        path = os.path.join(path, 'flamegraph.pl', )
-
-        proc = subprocess.Popen(['perl', path,
-                    "--title=%s" %(config['title'], ),
-                    "--width=%s" %(config['svg_width'], ), ],
-                    stdin = subprocess.PIPE,
-                    stdout = subprocess.PIPE,
-                    stderr = subprocess.PIPE);
-        svg, err = proc.communicate(data.encode('utf-8'))
-
-        if proc.returncode != 0:
-            raise Exception("flamegraph returned with exit code %d\n%s" %(
-                    proc.returncode, str(err)))
-        return str(svg.decode('utf-8 '))
+        write_flamegraph(self.outfd, data, title=config['title'],
+                         width=int(config['svg_width']))
 
     def out(self, line):
         self.outfd.write(line + '\n')
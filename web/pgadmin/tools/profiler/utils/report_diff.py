@@ -0,0 +1,175 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Compare the data of two saved profiler reports.
+
+The functions are matched by their signature (schema, name and arguments),
+and their lines by the line number, so that the reports of a function
+created again (with a new oid), or profiled in another database can be
+compared too. The call graph stacks are matched by the function names (the
+oids are removed), and given to the flame graph with both the sample counts
+to render the differential flame graph.
+"""
+
+import re
+
+OID_RE = re.compile(r' oid=\d+$')
+
+FUNCTION_COUNTERS = ('self_time', 'total_time', 'exec_count')
+LINE_COUNTERS = ('exec_count', 'total_time', 'longest_time')
+
+
+def _counters(base, new, names):
+    """
+    Returns the base and the new values of the counters with their delta.
+    The counters missing in one of the reports are taken as zero.
+    """
+    counters = dict()
+    for name in names:
+        base_value = base.get(name, 0) if base else 0
+        new_value = new.get(name, 0) if new else 0
+        counters[name] = {
+            'base': base_value,
+            'new': new_value,
+            'delta': new_value - base_value,
+        }
+    return counters
+
+
+def _function_key(func_def):
+    return func_def['schema'], func_def['funcname'], func_def['funcargs']
+
+
+def _function_exec_count(func_def):
+    """
+    Returns the number of the calls of the function, i.e. the execution
+    count of the pseudo line 0 (the function totals).
+    """
+    for line in func_def['source']:
+        if line['line_number'] == 0:
+            return line['exec_count']
+    return 0
+
+
+def _diff_lines(base_def, func_def):
+    base_lines = dict(
+        (line['line_number'], line)
+        for line in (base_def['source'] if base_def else [])
+    )
+    new_lines = dict(
+        (line['line_number'], line)
+        for line in (func_def['source'] if func_def else [])
+    )
+
+    lines = []
+    for line_number in sorted(set(base_lines) | set(new_lines)):
+        base_line = base_lines.get(line_number)
+        new_line = new_lines.get(line_number)
+        line = _counters(base_line, new_line, LINE_COUNTERS)
+        line['line_number'] = line_number
+        line['source'] = (new_line or base_line)['source']
+        line['source_changed'] = base_line is not None and \
+            new_line is not None and \
+            base_line['source'] != new_line['source']
+        lines.append(line)
+
+    return lines
+
+
+def _diff_functions(base_defs, func_defs):
+    base_funcs = dict((_function_key(f), f) for f in base_defs)
+    new_funcs = dict((_function_key(f), f) for f in func_defs)
+
+    # The functions of the new report in its order, followed by the
+    # functions found only in the base report
+    keys = [_function_key(f) for f in func_defs] + [
+        _function_key(f) for f in base_defs
+        if _function_key(f) not in new_funcs
+    ]
+
+    functions = []
+    for key in keys:
+        base_def = base_funcs.get(key)
+        func_def = new_funcs.get(key)
+
+        values = [
+            dict(
+                self_time=f['self_time'], total_time=f['total_time'],
+                exec_count=_function_exec_count(f)
+            ) if f else None
+            for f in (base_def, func_def)
+        ]
+
+        function = _counters(values[0], values[1], FUNCTION_COUNTERS)
+        function.update({
+            'schema': key[0],
+            'funcname': key[1],
+            'funcargs': key[2],
+            'base_funcoid': base_def['funcoid'] if base_def else None,
+            'funcoid': func_def['funcoid'] if func_def else None,
+            'lines': _diff_lines(base_def, func_def),
+        })
+        functions.append(function)
+
+    return functions
+
+
+def _parse_flamedata(flamedata):
+    """
+    Returns the samples of the folded stacks, with the oids removed from
+    the function names.
+    """
+    samples = dict()
+    for line in flamedata.splitlines():
+        stack, _, count = line.rpartition(' ')
+        if not stack:
+            continue
+
+        stack = ';'.join(OID_RE.sub('', func) for func in stack.split(';'))
+        samples[stack] = samples.get(stack, 0) + int(count)
+    return samples
+
+
+def diff_flamedata(base_flamedata, flamedata):
+    """
+    Returns the folded stacks with the samples of both the reports, as
+    accepted for the differential flame graph.
+    """
+    base_samples = _parse_flamedata(base_flamedata)
+    new_samples = _parse_flamedata(flamedata)
+
+    return ''.join(
+        '{0} {1} {2}\n'.format(
+            stack, base_samples.get(stack, 0), new_samples.get(stack, 0)
+        )
+        for stack in sorted(set(base_samples) | set(new_samples))
+    )
+
+
+def diff_reports(base_data, report_data):
+    """
+    Compare the data of two reports.
+
+    Args:
+        base_data: Data of the report to compare with
+        report_data: Data of the report
+
+    Returns:
+        Per function and per line counters (base, new and delta values),
+        and the folded stacks of the differential flame graph
+    """
+    return {
+        'functions': _diff_functions(
+            base_data['func_defs'], report_data['func_defs']
+        ),
+        'flamedata': diff_flamedata(
+            base_data['flamedata'], report_data['flamedata']
+        ),
+    }
@@ -0,0 +1,102 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Storage of the profiler reports.
+
+The data of a report (the function definitions with their line statistics,
+the call graph, and the report options) is saved in the configuration
+database as compressed JSON, against the report id. The HTML of the report
+is rendered from the data, when the report is shown, and the most recently
+shown reports are cached.
+"""
+
+import zlib
+from collections import OrderedDict
+from threading import Lock
+
+import simplejson as json
+
+from pgadmin.tools.profiler.utils.profiler_report import plprofiler_report
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+# Number of the rendered reports kept in the cache
+MAX_CACHED_REPORTS = 10
+
+
+def pack_report_data(report_data):
+    """
+    Returns the report data as compressed JSON.
+    """
+    return zlib.compress(
+        json.dumps(report_data, separators=(',', ':')).encode('utf-8')
+    )
+
+
+def unpack_report_data(data):
+    """
+    Returns the report data from the compressed JSON.
+    """
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+
+def render_report(report_data):
+    """
+    Returns the HTML of the report.
+    """
+    output = StringIO()
+    plprofiler_report().generate(report_data, output)
+    return output.getvalue()
+
+
+class ReportHTMLCache(object):
+    """
+    class ReportHTMLCache
+
+        Keeps the HTML of the recently shown reports against the report id.
+    """
+
+    def __init__(self, max_reports=MAX_CACHED_REPORTS):
+        self.max_reports = max_reports
+        self._reports = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, report_id, report_data):
+        """
+        Returns the HTML of the report, rendering it from the report data
+        (a callable returning the data of the report), if not cached.
+        """
+        with self._lock:
+            html = self._reports.pop(report_id, None)
+            if html is not None:
+                self._reports[report_id] = html
+                return html
+
+        html = render_report(report_data())
+
+        with self._lock:
+            self._reports[report_id] = html
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+
+        return html
+
+    def remove(self, report_id):
+        with self._lock:
+            self._reports.pop(report_id, None)
+
+    def __len__(self):
+        return len(self._reports)
+
+
+report_html_cache = ReportHTMLCache()
@@ -9,7 +9,6 @@
 
 """A blueprint module implementing the sqleditor frame."""
 import os
-import pickle
 import sys
 import re
 
@@ -19,24 +18,32 @@ from flask import Response, url_for, render_template, session, request, \
 from flask_babelex import gettext
 from flask_security import login_required, current_user
 
-from config import PG_DEFAULT_DRIVER, ON_DEMAND_RECORD_COUNT
+from config import PG_DEFAULT_DRIVER, ON_DEMAND_RECORD_COUNT, \
+    QUERY_DOWNLOAD_FETCH_SIZE, QUERY_TOOL_LONG_POLL_TIMEOUT
 from pgadmin.misc.file_manager import Filemanager
 from pgadmin.tools.sqleditor.command import QueryToolCommand
 from pgadmin.tools.sqleditor.utils.constant_definition import ASYNC_OK, \
     ASYNC_EXECUTION_ABORTED, \
     CONNECTION_STATUS_MESSAGE_MAPPING, TX_STATUS_INERROR
 from pgadmin.tools.sqleditor.utils.start_running_query import StartRunningQuery
+from pgadmin.tools.sqleditor.utils.copy_csv_download import \
+    copy_query_as_csv
+from pgadmin.tools.sqleditor.utils.transaction_registry import \
+    get_grid_transaction
 from pgadmin.tools.sqleditor.utils.update_session_grid_transaction import \
     update_session_grid_transaction
 from pgadmin.utils import PgAdminModule
 from pgadmin.utils import get_storage_directory
 from pgadmin.utils.ajax import make_json_response, bad_request, \
-    success_return, internal_server_error
+    success_return, internal_server_error, make_json_stream_response
 from pgadmin.utils.driver import get_driver
 from pgadmin.utils.menu import MenuItem
 from pgadmin.utils.exception import ConnectionLost, SSHTunnelConnectionLost,\
     CryptKeyMissing
 from pgadmin.utils.sqlautocomplete.autocomplete import SQLAutoComplete
+from pgadmin.utils.sqlautocomplete.metadata_cache import autocomplete_cache
+from pgadmin.tools.sqleditor.utils.catalog_cache import catalog_cache, \
+    FIRST_NORMAL_OBJECT_ID
 from pgadmin.tools.sqleditor.utils.query_tool_preferences import \
     RegisterQueryToolPreferences
 from pgadmin.tools.sqleditor.utils.query_tool_fs_utils import \
@@ -147,23 +154,16 @@ def check_transaction_status(trans_id):
 
     """
 
-    if 'gridData' not in session:
-        return False, gettext(
-            'Transaction ID not found in the session.'
-        ), None, None, None
-
-    grid_data = session['gridData']
+    # Fetch the transaction data for the specified transaction id.
+    session_obj = get_grid_transaction(trans_id)
 
     # Return from the function if transaction id not found
-    if str(trans_id) not in grid_data:
+    if session_obj is None:
         return False, gettext(
             'Transaction ID not found in the session.'
         ), None, None, None
 
-    # Fetch the object for the specified transaction id.
-    # Use pickle.loads function to get the command object
-    session_obj = grid_data[str(trans_id)]
-    trans_obj = pickle.loads(session_obj['command_obj'])
+    trans_obj = session_obj['command_obj']
 
     try:
         manager = get_driver(
@@ -244,8 +244,6 @@ def start_view_data(trans_id):
         sql = trans_obj.get_sql(default_conn)
         pk_names, primary_keys = trans_obj.get_primary_keys(default_conn)
 
-        session_obj['command_obj'] = pickle.dumps(trans_obj, -1)
-
         has_oids = False
         if trans_obj.object_type == 'table':
             # Fetch OIDs status
@@ -336,9 +334,15 @@ def poll(trans_id):
     This method polls the result of the asynchronous query and returns
     the result.
 
+    When requested by the client (long_poll=1), it waits for the query to
+    finish up to QUERY_TOOL_LONG_POLL_TIMEOUT seconds, instead of returning
+    the 'Busy' status immediately.
+
     Args:
         trans_id: unique transaction id
     """
+    long_poll = request.args.get('long_poll') == '1' and \
+        QUERY_TOOL_LONG_POLL_TIMEOUT > 0
     result = None
     rows_affected = 0
     rows_fetched_from = 0
@@ -366,7 +370,9 @@ def poll(trans_id):
 
     if status and conn is not None and session_obj is not None:
         status, result = conn.poll(
-            formatted_exception_msg=True, no_result=True)
+            formatted_exception_msg=True, no_result=True,
+            timeout=QUERY_TOOL_LONG_POLL_TIMEOUT if long_poll else None
+        )
         if not status:
             messages = conn.messages()
             if messages and len(messages) > 0:
@@ -381,6 +387,15 @@ def poll(trans_id):
             status = 'Success'
             rows_affected = conn.rows_affected()
 
+            # Discard the auto complete metadata, if the executed statement
+            # has changed the catalog.
+            autocomplete_cache.invalidate_if_ddl(
+                trans_obj.sid, trans_obj.did, conn.status_message()
+            )
+            catalog_cache.invalidate_if_ddl(
+                trans_obj.sid, trans_obj.did, conn.status_message()
+            )
+
             # if transaction object is instance of QueryToolCommand
             # and transaction aborted for some reason then issue a
             # rollback to cleanup
@@ -427,9 +442,6 @@ def poll(trans_id):
                     trans_obj.check_updatable_results_pkeys_oids()
                     pk_names, primary_keys = trans_obj.get_primary_keys()
                     session_obj['has_oids'] = trans_obj.has_oids()
-                    # Update command_obj in session obj
-                    session_obj['command_obj'] = pickle.dumps(
-                        trans_obj, -1)
                     # If primary_keys exist, add them to the session_obj to
                     # allow for saving any changes to the data
                     if primary_keys is not None:
@@ -446,35 +458,26 @@ def poll(trans_id):
                     if hasattr(trans_obj, 'obj_id') and \
                         (not isinstance(trans_obj, QueryToolCommand) or
                          trans_obj.can_edit()):
-                        # Get the template path for the column
-                        template_path = 'columns/sql/#{0}#'.format(
-                            conn.manager.version
-                        )
-
-                        SQL = render_template(
-                            "/".join([template_path, 'nodes.sql']),
-                            tid=trans_obj.obj_id,
-                            has_oids=True
+                        colst, rset = fetch_table_columns(
+                            conn, trans_obj, columns_info
                         )
-                        # rows with attribute not_null
-                        colst, rset = conn.execute_2darray(SQL)
                         if not colst:
                             return internal_server_error(errormsg=rset)
 
-                    for key, col in enumerate(columns_info):
+                    for col in columns_info:
                         col_type = dict()
                         col_type['type_code'] = col['type_code']
                         col_type['type_name'] = None
                         col_type['internal_size'] = col['internal_size']
                         columns[col['name']] = col_type
 
-                        if rset:
+                        if rset and col['name'] in rset:
                             col_type['not_null'] = col['not_null'] = \
-                                rset['rows'][key]['not_null']
+                                rset[col['name']]['not_null']
 
                             col_type['has_default_val'] = \
                                 col['has_default_val'] = \
-                                rset['rows'][key]['has_default_val']
+                                rset[col['name']]['has_default_val']
 
                 if columns:
                     st, types = fetch_pg_types(columns, trans_obj)
@@ -483,13 +486,11 @@ def poll(trans_id):
                         return internal_server_error(types)
 
                     for col_name, col_info in columns.items():
-                        for col_type in types:
-                            if col_type['oid'] == col_info['type_code']:
-                                typname = col_type['typname']
-
-                                typname = compose_type_name(col_info, typname)
-
-                                col_info['type_name'] = typname
+                        typname = types.get(col_info['type_code'])
+                        if typname is not None:
+                            col_info['type_name'] = compose_type_name(
+                                col_info, typname
+                            )
 
                         # Using characters %, (, ) in the argument names is not
                         # supported in psycopg2
@@ -509,8 +510,6 @@ def poll(trans_id):
                             rows_fetched_from + res_len)
                         rows_fetched_from += 1
                         rows_fetched_to = trans_obj.get_fetched_row_cnt()
-                        session_obj['command_obj'] = pickle.dumps(
-                            trans_obj, -1)
 
                 # As we changed the transaction object we need to
                 # restore it and update the session variable.
@@ -546,6 +545,7 @@ def poll(trans_id):
             'has_oids': has_oids,
             'oids': oids,
             'transaction_status': transaction_status,
+            'long_poll': long_poll,
         },
         encoding=conn.python_encoding
     )
@@ -591,7 +591,36 @@ def fetch(trans_id, fetch_all=None):
                                   info='DATAGRID_TRANSACTION_REQUIRED',
                                   status=404)
 
-    if status and conn is not None and session_obj is not None:
+    if status and conn is not None and session_obj is not None and \
+            fetch_row_cnt == -1:
+        # Send the remaining rows as they are fetched, instead of holding
+        # all of them (and, their JSON text) in the memory.
+        status, result = conn.async_fetch_2darray_chunks(
+            ON_DEMAND_RECORD_COUNT
+        )
+        if status:
+            rows_fetched_from = trans_obj.get_fetched_row_cnt()
+            rows_fetched_to = max(conn.rows_affected(), rows_fetched_from)
+
+            if rows_fetched_to > rows_fetched_from:
+                trans_obj.update_fetched_row_cnt(rows_fetched_to)
+                rows_fetched_from += 1
+                update_session_grid_transaction(trans_id, session_obj)
+            else:
+                rows_fetched_from = rows_fetched_to = 0
+
+            return make_json_stream_response(
+                'result', result,
+                data={
+                    'status': 'Success',
+                    'has_more_rows': has_more_rows,
+                    'rows_fetched_from': rows_fetched_from,
+                    'rows_fetched_to': rows_fetched_to
+                },
+                encoding=conn.python_encoding
+            )
+        status = 'Error'
+    elif status and conn is not None and session_obj is not None:
         status, result = conn.async_fetchmany_2darray(fetch_row_cnt)
         if not status:
             status = 'Error'
@@ -606,7 +635,6 @@ def fetch(trans_id, fetch_all=None):
                 trans_obj.update_fetched_row_cnt(rows_fetched_from + res_len)
                 rows_fetched_from += 1
                 rows_fetched_to = trans_obj.get_fetched_row_cnt()
-                session_obj['command_obj'] = pickle.dumps(trans_obj, -1)
                 update_session_grid_transaction(trans_id, session_obj)
     else:
         status = 'NotConnected'
@@ -629,9 +657,23 @@ def fetch_pg_types(columns_info, trans_obj):
     This method is used to fetch the pg types, which is required
     to map the data type comes as a result of the query.
 
+    The type names are looked up in the catalog cache first, and only the
+    missing ones are fetched from the database server (with all the
+    built-in types, when not cached yet for the server).
+
     Args:
         columns_info:
+
+    Returns:
+        status, {type oid => type name} (or the error message)
     """
+    oids = set(columns_info[col]['type_code'] for col in columns_info)
+
+    type_names, missing = catalog_cache.get_type_names(
+        trans_obj.sid, trans_obj.did, oids
+    )
+    if not missing:
+        return True, type_names
 
     # get the default connection as current connection attached to trans id
     # holds the cursor which has query result so we cannot use that connection
@@ -641,26 +683,78 @@ def fetch_pg_types(columns_info, trans_obj):
     default_conn = manager.connection(did=trans_obj.did)
 
     # Connect to the Server if not connected.
-    res = []
     if not default_conn.connected():
         status, msg = default_conn.connect()
         if not status:
             return status, msg
 
-    oids = [columns_info[col]['type_code'] for col in columns_info]
+    sql = u"SELECT oid, format_type(oid, NULL) AS typname FROM pg_type " \
+          u"WHERE oid IN %s"
+    if catalog_cache.enabled and \
+            not catalog_cache.has_builtin_types(trans_obj.sid):
+        sql += u" OR oid < {0}".format(FIRST_NORMAL_OBJECT_ID)
 
-    if oids:
-        status, res = default_conn.execute_dict(
-            u"SELECT oid, format_type(oid, NULL) AS typname FROM pg_type "
-            u"WHERE oid IN %s ORDER BY oid;", [tuple(oids)]
-        )
+    status, res = default_conn.execute_dict(
+        sql + u" ORDER BY oid;", [tuple(missing)]
+    )
 
-        if not status:
-            return False, res
+    if not status:
+        return False, res
 
-        return status, res['rows']
-    else:
-        return True, []
+    names = dict((row['oid'], row['typname']) for row in res['rows'])
+    catalog_cache.put_type_names(trans_obj.sid, trans_obj.did, names)
+
+    for oid in missing:
+        if oid in names:
+            type_names[oid] = names[oid]
+
+    return True, type_names
+
+
+def fetch_table_columns(conn, trans_obj, columns_info):
+    """
+    This method is used to fetch the not null/default value information of
+    the columns of the table, whose data is viewed/edited.
+
+    The columns are looked up in the catalog cache first, and fetched again
+    from the database server, if a column of the result is not found in the
+    cache (e.g. added by another session since cached).
+
+    Args:
+        conn: Connection
+        trans_obj: Transaction object (with the table oid as obj_id)
+        columns_info: Columns of the result
+
+    Returns:
+        status, {column name => column} (or the error message)
+    """
+    columns = catalog_cache.get_table_columns(
+        trans_obj.sid, trans_obj.did, trans_obj.obj_id
+    )
+    if columns is not None and all(
+        col['name'] in columns for col in columns_info
+    ):
+        return True, columns
+
+    # Get the template path for the column
+    template_path = 'columns/sql/#{0}#'.format(conn.manager.version)
+
+    SQL = render_template(
+        "/".join([template_path, 'nodes.sql']),
+        tid=trans_obj.obj_id,
+        has_oids=True
+    )
+    # rows with attribute not_null
+    status, rset = conn.execute_2darray(SQL)
+    if not status:
+        return False, rset
+
+    columns = dict((row['name'], row) for row in rset['rows'])
+    catalog_cache.put_table_columns(
+        trans_obj.sid, trans_obj.did, trans_obj.obj_id, columns
+    )
+
+    return True, columns
 
 
 def generate_client_primary_key_name(columns_info):
@@ -815,7 +909,6 @@ def append_filter_inclusive(trans_id):
 
         # As we changed the transaction object we need to
         # restore it and update the session variable.
-        session_obj['command_obj'] = pickle.dumps(trans_obj, -1)
         update_session_grid_transaction(trans_id, session_obj)
     else:
         status = False
@@ -871,7 +964,6 @@ def append_filter_exclusive(trans_id):
 
         # As we changed the transaction object we need to
         # restore it and update the session variable.
-        session_obj['command_obj'] = pickle.dumps(trans_obj, -1)
         update_session_grid_transaction(trans_id, session_obj)
     else:
         status = False
@@ -912,7 +1004,6 @@ def remove_filter(trans_id):
 
         # As we changed the transaction object we need to
         # restore it and update the session variable.
-        session_obj['command_obj'] = pickle.dumps(trans_obj, -1)
         update_session_grid_transaction(trans_id, session_obj)
     else:
         status = False
@@ -956,7 +1047,6 @@ def set_limit(trans_id):
 
         # As we changed the transaction object we need to
         # restore it and update the session variable.
-        session_obj['command_obj'] = pickle.dumps(trans_obj, -1)
         update_session_grid_transaction(trans_id, session_obj)
     else:
         status = False
@@ -978,25 +1068,17 @@ def cancel_transaction(trans_id):
         trans_id: unique transaction id
     """
 
-    if 'gridData' not in session:
-        return make_json_response(
-            success=0,
-            errormsg=gettext('Transaction ID not found in the session.'),
-            info='DATAGRID_TRANSACTION_REQUIRED', status=404)
-
-    grid_data = session['gridData']
+    # Fetch the transaction data for the specified transaction id.
+    session_obj = get_grid_transaction(trans_id)
 
     # Return from the function if transaction id not found
-    if str(trans_id) not in grid_data:
+    if session_obj is None:
         return make_json_response(
             success=0,
             errormsg=gettext('Transaction ID not found in the session.'),
             info='DATAGRID_TRANSACTION_REQUIRED', status=404)
 
-    # Fetch the object for the specified transaction id.
-    # Use pickle.loads function to get the command object
-    session_obj = grid_data[str(trans_id)]
-    trans_obj = pickle.loads(session_obj['command_obj'])
+    trans_obj = session_obj['command_obj']
 
     if trans_obj is not None and session_obj is not None:
 
@@ -1112,7 +1194,6 @@ def set_auto_commit(trans_id):
 
         # As we changed the transaction object we need to
         # restore it and update the session variable.
-        session_obj['command_obj'] = pickle.dumps(trans_obj, -1)
         update_session_grid_transaction(trans_id, session_obj)
     else:
         status = False
@@ -1157,7 +1238,6 @@ def set_auto_rollback(trans_id):
 
         # As we changed the transaction object we need to
         # restore it and update the session variable.
-        session_obj['command_obj'] = pickle.dumps(trans_obj, -1)
         update_session_grid_transaction(trans_id, session_obj)
     else:
         status = False
@@ -1352,28 +1432,34 @@ def start_query_download_tool(trans_id):
         try:
             if data and 'query' in data:
                 sql = data['query']
+                csv_options = dict(
+                    quote=blueprint.csv_quoting.get(),
+                    quote_char=blueprint.csv_quote_char.get(),
+                    field_separator=blueprint.csv_field_separator.get(),
+                    replace_nulls_with=blueprint.replace_nulls_with.get()
+                )
 
-                # This returns generator of records.
-                status, gen = sync_conn.execute_on_server_as_csv(
-                    sql, records=2000
+                # Let the server generate the CSV data using COPY, if the
+                # query can be wrapped in it.
+                status, csv_data = copy_query_as_csv(
+                    trans_obj, sync_conn, sql, **csv_options
                 )
 
                 if not status:
-                    return make_json_response(
-                        data={
-                            'status': status, 'result': gen
-                        }
+                    # This returns generator of records.
+                    status, gen = sync_conn.execute_on_server_as_csv(
+                        sql, records=QUERY_DOWNLOAD_FETCH_SIZE
                     )
 
-                r = Response(
-                    gen(
-                        quote=blueprint.csv_quoting.get(),
-                        quote_char=blueprint.csv_quote_char.get(),
-                        field_separator=blueprint.csv_field_separator.get(),
-                        replace_nulls_with=blueprint.replace_nulls_with.get()
-                    ),
-                    mimetype='text/csv'
-                )
+                    if not status:
+                        return make_json_response(
+                            data={
+                                'status': status, 'result': gen
+                            }
+                        )
+                    csv_data = gen(**csv_options)
+
+                r = Response(csv_data, mimetype='text/csv')
 
                 if 'filename' in data and data['filename'] != "":
                     filename = data['filename']
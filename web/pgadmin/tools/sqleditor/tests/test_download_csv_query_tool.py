@@ -8,6 +8,8 @@
 #
 ##########################################################################
 
+import sys
+
 from pgadmin.utils.route import BaseTestGenerator
 from pgadmin.browser.server_groups.servers.databases.tests import utils as \
     database_utils
@@ -17,6 +19,11 @@ import json
 from pgadmin.utils import server_utils, IS_PY2
 import random
 
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
 
 class TestDownloadCSV(BaseTestGenerator):
     """
@@ -32,7 +39,64 @@ class TestDownloadCSV(BaseTestGenerator):
                 output_columns='"A","B","C"',
                 output_values='1,2,3',
                 is_valid_tx=True,
-                is_valid=True
+                is_valid=True,
+                use_copy=True
+            )
+        ),
+        (
+            'Download csv URL with result fetched in multiple batches',
+            dict(
+                sql='SELECT g AS "A" FROM generate_series(1, 5000) g;',
+                init_url='/datagrid/initialize/query_tool/{0}/{1}/{2}',
+                donwload_url="/sqleditor/query_tool/download/{0}",
+                output_columns='"A"',
+                output_values='1999\r\n2000\r\n2001\r\n',
+                is_valid_tx=True,
+                is_valid=True,
+                use_copy=False
+            )
+        ),
+        (
+            'Download csv URL with result generated using COPY',
+            dict(
+                sql='SELECT g AS "A", \'x,y\' AS "B", g % 2 = 0 AS "C", '
+                    'E\'a\\nb\' AS "D" FROM generate_series(1, 5000) g',
+                init_url='/datagrid/initialize/query_tool/{0}/{1}/{2}',
+                donwload_url="/sqleditor/query_tool/download/{0}",
+                output_columns='"A","B","C","D"\r\n',
+                output_values='4999,"x,y",False,"a\nb"\r\n'
+                              '5000,"x,y",True,"a\nb"\r\n',
+                is_valid_tx=True,
+                is_valid=True,
+                use_copy=True
+            )
+        ),
+        (
+            'Download csv URL with the same result as generated using COPY',
+            dict(
+                sql='SELECT g AS "A", \'x,y\' AS "B", g % 2 = 0 AS "C", '
+                    'E\'a\\nb\' AS "D" FROM generate_series(1, 5000) g',
+                init_url='/datagrid/initialize/query_tool/{0}/{1}/{2}',
+                donwload_url="/sqleditor/query_tool/download/{0}",
+                output_columns='"A","B","C","D"\r\n',
+                output_values='4999,"x,y",False,"a\nb"\r\n'
+                              '5000,"x,y",True,"a\nb"\r\n',
+                is_valid_tx=True,
+                is_valid=True,
+                use_copy=False
+            )
+        ),
+        (
+            'Download csv URL with query not using the server cursor',
+            dict(
+                sql='SHOW client_encoding',
+                init_url='/datagrid/initialize/query_tool/{0}/{1}/{2}',
+                donwload_url="/sqleditor/query_tool/download/{0}",
+                output_columns='"client_encoding"',
+                output_values='UTF8',
+                is_valid_tx=True,
+                is_valid=True,
+                use_copy=True
             )
         ),
         (
@@ -44,7 +108,8 @@ class TestDownloadCSV(BaseTestGenerator):
                 output_columns=None,
                 output_values=None,
                 is_valid_tx=False,
-                is_valid=False
+                is_valid=False,
+                use_copy=True
             )
         ),
         (
@@ -56,7 +121,8 @@ class TestDownloadCSV(BaseTestGenerator):
                 output_columns=None,
                 output_values=None,
                 is_valid_tx=True,
-                is_valid=False
+                is_valid=False,
+                use_copy=True
             )
         ),
     ]
@@ -96,10 +162,11 @@ class TestDownloadCSV(BaseTestGenerator):
         url = self.donwload_url.format(self.trans_id)
         # Disable the console logging from Flask logger
         self.app.logger.disabled = True
-        response = self.tester.post(
-            url,
-            data={"query": self.sql, "filename": 'test.csv'}
-        )
+        with patch('config.QUERY_DOWNLOAD_USE_COPY', self.use_copy):
+            response = self.tester.post(
+                url,
+                data={"query": self.sql, "filename": 'test.csv'}
+            )
         # Enable the console logging from Flask logger
         self.app.logger.disabled = False
         if self.is_valid:
@@ -0,0 +1,173 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Process wide cache of the catalog lookups done by the query tool, after a
+query has finished.
+
+The names of the data types of the result columns are cached per server
+(the built-in types, which are loaded all at once) and per database (the
+user defined types), and the not null/default value information of the
+columns of a table (used to view/edit its data) per database. The cache of
+a database is removed, when a statement changing the catalog is run in the
+query tool, and expires after the configured time.
+"""
+
+import time
+from threading import Lock
+
+from config import QUERY_TOOL_CATALOG_CACHE_TTL
+from pgadmin.utils.sqlautocomplete.metadata_cache import DDL_COMMAND_RE
+
+# The objects with the oid lower than this are the built-in objects
+FIRST_NORMAL_OBJECT_ID = 16384
+
+
+class QueryToolCatalogCache(object):
+    """
+    class QueryToolCatalogCache
+
+        Caches the type names (by the type oid), and the columns of the
+        tables (by the table oid, and the column name).
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        # sid => {type oid => type name}
+        self._builtin_types = dict()
+        # (sid, did) => (cached at, {type oid => type name})
+        self._types = dict()
+        # (sid, did, tid) => (cached at, columns)
+        self._columns = dict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def _get_valid(self, entries, key):
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.ttl:
+            del entries[key]
+            return None
+        return entry[1]
+
+    def has_builtin_types(self, sid):
+        with self._lock:
+            return sid in self._builtin_types
+
+    def get_type_names(self, sid, did, oids):
+        """
+        Returns the cached names of the given type oids.
+
+        Returns:
+            {type oid => type name} of the cached types, list of the type
+            oids not found in the cache
+        """
+        names = dict()
+        missing = []
+
+        if not self.enabled:
+            return names, list(oids)
+
+        with self._lock:
+            builtin_types = self._builtin_types.get(sid, {})
+            user_types = self._get_valid(self._types, (sid, did)) or {}
+
+            for oid in oids:
+                name = builtin_types.get(oid) if \
+                    oid < FIRST_NORMAL_OBJECT_ID else user_types.get(oid)
+                if name is None:
+                    missing.append(oid)
+                else:
+                    names[oid] = name
+
+        return names, missing
+
+    def put_type_names(self, sid, did, names):
+        """
+        Caches the given type names, the built-in ones for the server and
+        the others for the database.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            builtin_types = self._builtin_types.setdefault(sid, dict())
+            user_types = self._get_valid(self._types, (sid, did))
+            if user_types is None:
+                user_types = dict()
+                self._types[(sid, did)] = (time.time(), user_types)
+
+            for oid, name in names.items():
+                if oid < FIRST_NORMAL_OBJECT_ID:
+                    builtin_types[oid] = name
+                else:
+                    user_types[oid] = name
+
+    def get_table_columns(self, sid, did, tid):
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            return self._get_valid(self._columns, (sid, did, tid))
+
+    def put_table_columns(self, sid, did, tid, columns):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._columns[(sid, did, tid)] = (time.time(), columns)
+
+    def invalidate_table(self, sid, did, tid):
+        """
+        Removes the cached columns of the given table, e.g. after its columns
+        have been changed from the browser tree.
+        """
+        with self._lock:
+            self._columns.pop((sid, did, tid), None)
+
+    def invalidate(self, sid, did=None):
+        """
+        Removes the cached user defined types and table columns of the given
+        database (or all the databases of the server, including the built-in
+        types, if not given).
+        """
+        with self._lock:
+            if did is None:
+                self._builtin_types.pop(sid, None)
+
+            for entries in (self._types, self._columns):
+                for key in list(entries.keys()):
+                    if key[0] == sid and (did is None or key[1] == did):
+                        del entries[key]
+
+    def invalidate_if_ddl(self, sid, did, sql):
+        """
+        Removes the cached data of the given database, if the given SQL
+        statement (or command status tag) may have changed the catalog.
+
+        Returns:
+            True if the cache was invalidated
+        """
+        if sql and DDL_COMMAND_RE.search(sql):
+            self.invalidate(sid, did)
+            return True
+        return False
+
+    def clear(self):
+        with self._lock:
+            self._builtin_types.clear()
+            self._types.clear()
+            self._columns.clear()
+
+
+catalog_cache = QueryToolCatalogCache(QUERY_TOOL_CATALOG_CACHE_TTL)
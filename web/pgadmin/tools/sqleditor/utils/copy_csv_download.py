@@ -0,0 +1,111 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Export the query tool result as CSV using COPY (query) TO STDOUT.
+
+COPY is not supported on the asynchronous connection of the query tool,
+hence - the query is run on a separate (synchronous) connection to the same
+database, with the settings affecting the query copied from the query tool
+connection. It is only used, when the query tool session has no other state,
+which may change the result of the query (i.e. an open transaction, other
+settings changed in the session, or temporary objects).
+"""
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+import config
+
+# Settings of the query tool connection, copied to the COPY connection
+COPIED_SETTINGS = (
+    'role', 'search_path', 'TimeZone', 'DateStyle', 'IntervalStyle',
+    'extra_float_digits', 'bytea_output'
+)
+
+# Settings of the query tool connection, which do not affect the result
+SESSION_SETTINGS = COPIED_SETTINGS + (
+    'client_encoding', 'client_min_messages', 'application_name'
+)
+
+
+def copy_connection_id(conn_id):
+    """
+    Returns the id of the connection used for COPY by the query tool with
+    the given connection id.
+    """
+    return u'{0}-copy'.format(conn_id)
+
+
+def copy_query_as_csv(trans_obj, conn, sql, **csv_options):
+    """
+    Generate the CSV output of the given query using COPY.
+
+    The query tool connection must not be in a transaction, as the changes
+    done in it would not be visible to the COPY connection. Also, the other
+    settings changed in the session (than copied), and the temporary objects
+    are not available to the COPY connection. The custom settings (e.g. used
+    by the row level security policies) can not be found, hence - COPY is
+    only used if enabled by QUERY_DOWNLOAD_USE_COPY.
+
+    Args:
+        trans_obj: Transaction object of the query tool
+        conn: Connection of the query tool
+        sql: Query
+        csv_options: quote, quote_char, field_separator, replace_nulls_with
+
+    Returns:
+        status, iterable of the CSV data (or the error message)
+    """
+    if not config.QUERY_DOWNLOAD_USE_COPY:
+        return False, None
+
+    if conn.transaction_status() != TRANSACTION_STATUS_IDLE:
+        return False, None
+
+    status, res = conn.execute_dict(
+        u'SELECT {0}, current_user AS pgadmin_user, '
+        u'EXISTS (SELECT 1 FROM pg_catalog.pg_settings '
+        u"WHERE source = 'session' AND name <> ALL (%(settings)s)) OR "
+        u'EXISTS (SELECT 1 FROM pg_catalog.pg_class '
+        u'WHERE relnamespace = pg_catalog.pg_my_temp_schema()) OR '
+        u'EXISTS (SELECT 1 FROM pg_catalog.pg_proc '
+        u'WHERE pronamespace = pg_catalog.pg_my_temp_schema()) '
+        u'AS pgadmin_session_state'.format(u', '.join(
+            u"current_setting('{0}') AS \"{0}\"".format(name)
+            for name in COPIED_SETTINGS
+        )), dict(settings=list(SESSION_SETTINGS))
+    )
+    if not status:
+        return False, res
+    settings = res['rows'][0]
+    if settings.pop('pgadmin_session_state'):
+        return False, None
+    current_user = settings.pop('pgadmin_user')
+
+    copy_conn = conn.manager.connection(
+        did=trans_obj.did, conn_id=copy_connection_id(trans_obj.conn_id),
+        async_=False
+    )
+    status, msg = copy_conn.connect()
+    if not status:
+        return False, msg
+
+    status, res = copy_conn.execute_scalar(
+        u'SELECT current_user, {0}'.format(u', '.join(
+            u"set_config('{0}', %({0})s, false)".format(name)
+            for name in COPIED_SETTINGS
+        )), settings
+    )
+    if not status:
+        return False, res
+    # e.g. SET SESSION AUTHORIZATION in the query tool
+    if res != current_user:
+        return False, None
+
+    return copy_conn.execute_on_server_as_copy_csv(sql, **csv_options)
@@ -8,7 +8,6 @@
 ##########################################################################
 
 """Code to handle data sorting in view data mode."""
-import pickle
 import simplejson as json
 from flask_babelex import gettext
 from flask import current_app
@@ -91,7 +90,6 @@ class FilterDialog(object):
             if status:
                 # As we changed the transaction object we need to
                 # restore it and update the session variable.
-                session_obj['command_obj'] = pickle.dumps(trans_obj, -1)
                 update_session_grid_transaction(trans_id, session_obj)
                 res = gettext('Data sorting object updated successfully')
         else:
@@ -9,7 +9,6 @@
 
 """Start executing the query in async mode."""
 
-import pickle
 import random
 
 from flask import Response
@@ -21,12 +20,16 @@ from pgadmin.tools.sqleditor.utils.apply_explain_plan_wrapper import \
 from pgadmin.tools.sqleditor.utils.constant_definition import TX_STATUS_IDLE, \
     TX_STATUS_INERROR
 from pgadmin.tools.sqleditor.utils.is_begin_required import is_begin_required
+from pgadmin.tools.sqleditor.utils.transaction_registry import \
+    transaction_registry, TRANSACTION_REF
 from pgadmin.tools.sqleditor.utils.update_session_grid_transaction import \
     update_session_grid_transaction
 from pgadmin.utils.ajax import make_json_response, internal_server_error
 from pgadmin.utils.driver import get_driver
 from pgadmin.utils.exception import ConnectionLost, SSHTunnelConnectionLost,\
     CryptKeyMissing
+from pgadmin.utils.sqlautocomplete.metadata_cache import autocomplete_cache
+from pgadmin.tools.sqleditor.utils.catalog_cache import catalog_cache
 
 
 class StartRunningQuery:
@@ -49,7 +52,7 @@ class StartRunningQuery:
         session_obj.pop('primary_keys', None)
         session_obj.pop('oids', None)
 
-        transaction_object = pickle.loads(session_obj['command_obj'])
+        transaction_object = session_obj['command_obj']
         can_edit = False
         can_filter = False
         notifies = None
@@ -142,6 +145,11 @@ class StartRunningQuery:
         except (ConnectionLost, SSHTunnelConnectionLost, CryptKeyMissing):
             raise
 
+        # The query may change the objects used by the auto complete, hence
+        # - remove the cached metadata for the database.
+        autocomplete_cache.invalidate_if_ddl(trans_obj.sid, trans_obj.did, sql)
+        catalog_cache.invalidate_if_ddl(trans_obj.sid, trans_obj.did, sql)
+
         # If the transaction aborted for some reason and
         # Auto RollBack is True then issue a rollback to cleanup.
         if StartRunningQuery.is_rollback_statement_required(trans_obj,
@@ -167,8 +175,8 @@ class StartRunningQuery:
     @staticmethod
     def save_transaction_in_session(session, transaction_id, transaction):
         # As we changed the transaction object we need to
-        # restore it and update the session variable.
-        session['command_obj'] = pickle.dumps(transaction, -1)
+        # update the transaction data.
+        session['command_obj'] = transaction
         update_session_grid_transaction(transaction_id, session)
 
     @staticmethod
@@ -180,14 +188,20 @@ class StartRunningQuery:
                 info='DATAGRID_TRANSACTION_REQUIRED', status=404
             )
         grid_data = http_session['gridData']
+        # Fetch the data for the specified transaction id from the registry.
+        session_ref = grid_data.get(str(transaction_id))
+        session_obj = None
+        if session_ref is not None and TRANSACTION_REF in session_ref:
+            session_obj = transaction_registry.get(
+                session_ref[TRANSACTION_REF]
+            )
+
         # Return from the function if transaction id not found
-        if str(transaction_id) not in grid_data:
+        if session_obj is None:
             return make_json_response(
                 success=0,
                 errormsg=gettext('Transaction ID not found in the session.'),
                 info='DATAGRID_TRANSACTION_REQUIRED',
                 status=404
             )
-        # Fetch the object for the specified transaction id.
-        # Use pickle.loads function to get the command object
-        return grid_data[str(transaction_id)]
+        return session_obj
@@ -0,0 +1,195 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import sys
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.tools.sqleditor import fetch_pg_types, fetch_table_columns
+from pgadmin.tools.sqleditor.utils.catalog_cache import \
+    QueryToolCatalogCache
+
+if sys.version_info < (3, 3):
+    from mock import patch, MagicMock
+else:
+    from unittest.mock import patch, MagicMock
+
+# Types known to the fake database server
+PG_TYPES = {23: 'integer', 25: 'text', 16385: 'my_enum', 16390: 'my_type'}
+
+
+class FakeConnection(object):
+    """
+    Returns the requested type names, and counts the queries.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def connected(self):
+        return True
+
+    def execute_dict(self, sql, params):
+        self.queries.append(sql)
+        oids = set(params[0])
+        return True, {'rows': [
+            {'oid': oid, 'typname': typname}
+            for oid, typname in PG_TYPES.items()
+            if oid in oids or ('oid < 16384' in sql and oid < 16384)
+        ]}
+
+
+class TestQueryToolCatalogCache(BaseTestGenerator):
+    """
+    Check the type names of the query tool result columns are fetched from
+    the database server only once, until the cache is invalidated.
+    """
+    scenarios = [
+        (
+            'Built-in and user defined types are fetched once',
+            dict(ddl=None, expected_queries=1)
+        ),
+        (
+            'User defined types are fetched again after the DDL',
+            dict(ddl='ALTER TYPE my_enum RENAME TO your_enum',
+                 expected_queries=2)
+        ),
+        (
+            'Types are not fetched again after the DML',
+            dict(ddl='UPDATE 1', expected_queries=1)
+        ),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        cache = QueryToolCatalogCache(300)
+        conn = FakeConnection()
+        manager = MagicMock()
+        manager.connection.return_value = conn
+        trans_obj = MagicMock(sid=1, did=10)
+
+        columns = {
+            'a': {'type_code': 23},
+            'b': {'type_code': 16385},
+        }
+
+        with patch('pgadmin.tools.sqleditor.catalog_cache', cache), \
+                patch('pgadmin.tools.sqleditor.get_driver') as get_driver:
+            get_driver.return_value.connection_manager.return_value = \
+                manager
+
+            status, types = fetch_pg_types(columns, trans_obj)
+            self.assertTrue(status)
+            self.assertEqual(types, {23: 'integer', 16385: 'my_enum'})
+            # The built-in types were loaded with the first query
+            self.assertIn('oid < 16384', conn.queries[0])
+
+            if self.ddl:
+                cache.invalidate_if_ddl(1, 10, self.ddl)
+
+            # Another query of the built-in and the known types
+            status, types = fetch_pg_types({
+                'c': {'type_code': 25},
+                'd': {'type_code': 16385},
+            }, trans_obj)
+            self.assertTrue(status)
+            self.assertEqual(types, {25: 'text', 16385: 'my_enum'})
+            self.assertEqual(len(conn.queries), self.expected_queries)
+
+            # Only the user defined types are fetched for another database
+            trans_obj.did = 11
+            status, types = fetch_pg_types(columns, trans_obj)
+            self.assertEqual(types, {23: 'integer', 16385: 'my_enum'})
+            self.assertEqual(len(conn.queries), self.expected_queries + 1)
+            self.assertNotIn('oid < 16384', conn.queries[-1])
+
+
+class FakeTableConnection(object):
+    """
+    Returns the columns of the table, and counts the queries.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.queries = 0
+        self.manager = MagicMock(version=110000)
+
+    def execute_2darray(self, sql):
+        self.queries += 1
+        return True, {'rows': [
+            {'name': name, 'not_null': not_null, 'has_default_val': False}
+            for name, not_null in self.columns
+        ]}
+
+
+class TestQueryToolTableColumnsCache(BaseTestGenerator):
+    """
+    Check the columns of the table are fetched again, when changed since
+    cached, and are matched to the result columns by the name.
+    """
+    scenarios = [
+        (
+            'Columns are fetched once',
+            dict(changed_columns=[('a', True), ('b', False)],
+                 invalidate=False, expected_queries=1,
+                 expected_not_null={'a': True, 'b': False})
+        ),
+        (
+            'Columns are fetched again after a column is added',
+            dict(changed_columns=[('a', True), ('c', True), ('b', False)],
+                 invalidate=False, expected_queries=2,
+                 expected_not_null={'a': True, 'c': True, 'b': False})
+        ),
+        (
+            'Columns are matched by the name after a column is dropped',
+            dict(changed_columns=[('b', False)],
+                 invalidate=False, expected_queries=1,
+                 expected_not_null={'b': False})
+        ),
+        (
+            'Columns are fetched again after changed in the browser',
+            dict(changed_columns=[('a', False), ('b', False)],
+                 invalidate=True, expected_queries=2,
+                 expected_not_null={'a': False, 'b': False})
+        ),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        cache = QueryToolCatalogCache(300)
+        conn = FakeTableConnection([('a', True), ('b', False)])
+        trans_obj = MagicMock(sid=1, did=10, obj_id=16400)
+
+        with patch('pgadmin.tools.sqleditor.catalog_cache', cache), \
+                patch('pgadmin.tools.sqleditor.render_template'):
+            status, columns = fetch_table_columns(
+                conn, trans_obj, [{'name': 'a'}, {'name': 'b'}]
+            )
+            self.assertTrue(status)
+            self.assertEqual(conn.queries, 1)
+
+            # The table is changed, and viewed again
+            conn.columns = self.changed_columns
+            if self.invalidate:
+                cache.invalidate_table(1, 10, 16400)
+
+            status, columns = fetch_table_columns(
+                conn, trans_obj,
+                [{'name': name} for name, _ in self.changed_columns]
+            )
+            self.assertTrue(status)
+            self.assertEqual(conn.queries, self.expected_queries)
+            self.assertEqual(
+                dict((name, columns[name]['not_null'])
+                     for name, _ in self.changed_columns),
+                self.expected_not_null
+            )
@@ -37,7 +37,7 @@ class StartRunningQueryTest(BaseTestGenerator):
                  trans_id=123,
                  http_session=dict()
              ),
-             pickle_load_return=None,
+             command_obj=None,
              get_driver_exception=False,
              get_connection_lost_exception=False,
              manager_connection_exception=None,
@@ -67,7 +67,7 @@ class StartRunningQueryTest(BaseTestGenerator):
                  trans_id=123,
                  http_session=dict(gridData=dict())
              ),
-             pickle_load_return=None,
+             command_obj=None,
              get_driver_exception=False,
              get_connection_lost_exception=False,
              manager_connection_exception=None,
@@ -96,9 +96,11 @@ class StartRunningQueryTest(BaseTestGenerator):
              function_parameters=dict(
                  sql=dict(sql='some sql', explain_plan=None),
                  trans_id=123,
-                 http_session=dict(gridData={'123': dict(command_obj='')})
+                 http_session=dict(
+                     gridData={'123': dict(transaction_ref='abc')}
+                 )
              ),
-             pickle_load_return=None,
+             command_obj=None,
              get_driver_exception=False,
              get_connection_lost_exception=False,
              manager_connection_exception=None,
@@ -132,10 +134,12 @@ class StartRunningQueryTest(BaseTestGenerator):
              function_parameters=dict(
                  sql=dict(sql='some sql', explain_plan=None),
                  trans_id=123,
-                 http_session=dict(gridData={'123': dict(command_obj='')})
+                 http_session=dict(
+                     gridData={'123': dict(transaction_ref='abc')}
+                 )
              ),
-             pickle_load_return=MagicMock(conn_id=1,
-                                          update_fetched_row_cnt=MagicMock()),
+             command_obj=MagicMock(conn_id=1,
+                                   update_fetched_row_cnt=MagicMock()),
              get_driver_exception=True,
              get_connection_lost_exception=False,
              manager_connection_exception=None,
@@ -161,9 +165,11 @@ class StartRunningQueryTest(BaseTestGenerator):
              function_parameters=dict(
                  sql=dict(sql='some sql', explain_plan=None),
                  trans_id=123,
-                 http_session=dict(gridData={'123': dict(command_obj='')})
+                 http_session=dict(
+                     gridData={'123': dict(transaction_ref='abc')}
+                 )
              ),
-             pickle_load_return=MagicMock(
+             command_obj=MagicMock(
                  conn_id=1,
                  update_fetched_row_cnt=MagicMock()
              ),
@@ -190,9 +196,11 @@ class StartRunningQueryTest(BaseTestGenerator):
              function_parameters=dict(
                  sql=dict(sql='some sql', explain_plan=None),
                  trans_id=123,
-                 http_session=dict(gridData={'123': dict(command_obj='')})
+                 http_session=dict(
+                     gridData={'123': dict(transaction_ref='abc')}
+                 )
              ),
-             pickle_load_return=MagicMock(
+             command_obj=MagicMock(
                  conn_id=1,
                  update_fetched_row_cnt=MagicMock()
              ),
@@ -218,9 +226,11 @@ class StartRunningQueryTest(BaseTestGenerator):
              function_parameters=dict(
                  sql=dict(sql='some sql', explain_plan=None),
                  trans_id=123,
-                 http_session=dict(gridData={'123': dict(command_obj='')})
+                 http_session=dict(
+                     gridData={'123': dict(transaction_ref='abc')}
+                 )
              ),
-             pickle_load_return=MagicMock(
+             command_obj=MagicMock(
                  conn_id=1,
                  update_fetched_row_cnt=MagicMock()
              ),
@@ -249,9 +259,11 @@ class StartRunningQueryTest(BaseTestGenerator):
              function_parameters=dict(
                  sql=dict(sql='some sql', explain_plan=None),
                  trans_id=123,
-                 http_session=dict(gridData={'123': dict(command_obj='')})
+                 http_session=dict(
+                     gridData={'123': dict(transaction_ref='abc')}
+                 )
              ),
-             pickle_load_return=MagicMock(
+             command_obj=MagicMock(
                  conn_id=1,
                  update_fetched_row_cnt=MagicMock(),
                  set_connection_id=MagicMock(),
@@ -294,9 +306,11 @@ class StartRunningQueryTest(BaseTestGenerator):
              function_parameters=dict(
                  sql=dict(sql='some sql', explain_plan=None),
                  trans_id=123,
-                 http_session=dict(gridData={'123': dict(command_obj='')})
+                 http_session=dict(
+                     gridData={'123': dict(transaction_ref='abc')}
+                 )
              ),
-             pickle_load_return=MagicMock(
+             command_obj=MagicMock(
                  conn_id=1,
                  update_fetched_row_cnt=MagicMock(),
                  set_connection_id=MagicMock(),
@@ -339,9 +353,11 @@ class StartRunningQueryTest(BaseTestGenerator):
              function_parameters=dict(
                  sql=dict(sql='some sql', explain_plan=None),
                  trans_id=123,
-                 http_session=dict(gridData={'123': dict(command_obj='')})
+                 http_session=dict(
+                     gridData={'123': dict(transaction_ref='abc')}
+                 )
              ),
-             pickle_load_return=MagicMock(
+             command_obj=MagicMock(
                  conn_id=1,
                  update_fetched_row_cnt=MagicMock(),
                  set_connection_id=MagicMock(),
@@ -384,9 +400,11 @@ class StartRunningQueryTest(BaseTestGenerator):
              function_parameters=dict(
                  sql=dict(sql='some sql', explain_plan=None),
                  trans_id=123,
-                 http_session=dict(gridData={'123': dict(command_obj='')})
+                 http_session=dict(
+                     gridData={'123': dict(transaction_ref='abc')}
+                 )
              ),
-             pickle_load_return=MagicMock(
+             command_obj=MagicMock(
                  conn_id=1,
                  update_fetched_row_cnt=MagicMock(),
                  set_connection_id=MagicMock(),
@@ -429,14 +447,16 @@ class StartRunningQueryTest(BaseTestGenerator):
            '.apply_explain_plan_wrapper_if_needed')
     @patch('pgadmin.tools.sqleditor.utils.start_running_query'
            '.make_json_response')
-    @patch('pgadmin.tools.sqleditor.utils.start_running_query.pickle')
+    @patch('pgadmin.tools.sqleditor.utils.start_running_query'
+           '.transaction_registry')
     @patch('pgadmin.tools.sqleditor.utils.start_running_query.get_driver')
     @patch('pgadmin.tools.sqleditor.utils.start_running_query'
            '.internal_server_error')
     @patch('pgadmin.tools.sqleditor.utils.start_running_query'
            '.update_session_grid_transaction')
     def runTest(self, update_session_grid_transaction_mock,
-                internal_server_error_mock, get_driver_mock, pickle_mock,
+                internal_server_error_mock, get_driver_mock,
+                transaction_registry_mock,
                 make_json_response_mock,
                 apply_explain_plan_wrapper_if_needed_mock):
         """Check correct function is called to handle to run query."""
@@ -448,7 +468,9 @@ class StartRunningQueryTest(BaseTestGenerator):
         make_json_response_mock.return_value = expected_response
         if self.expect_internal_server_error_called_with is not None:
             internal_server_error_mock.return_value = expected_response
-        pickle_mock.loads.return_value = self.pickle_load_return
+        transaction_registry_mock.get.return_value = dict(
+            command_obj=self.command_obj
+        )
         blueprint_mock = MagicMock(
             info_notifier_timeout=MagicMock(get=lambda: 5))
 
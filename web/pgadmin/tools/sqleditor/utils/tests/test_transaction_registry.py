@@ -0,0 +1,72 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import shutil
+import tempfile
+import time
+
+from pgadmin.tools.sqleditor.utils.transaction_registry import \
+    TransactionRegistry, FileTransactionStore
+from pgadmin.utils.route import BaseTestGenerator
+
+
+class TestTransactionRegistry(BaseTestGenerator):
+    """
+    Check that the TransactionRegistry keeps the transaction data as
+    intended.
+    """
+    scenarios = [
+        ('Registered data is returned as it is (without copying)',
+         dict(use_store=False, max_idle_time=60, sleep=0,
+              expect_in_memory=True, expect_after_restart=False)),
+        ('Idle data is removed when another transaction is registered',
+         dict(use_store=False, max_idle_time=0.01, sleep=0.05,
+              expect_in_memory=False, expect_after_restart=False)),
+        ('Data is restored from the file store by a new registry',
+         dict(use_store=True, max_idle_time=60, sleep=0,
+              expect_in_memory=True, expect_after_restart=True)),
+    ]
+
+    def setUp(self):
+        self.store_path = tempfile.mkdtemp()
+
+    def create_registry(self):
+        store = None
+        if self.use_store:
+            store = FileTransactionStore(self.store_path)
+        return TransactionRegistry(self.max_idle_time, store)
+
+    def runTest(self):
+        registry = self.create_registry()
+        data = {'command_obj': {'sid': 1, 'did': 2}, 'columns_info': None}
+
+        ref = registry.add(data)
+        self.assertIs(registry.get(ref), data)
+
+        data['columns_info'] = {'a': 23}
+        registry.save(ref, data)
+
+        time.sleep(self.sleep)
+        registry.add({'command_obj': None})
+
+        self.assertEqual(registry.get(ref) is not None,
+                         self.expect_in_memory)
+
+        restored = self.create_registry().get(ref)
+        if self.expect_after_restart:
+            self.assertEqual(restored, data)
+        else:
+            self.assertIsNone(restored)
+
+        registry.remove(ref)
+        self.assertIsNone(registry.get(ref))
+        self.assertIsNone(self.create_registry().get(ref))
+
+    def tearDown(self):
+        shutil.rmtree(self.store_path, True)
@@ -0,0 +1,237 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+In-process registry of the query tool (and view data) transactions.
+
+The transaction data (the command object, columns information, primary
+keys, etc) of each opened query tool used to be pickled in the session, and
+the whole session was written again every time it changed. The registry
+keeps the transaction data in the memory of the process instead, and the
+session only stores a reference to it.
+"""
+
+import os
+import time
+from threading import Lock
+from uuid import uuid4
+
+try:
+    from cPickle import dump, load
+except ImportError:
+    from pickle import dump, load
+
+from flask import session
+
+import config
+
+# Key of the reference to the registry in the session grid data
+TRANSACTION_REF = 'transaction_ref'
+
+
+class TransactionStore(object):
+    """
+    class TransactionStore
+
+        Optional backing store of the TransactionRegistry, used to restore
+        the transactions not found in the memory (i.e. after the restart of
+        the process).
+    """
+
+    def load(self, ref):
+        'Returns the transaction data for the given reference (or None)'
+        raise NotImplementedError
+
+    def save(self, ref, data):
+        'Save the transaction data'
+        raise NotImplementedError
+
+    def remove(self, ref):
+        'Remove the transaction data'
+        raise NotImplementedError
+
+
+class FileTransactionStore(TransactionStore):
+    """
+    class FileTransactionStore
+
+        Stores the pickled transaction data in the files under the given
+        directory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+    def _file_name(self, ref):
+        return os.path.join(self.path, ref)
+
+    def load(self, ref):
+        fname = self._file_name(ref)
+        if not os.path.exists(fname):
+            return None
+
+        try:
+            with open(fname, 'rb') as f:
+                return load(f)
+        except Exception:
+            return None
+
+    def save(self, ref, data):
+        with open(self._file_name(ref), 'wb') as f:
+            dump(data, f, -1)
+
+    def remove(self, ref):
+        fname = self._file_name(ref)
+        if os.path.exists(fname):
+            os.unlink(fname)
+
+
+class TransactionRegistry(object):
+    """
+    class TransactionRegistry
+
+        Keeps the transaction data (dict) against a unique reference, and
+        removes the ones not accessed within the given idle time (in seconds).
+    """
+
+    def __init__(self, max_idle_time, store=None):
+        self.max_idle_time = max_idle_time
+        self.store = store
+        self._transactions = dict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._transactions)
+
+    def add(self, data):
+        """
+        Register the transaction data, and returns the reference for it.
+        """
+        ref = uuid4().hex
+
+        with self._lock:
+            self._remove_idle()
+            self._transactions[ref] = [time.time(), data]
+
+        if self.store is not None:
+            self.store.save(ref, data)
+
+        return ref
+
+    def get(self, ref):
+        """
+        Returns the transaction data for the given reference, or None if it
+        is not registered.
+        """
+        with self._lock:
+            entry = self._transactions.get(ref)
+            if entry is not None:
+                entry[0] = time.time()
+                return entry[1]
+
+        if self.store is None:
+            return None
+
+        data = self.store.load(ref)
+        if data is not None:
+            with self._lock:
+                entry = self._transactions.setdefault(
+                    ref, [time.time(), data]
+                )
+                data = entry[1]
+
+        return data
+
+    def save(self, ref, data):
+        """
+        Update the transaction data for the given reference.
+
+        The data is modified in place by the callers, hence - it only needs
+        to be written to the backing store (if any).
+        """
+        with self._lock:
+            self._transactions[ref] = [time.time(), data]
+
+        if self.store is not None:
+            self.store.save(ref, data)
+
+    def remove(self, ref):
+        with self._lock:
+            self._transactions.pop(ref, None)
+
+        if self.store is not None:
+            self.store.remove(ref)
+
+    def _remove_idle(self):
+        expired = time.time() - self.max_idle_time
+        for ref in [
+            ref for ref, entry in self._transactions.items()
+            if entry[0] < expired
+        ]:
+            del self._transactions[ref]
+            if self.store is not None:
+                self.store.remove(ref)
+
+
+def create_transaction_registry():
+    store = None
+    if config.QUERY_TOOL_TRANSACTION_STORE == 'file':
+        store = FileTransactionStore(
+            os.path.join(config.SESSION_DB_PATH, 'transactions')
+        )
+
+    return TransactionRegistry(
+        config.SESSION_EXPIRATION_TIME * 24 * 60 * 60, store
+    )
+
+
+transaction_registry = create_transaction_registry()
+
+
+def register_grid_transaction(trans_id, data):
+    """
+    Register the transaction data, and store the reference to it in the
+    session against the given transaction id.
+    """
+    grid_data = session['gridData'] if 'gridData' in session else dict()
+    grid_data[str(trans_id)] = {
+        TRANSACTION_REF: transaction_registry.add(data)
+    }
+    session['gridData'] = grid_data
+
+
+def get_grid_transaction(trans_id):
+    """
+    Returns the transaction data for the given transaction id of the current
+    session, or None if not found.
+    """
+    if 'gridData' not in session:
+        return None
+
+    session_ref = session['gridData'].get(str(trans_id))
+    if session_ref is None or TRANSACTION_REF not in session_ref:
+        return None
+
+    return transaction_registry.get(session_ref[TRANSACTION_REF])
+
+
+def remove_grid_transaction(trans_id):
+    """
+    Remove the transaction data, and the reference to it from the session.
+    """
+    if 'gridData' not in session:
+        return
+
+    grid_data = session['gridData']
+    session_ref = grid_data.pop(str(trans_id), None)
+    if session_ref is not None and TRANSACTION_REF in session_ref:
+        transaction_registry.remove(session_ref[TRANSACTION_REF])
+    session['gridData'] = grid_data
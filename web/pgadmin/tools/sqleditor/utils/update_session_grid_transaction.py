@@ -7,12 +7,15 @@
 #
 ##########################################################################
 
-"""Update session with gridData."""
+"""Update the transaction data referenced by the session gridData."""
 from flask import session
 
+from pgadmin.tools.sqleditor.utils.transaction_registry import \
+    transaction_registry, TRANSACTION_REF
+
 
 def update_session_grid_transaction(trans_id, data):
     if 'gridData' in session:
-        grid_data = session['gridData']
-        grid_data[str(trans_id)] = data
-        session['gridData'] = grid_data
+        session_ref = session['gridData'].get(str(trans_id))
+        if session_ref is not None and TRANSACTION_REF in session_ref:
+            transaction_registry.save(session_ref[TRANSACTION_REF], data)
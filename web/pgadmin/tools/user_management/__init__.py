@@ -23,6 +23,7 @@ from pgadmin.utils import PgAdminModule
 from pgadmin.utils.ajax import make_response as ajax_response, \
     make_json_response, bad_request, internal_server_error
 from pgadmin.utils.csrf import pgCSRFProtect
+from pgadmin.utils.driver import get_driver
 
 from pgadmin.model import db, Role, User, UserPreference, Server, \
     ServerGroup, Process, Setting
@@ -291,6 +292,9 @@ def delete(uid):
 
         db.session.commit()
 
+        # The servers of the user are also deleted
+        get_driver(config.PG_DEFAULT_DRIVER).invalidate_server_cache()
+
         return make_json_response(
             success=1,
             info=_("User deleted."),
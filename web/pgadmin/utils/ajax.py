@@ -79,6 +79,52 @@ def make_json_response(
     )
 
 
+def make_json_stream_response(
+        stream_key, chunks, success=1, errormsg='', info='', result=None,
+        data=None, status=200, encoding='utf-8'
+):
+    """Create a HTML response document same as make_json_response, but
+    generate the array at data[stream_key] from the given chunks (iterable
+    of lists), while sending the response.
+
+    The chunks are serialized one at a time, hence - the complete array (and,
+    its JSON text) is never held in the memory, and the client starts
+    receiving the data as soon as the first chunk is available."""
+    encoder = DataTypeJSONEncoder(separators=(',', ':'), encoding=encoding)
+
+    def gen():
+        doc = dict()
+        doc['success'] = success
+        doc['errormsg'] = errormsg
+        doc['info'] = info
+        doc['result'] = result
+        # Drop the closing braces, the streamed array is added at the end of
+        # the data.
+        yield encoder.encode(doc)[:-1] + ',"data":{'
+
+        for key, value in (data or dict()).items():
+            if key == stream_key:
+                continue
+            yield encoder.encode(key) + ':' + encoder.encode(value) + ','
+
+        yield encoder.encode(stream_key) + ':['
+        separator = ''
+        for chunk in chunks:
+            if not chunk:
+                continue
+            # Items of the chunk without the enclosing square brackets
+            yield separator + encoder.encode(chunk)[1:-1]
+            separator = ','
+        yield ']}}'
+
+    return Response(
+        response=gen(),
+        status=status,
+        mimetype="application/json",
+        headers=get_no_cache_header()
+    )
+
+
 def make_response(response=None, status=200):
     """Create a JSON response handled by the backbone models."""
     return Response(
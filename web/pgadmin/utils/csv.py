@@ -56,11 +56,14 @@ Agreement.
 # Handle the null value if value is None or equal to
 # 'replace_nulls_with' then it represents the null value, so no need to
 # quote it.
+# Added writer.writerows_block to write a block of rows using the formatters
+# chosen for each column once per block.
 ############################################################################
 
 from __future__ import unicode_literals, absolute_import
 
 __all__ = ["QUOTE_MINIMAL", "QUOTE_ALL", "QUOTE_NONNUMERIC", "QUOTE_NONE",
+           "NUMBER_COLUMN", "TEXT_COLUMN",
            "Error", "Dialect", "__doc__", "excel", "excel_tab",
            "field_size_limit", "reader", "writer", "register_dialect",
            "get_dialect", "list_dialects", "unregister_dialect",
@@ -87,6 +90,10 @@ else:
     text_type = unicode
     binary_type = str
 
+# Kinds of the columns for writer.writerows_block
+NUMBER_COLUMN = 'number'
+TEXT_COLUMN = 'text'
+
 
 class QuoteStrategy(object):
     quoting = None
@@ -149,6 +156,64 @@ class QuoteStrategy(object):
 
         return field
 
+    def null_field(self, only=None):
+        """The prepared field for the null (None) values."""
+        return self.prepare(self.dialect.replace_nulls_with, only=only)
+
+    def column_formatter(self, kind=None, only=None):
+        """
+        Returns the function preparing the values of a column of the given
+        kind (NUMBER_COLUMN, TEXT_COLUMN or None, if not known). The
+        returned function must prepare any value same as prepare, except
+        None, which represents the null value.
+        """
+        prepare = self.prepare
+        null_field = self.null_field(only=only)
+
+        def format_field(value):
+            if value is None:
+                return null_field
+            return prepare(value, only=only)
+
+        return format_field
+
+    def _quoted_text_formatter(self, only, quote_numbers):
+        """
+        Returns the function, which quotes the (non null) text values and
+        optionally the numbers too. Other values are prepared as usual.
+        """
+        prepare = self.prepare
+        null_field = self.null_field(only=only)
+        quotechar = self.dialect.quotechar
+        replace_nulls_with = self.dialect.replace_nulls_with
+
+        if not self.dialect.doublequote:
+            escaped_quotechar = None
+        else:
+            escaped_quotechar = quotechar * 2
+
+        def format_field(value):
+            value_type = type(value)
+            if value_type is text_type:
+                if value == replace_nulls_with:
+                    return prepare(value, only=only)
+            elif value is None:
+                return null_field
+            elif quote_numbers and (
+                    value_type is int or value_type is float or
+                    value_type is bool):
+                value = text_type(value)
+            else:
+                return prepare(value, only=only)
+
+            if quotechar in value:
+                if escaped_quotechar is None:
+                    return prepare(value, only=only)
+                value = value.replace(quotechar, escaped_quotechar)
+            return quotechar + value + quotechar
+
+        return format_field
+
 
 class QuoteMinimalStrategy(QuoteStrategy):
     quoting = QUOTE_MINIMAL
@@ -173,6 +238,29 @@ class QuoteMinimalStrategy(QuoteStrategy):
             return False
         return field == '' and only or bool(self.quoted_re.search(field))
 
+    def column_formatter(self, kind=None, only=None):
+        prepare = self.prepare
+        null_field = self.null_field(only=only)
+        search_special = self.quoted_re.search
+
+        def format_field(value):
+            value_type = type(value)
+            if value_type is not text_type:
+                if value is None:
+                    return null_field
+                if value_type is int or value_type is float or \
+                        value_type is bool:
+                    value = text_type(value)
+                else:
+                    return prepare(value, only=only)
+
+            # The text without any special character is written as it is
+            if (value or not only) and not search_special(value):
+                return value
+            return prepare(value, only=only)
+
+        return format_field
+
 
 class QuoteAllStrategy(QuoteStrategy):
     quoting = QUOTE_ALL
@@ -189,6 +277,9 @@ class QuoteAllStrategy(QuoteStrategy):
             return False
         return True
 
+    def column_formatter(self, kind=None, only=None):
+        return self._quoted_text_formatter(only, quote_numbers=True)
+
 
 class QuoteNonnumericStrategy(QuoteStrategy):
     quoting = QUOTE_NONNUMERIC
@@ -210,6 +301,26 @@ class QuoteNonnumericStrategy(QuoteStrategy):
             return False
         return not isinstance(raw_field, numbers.Number)
 
+    def column_formatter(self, kind=None, only=None):
+        if kind != NUMBER_COLUMN or self.dialect.escapechar is not None:
+            return self._quoted_text_formatter(only, quote_numbers=False)
+
+        prepare = self.prepare
+        null_field = self.null_field(only=only)
+
+        def format_field(value):
+            # The numbers are neither quoted, nor escaped (without an
+            # escapechar)
+            value_type = type(value)
+            if value_type is int or value_type is float or \
+                    value_type is bool:
+                return text_type(value)
+            if value is None:
+                return null_field
+            return prepare(value, only=only)
+
+        return format_field
+
 
 class QuoteNoneStrategy(QuoteStrategy):
     quoting = QUOTE_NONE
@@ -251,6 +362,7 @@ class writer(object):
             QUOTE_NONE: QuoteNoneStrategy,
         }
         self.strategy = strategies[self.dialect.quoting](self.dialect)
+        self._block_formatters = dict()
 
     def writerow(self, row):
         if row is None:
@@ -267,6 +379,45 @@ class writer(object):
         for row in rows:
             self.writerow(row)
 
+    def writerows_block(self, rows, column_kinds=None):
+        """
+        Write a block of rows (sequences of the same length), e.g. a batch
+        fetched from a cursor.
+
+        Instead of preparing every field through the quote strategy, the
+        formatter of each column is chosen once for the block using its kind
+        (NUMBER_COLUMN, TEXT_COLUMN or None if not known), and the columns
+        are formatted as a whole. The output is same as of writerows, except
+        the None values are written as replace_nulls_with (if given).
+        """
+        if not rows:
+            return 0
+
+        num_columns = len(rows[0])
+        if column_kinds is None:
+            column_kinds = [None] * num_columns
+
+        only = num_columns == 1
+        key = (tuple(column_kinds), only)
+        formatters = self._block_formatters.get(key)
+        if formatters is None:
+            formatters = self._block_formatters[key] = [
+                self.strategy.column_formatter(kind, only=only)
+                for kind in column_kinds
+            ]
+
+        columns = [
+            list(map(formatter, column))
+            for formatter, column in zip(formatters, zip(*rows))
+        ]
+
+        lineterminator = self.dialect.lineterminator
+        return self.fileobj.write(
+            lineterminator.join(
+                map(self.dialect.delimiter.join, zip(*columns))
+            ) + lineterminator
+        )
+
 
 START_RECORD = 0
 START_FIELD = 1
@@ -115,6 +115,11 @@ class BaseConnection(object):
         This returns the result as a 2 dimensional array.
         If records is -1 then fetchmany will behave as fetchall.
 
+    * def async_fetch_2darray_chunks(records=2000):
+      - Implement this method to retrieve the remaining result of asynchronous
+        connection as a generator of 2 dimensional arrays, having the given
+        number of records (at most) each.
+
     * connected()
       - Implement this method to get the status of the connection. It should
         return True for connected, otherwise False
@@ -143,13 +148,14 @@ class BaseConnection(object):
       - Implement this method to wait for asynchronous connection to finish the
         execution, hence - it must be a blocking call.
 
-    * _wait_timeout(conn, time)
+    * _wait_timeout(conn, timeout)
       - Implement this method to wait for asynchronous connection with timeout.
-        This must be a non blocking call.
+        This must be a non blocking call, unless the timeout is given.
 
-    * poll(formatted_exception_msg, no_result)
+    * poll(formatted_exception_msg, no_result, timeout)
       - Implement this method to poll the data of query running on asynchronous
-        connection.
+        connection. If the timeout is given, wait for the result up to that
+        long (long polling).
 
     * cancel_transaction(conn_id, did=None)
       - Implement this method to cancel the running transaction.
@@ -206,6 +212,10 @@ class BaseConnection(object):
                                 formatted_exception_msg=False):
         pass
 
+    @abstractmethod
+    def async_fetch_2darray_chunks(self, records=2000):
+        pass
+
     @abstractmethod
     def connected(self):
         pass
@@ -231,11 +241,12 @@ class BaseConnection(object):
         pass
 
     @abstractmethod
-    def _wait_timeout(self, conn, time):
+    def _wait_timeout(self, conn, timeout=None):
         pass
 
     @abstractmethod
-    def poll(self, formatted_exception_msg=True, no_result=False):
+    def poll(self, formatted_exception_msg=True, no_result=False,
+             timeout=None):
         pass
 
     @abstractmethod
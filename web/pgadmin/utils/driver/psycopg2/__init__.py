@@ -14,6 +14,7 @@ object.
 
 """
 import datetime
+from threading import Lock
 from flask import session, request
 from flask_login import current_user
 from flask_babelex import gettext
@@ -54,10 +55,18 @@ class Driver(BaseDriver):
 
     * connection_manager(sid, reset)
     - It returns the server connection manager for this session.
+
+    * invalidate_server_cache(sid)
+    - It removes the given server (or, all the servers) from the cache of the
+      servers known to exist in the configuration database.
     """
 
     def __init__(self, **kwargs):
         self.managers = dict()
+        # Ids of the servers known to exist in the configuration database,
+        # which saves a query on every call to connection_manager.
+        self._server_ids = set()
+        self._server_ids_lock = Lock()
 
         super(Driver, self).__init__()
 
@@ -75,8 +84,7 @@ class Driver(BaseDriver):
         assert (sid is not None and isinstance(sid, int))
         managers = None
 
-        server_data = Server.query.filter_by(id=sid).first()
-        if server_data is None:
+        if not self._server_exists(sid):
             return None
 
         if session.sid not in self.managers:
@@ -101,6 +109,7 @@ class Driver(BaseDriver):
             s = Server.query.filter_by(id=sid).first()
 
             if not s:
+                self.invalidate_server_cache(sid)
                 return None
 
             managers[str(sid)] = ServerManager(s)
@@ -109,6 +118,32 @@ class Driver(BaseDriver):
 
         return managers[str(sid)]
 
+    def _server_exists(self, sid):
+        """
+        Checks the given server exists in the configuration database, the
+        result is cached until invalidated.
+        """
+        if sid in self._server_ids:
+            return True
+
+        if Server.query.filter_by(id=sid).first() is None:
+            return False
+
+        with self._server_ids_lock:
+            self._server_ids.add(sid)
+        return True
+
+    def invalidate_server_cache(self, sid=None):
+        """
+        Invalidate the cached server (or all the servers, if sid is None).
+        Must be called when a server is added, modified or deleted.
+        """
+        with self._server_ids_lock:
+            if sid is None:
+                self._server_ids.clear()
+            else:
+                self._server_ids.discard(sid)
+
     def Version(cls):
         """
         Version(...)
@@ -185,6 +220,7 @@ class Driver(BaseDriver):
         if session.sid in self.managers and \
                 str(sid) in self.managers[session.sid]:
             del self.managers[session.sid][str(sid)]
+        self.invalidate_server_cache(sid)
 
     def gc(self):
         """
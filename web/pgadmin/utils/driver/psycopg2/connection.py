@@ -14,11 +14,14 @@ object.
 """
 
 import random
+import re
 import select
 import sys
+import time
 import six
 import datetime
 from collections import deque
+from threading import Thread
 import simplejson as json
 import psycopg2
 from flask import g, current_app
@@ -35,25 +38,126 @@ from ..abstract import BaseConnection
 from .cursor import DictCursor
 from .typecast import register_global_typecasters, \
     register_string_typecasters, register_binary_typecasters, \
-    register_array_to_string_typecasters, ALL_JSON_TYPES
+    register_array_to_string_typecasters, ALL_JSON_TYPES, NUMBER_DATATYPES, \
+    BOOL_DATATYPE
 from .encoding import getEncoding, configureDriverEncodings
 from pgadmin.utils import csv
 from pgadmin.utils.master_password import get_crypt_key
 
 if sys.version_info < (3,):
     from StringIO import StringIO
+    from Queue import Queue, Full
     IS_PY2 = True
 else:
     from io import StringIO
+    from queue import Queue, Full
     IS_PY2 = False
 
 _ = gettext
 
+# Statements (after the leading comments), which can be used to declare a
+# server side cursor.
+SERVER_CURSOR_QUERY_RE = re.compile(
+    r'^([\s(]|--[^\n]*(\n|$)|/\*.*?\*/)*(SELECT|VALUES|TABLE|WITH)\b',
+    re.IGNORECASE | re.DOTALL
+)
+
 # Register global type caster which will be applicable to all connections.
 register_global_typecasters()
 configureDriverEncodings(encodings)
 
 
+class CopyOutStream(object):
+    """
+    class CopyOutStream
+
+        File like object, which receives the data of COPY ... TO STDOUT
+        (using cursor.copy_expert) in a worker thread, and hands it over to
+        the reader in the chunks of (at least) the given size. Only a few
+        chunks are buffered, hence - the COPY waits for the reader, when it
+        is slower than the server.
+    """
+
+    def __init__(self, chunk_size, max_chunks=4):
+        self.chunk_size = chunk_size
+        self.aborted = False
+        self._queue = Queue(max_chunks)
+        self._buffer = []
+        self._size = 0
+        self._first = True
+
+    def _put(self, item):
+        while not self.aborted:
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except Full:
+                pass
+
+    def write(self, data):
+        if self.aborted:
+            raise IOError('The COPY output has been aborted by the reader.')
+
+        self._buffer.append(data)
+        self._size += len(data)
+        # The first row is handed over immediately
+        if self._size >= self.chunk_size or self._first:
+            self._first = False
+            self._put(b''.join(self._buffer))
+            self._buffer = []
+            self._size = 0
+
+    def close(self, error=None):
+        """
+        Flush the buffered data, and mark the end of the data (or an error).
+        """
+        if self._buffer:
+            self._put(b''.join(self._buffer))
+            self._buffer = []
+        self._put(error)
+
+    def abort(self):
+        self.aborted = True
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+class CopyOutResult(object):
+    """
+    class CopyOutResult
+
+        Iterable of the CSV data of COPY ... TO STDOUT. Closing it (as done
+        by the WSGI server once the response is finished, or the client has
+        disconnected, even before the iteration has started) stops the COPY,
+        and closes the cursor.
+    """
+
+    def __init__(self, data, stop):
+        self._data = data
+        self._stop = stop
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._data)
+
+    next = __next__
+
+    def close(self):
+        try:
+            self._data.close()
+        finally:
+            self._stop()
+
+
 class Connection(BaseConnection):
     """
     class Connection(object)
@@ -667,6 +771,66 @@ WHERE
         if self.async_ == 1:
             self._wait(cur.connection)
 
+    def __declare_download_cursor(self, cur, cursor_name, query, params):
+        """
+        Declare a server side cursor for the given query using the given
+        client cursor, so that the result can be fetched in batches.
+
+        A named psycopg2 cursor can not be created on an asynchronous
+        connection (as used by the query tool), hence - the cursor is
+        declared using SQL. A cursor (without hold) can only be used within
+        a transaction block, hence - a transaction is started, unless the
+        connection is already in one, in which case a savepoint is used to
+        restore it on failure.
+
+        Returns:
+            None, if the cursor could not be declared (i.e. the query is not
+            a single SELECT/VALUES statement), or whether the transaction was
+            started by this function
+        """
+        if not SERVER_CURSOR_QUERY_RE.match(query) or \
+                ';' in query.rstrip().rstrip(';'):
+            return None
+
+        txn_status = self.conn.get_transaction_status()
+        if txn_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            started_txn = True
+            self.__internal_blocking_execute(cur, u'BEGIN', None)
+        elif txn_status == psycopg2.extensions.TRANSACTION_STATUS_INTRANS:
+            started_txn = False
+            self.__internal_blocking_execute(
+                cur, u'SAVEPOINT {0}'.format(cursor_name), None
+            )
+        else:
+            return None
+
+        try:
+            self.__internal_blocking_execute(
+                cur, u'DECLARE {0} NO SCROLL CURSOR FOR {1}'.format(
+                    cursor_name, query.rstrip().rstrip(';')
+                ), params
+            )
+        except psycopg2.Error:
+            self.__end_download_cursor(cur, cursor_name, started_txn, False)
+            return None
+
+        return started_txn
+
+    def __end_download_cursor(self, cur, cursor_name, started_txn, success):
+        """
+        Close the server side cursor, and end the transaction (or the
+        savepoint) started for it.
+        """
+        if started_txn:
+            query = u'COMMIT' if success else u'ROLLBACK'
+        elif success:
+            query = u'CLOSE {0}; RELEASE SAVEPOINT {0}'.format(cursor_name)
+        else:
+            query = u'ROLLBACK TO SAVEPOINT {0}; ' \
+                u'RELEASE SAVEPOINT {0}'.format(cursor_name)
+
+        self.__internal_blocking_execute(cur, query, None)
+
     def execute_on_server_as_csv(self,
                                  query, params=None,
                                  formatted_exception_msg=False,
@@ -674,11 +838,16 @@ WHERE
         """
         To fetch query result and generate CSV output
 
+        The result of a single SELECT (or VALUES) statement is fetched in
+        batches from a server side cursor, so that it is never held in the
+        memory as a whole. Any other statement is executed using a client
+        side cursor.
+
         Args:
             query: SQL
             params: Additional parameters
             formatted_exception_msg: For exception
-            records: Number of initial records
+            records: Number of records to fetch in one batch
         Returns:
             Generator response
         """
@@ -688,6 +857,7 @@ WHERE
         if not status:
             return False, str(cur)
         query_id = random.randint(1, 9999999)
+        cursor_name = u'pgadmin_download_{0}'.format(query_id)
 
         current_app.logger.log(
             25,
@@ -700,9 +870,25 @@ WHERE
                 query_id=query_id
             )
         )
+
+        started_txn = None
         try:
-            self.__internal_blocking_execute(cur, query, params)
+            started_txn = self.__declare_download_cursor(
+                cur, cursor_name, query, params
+            )
+            if started_txn is None:
+                self.__internal_blocking_execute(cur, query, params)
+            else:
+                self.__internal_blocking_execute(
+                    cur, u'FETCH FORWARD {0} FROM {1}'.format(
+                        records, cursor_name
+                    ), None
+                )
         except psycopg2.Error as pe:
+            if started_txn is not None:
+                self.__end_download_cursor(
+                    cur, cursor_name, started_txn, False
+                )
             cur.close()
             errmsg = self._formatted_exception_msg(pe, formatted_exception_msg)
             current_app.logger.error(
@@ -724,6 +910,38 @@ WHERE
             return False, \
                 gettext('The query executed did not return any data.')
 
+        # The first batch has already been fetched from the server side
+        # cursor (to report the errors of the query).
+        first_batch = [True]
+
+        def fetch_results():
+            """
+            Returns the next batch of the records.
+            """
+            if started_txn is None:
+                return cur.fetchmany_2darray(records)
+
+            if first_batch[0]:
+                first_batch[0] = False
+            else:
+                self.__internal_blocking_execute(
+                    cur, u'FETCH FORWARD {0} FROM {1}'.format(
+                        records, cursor_name
+                    ), None
+                )
+            return cur.fetchall_2darray()
+
+        def close_cursor(success=True):
+            if cur.closed:
+                return
+            try:
+                if started_txn is not None:
+                    self.__end_download_cursor(
+                        cur, cursor_name, started_txn, success
+                    )
+            finally:
+                cur.close()
+
         def handle_json_data(json_columns, results):
             """
             [ This is only for Python2.x]
@@ -731,95 +949,46 @@ WHERE
             We will dump json data as proper json instead of unicode values
 
             Args:
-                json_columns: Columns which contains json data
-                results: Query result
+                json_columns: Positions of the columns with json data
+                results: Query result (2D array)
 
             Returns:
                 results
             """
             # Only if Python2 and there are columns with JSON type
             if IS_PY2 and len(json_columns) > 0:
-                temp_results = []
                 for row in results:
-                    res = dict()
-                    for k, v in row.items():
-                        if k in json_columns:
-                            res[k] = json.dumps(v)
-                        else:
-                            res[k] = v
-                    temp_results.append(res)
-                results = temp_results
-            return results
-
-        def convert_keys_to_unicode(results, conn_encoding):
-            """
-            [ This is only for Python2.x]
-            We need to convert all keys to unicode as psycopg2
-            sends them as string
-
-            Args:
-                res: Query result set from psycopg2
-                conn_encoding: Connection encoding
-
-            Returns:
-                Result set (With all the keys converted to unicode)
-            """
-            new_results = []
-            for row in results:
-                new_results.append(
-                    dict([(k.decode(conn_encoding), v)
-                          for k, v in row.items()])
-                )
-            return new_results
-
-        def handle_null_values(results, replace_nulls_with):
-            """
-            This function is used to replace null values with the given string
-
-            :param results:
-            :param replace_nulls_with: null values will be replaced by this
-            string.
-            :return: modified result
-            """
-
-            temp_results = []
-            for row in results:
-                res = dict()
-                for k, v in row.items():
-                    if v is None:
-                        res[k] = replace_nulls_with
-                    else:
-                        res[k] = v
-                temp_results.append(res)
-            results = temp_results
-
+                    for idx in json_columns:
+                        if row[idx] is not None:
+                            row[idx] = json.dumps(row[idx])
             return results
 
-        def gen(quote='strings', quote_char="'", field_separator=',',
-                replace_nulls_with=None):
+        def gen_csv(quote, quote_char, field_separator, replace_nulls_with):
 
-            results = cur.fetchmany(records)
+            results = fetch_results()
             if not results:
-                if not cur.closed:
-                    cur.close()
+                close_cursor()
                 yield gettext('The query executed did not return any data.')
                 return
 
             header = []
             json_columns = []
+            column_kinds = []
             conn_encoding = encodings[cur.connection.encoding]
 
-            for c in cur.ordered_description():
+            for idx, c in enumerate(cur.ordered_description()):
                 # This is to handle the case in which column name is non-ascii
                 column_name = c.to_dict()['name']
                 if IS_PY2:
                     column_name = column_name.decode(conn_encoding)
                 header.append(column_name)
-                if c.to_dict()['type_code'] in ALL_JSON_TYPES:
-                    json_columns.append(column_name)
-
-            if IS_PY2:
-                results = convert_keys_to_unicode(results, conn_encoding)
+                type_code = c.to_dict()['type_code']
+                if type_code in ALL_JSON_TYPES:
+                    json_columns.append(idx)
+                column_kinds.append(
+                    csv.NUMBER_COLUMN if type_code in NUMBER_DATATYPES
+                    else csv.TEXT_COLUMN
+                )
 
             res_io = StringIO()
 
@@ -843,50 +1012,239 @@ WHERE
                 except Exception as e:
                     current_app.logger.error(e)
 
-            csv_writer = csv.DictWriter(
-                res_io, fieldnames=header, delimiter=field_separator,
+            csv_writer = csv.writer(
+                res_io, delimiter=field_separator,
                 quoting=quote,
                 quotechar=quote_char,
                 replace_nulls_with=replace_nulls_with
             )
 
-            csv_writer.writeheader()
-            results = handle_json_data(json_columns, results)
-            # Replace the null values with given string if configured.
-            if replace_nulls_with is not None:
-                results = handle_null_values(results, replace_nulls_with)
-            csv_writer.writerows(results)
-
-            yield res_io.getvalue()
+            csv_writer.writerow(header)
 
-            while True:
-                results = cur.fetchmany(records)
-
-                if not results:
-                    if not cur.closed:
-                        cur.close()
-                    break
-                res_io = StringIO()
-
-                csv_writer = csv.DictWriter(
-                    res_io, fieldnames=header, delimiter=field_separator,
-                    quoting=quote,
-                    quotechar=quote_char,
-                    replace_nulls_with=replace_nulls_with
+            while results:
+                # The null values are replaced with the given string (if
+                # configured) by the writer.
+                csv_writer.writerows_block(
+                    handle_json_data(json_columns, results), column_kinds
                 )
+                yield res_io.getvalue()
 
-                if IS_PY2:
-                    results = convert_keys_to_unicode(results, conn_encoding)
+                res_io.seek(0)
+                res_io.truncate(0)
+                results = fetch_results()
 
-                results = handle_json_data(json_columns, results)
-                # Replace the null values with given string if configured.
-                if replace_nulls_with is not None:
-                    results = handle_null_values(results, replace_nulls_with)
-                csv_writer.writerows(results)
-                yield res_io.getvalue()
+            close_cursor()
+
+        def gen(quote='strings', quote_char="'", field_separator=',',
+                replace_nulls_with=None):
+            # Make sure the server side cursor is closed, and the
+            # transaction started for it is ended, even if the download is
+            # interrupted.
+            success = False
+            try:
+                for data in gen_csv(quote, quote_char, field_separator,
+                                    replace_nulls_with):
+                    yield data
+                success = True
+            finally:
+                close_cursor(success)
 
         return True, gen
 
+    def execute_on_server_as_copy_csv(self, query, quote='strings',
+                                      quote_char="'", field_separator=',',
+                                      replace_nulls_with=None,
+                                      formatted_exception_msg=False,
+                                      chunk_size=65536):
+        """
+        To generate the CSV output of the query result on the server using
+        COPY (query) TO STDOUT, and stream it as it is received.
+
+        Only a single SELECT/VALUES/TABLE/WITH statement can be wrapped in
+        COPY, and the connection must be synchronous (COPY is not supported
+        by psycopg2 on the asynchronous connections). The output is the same
+        as the CSV generated by execute_on_server_as_csv, i.e. the booleans
+        are output as True/False, and the lines are terminated by CRLF.
+
+        Args:
+            query: SQL
+            quote: 'strings', 'all' (or 'none', which is not supported)
+            quote_char: Quote character
+            field_separator: Field separator
+            replace_nulls_with: String to output for the null values
+            formatted_exception_msg: For exception
+            chunk_size: Approximate size of the chunks of the CSV data
+        Returns:
+            Iterable of the CSV data (to be closed once done with), or the
+            error message if the query can not be exported using COPY
+        """
+        stripped_query = query.rstrip().rstrip(';')
+        if self.async_ == 1 or quote not in ('strings', 'all') or \
+                self.python_encoding != 'utf-8' or \
+                not SERVER_CURSOR_QUERY_RE.match(query) or \
+                ';' in stripped_query:
+            return False, gettext('The query can not be exported using COPY.')
+
+        status, cur = self.__cursor()
+        if not status:
+            return False, str(cur)
+
+        query_id = random.randint(1, 9999999)
+        current_app.logger.log(
+            25,
+            u"Execute (with COPY) for server #{server_id} - "
+            u"{conn_id} (Query-id: {query_id}):\n{query}".format(
+                server_id=self.manager.sid,
+                conn_id=self.conn_id,
+                query=query,
+                query_id=query_id
+            )
+        )
+
+        # Find the columns of the result (this also validates the query,
+        # before anything is sent to the client).
+        try:
+            self.__internal_blocking_execute(
+                cur, u'SELECT * FROM ({0}\n) pgadmin_copy LIMIT 0'.format(
+                    stripped_query
+                ), None
+            )
+        except psycopg2.Error as pe:
+            cur.close()
+            return False, self._formatted_exception_msg(
+                pe, formatted_exception_msg
+            )
+
+        columns = [(c.name, c.type_code) for c in cur.description]
+        column_names = [name for name, _type in columns]
+        if len(set(column_names)) != len(column_names):
+            cur.close()
+            return False, gettext(
+                'The query result with the duplicate column names can not be '
+                'exported using COPY.'
+            )
+
+        options = [
+            u'FORMAT csv',
+            u'DELIMITER {0}'.format(adapt(field_separator).getquoted()
+                                    .decode(self.python_encoding)),
+            u'QUOTE {0}'.format(adapt(quote_char).getquoted()
+                                .decode(self.python_encoding)),
+            u'NULL {0}'.format(adapt(replace_nulls_with or u'').getquoted()
+                               .decode(self.python_encoding)),
+        ]
+        if quote == 'all':
+            options.append(u'FORCE_QUOTE *')
+        else:
+            # Quote the values of the non numeric columns
+            force_quote = [
+                psycopg2.extensions.quote_ident(name, cur)
+                for name, type_code in columns
+                if type_code not in NUMBER_DATATYPES
+            ]
+            if force_quote:
+                options.append(
+                    u'FORCE_QUOTE ({0})'.format(u', '.join(force_quote))
+                )
+
+        # The booleans are output as True/False by the Python writer
+        if any(type_code == BOOL_DATATYPE for _name, type_code in columns):
+            stripped_query = u'SELECT {0} FROM ({1}\n) pgadmin_copy'.format(
+                u', '.join(
+                    u"CASE WHEN {0} THEN 'True' WHEN NOT {0} THEN 'False' "
+                    u"END AS {0}".format(
+                        psycopg2.extensions.quote_ident(name, cur)
+                    ) if type_code == BOOL_DATATYPE else
+                    psycopg2.extensions.quote_ident(name, cur)
+                    for name, type_code in columns
+                ),
+                stripped_query
+            )
+
+        copy_sql = u'COPY ({0}\n) TO STDOUT WITH ({1})'.format(
+            stripped_query, u', '.join(options)
+        )
+
+        # The header is written by the same writer as used by the
+        # execute_on_server_as_csv.
+        res_io = StringIO()
+        csv.writer(
+            res_io, delimiter=field_separator,
+            quoting=csv.QUOTE_ALL if quote == 'all' else
+            csv.QUOTE_NONNUMERIC,
+            quotechar=quote_char, replace_nulls_with=replace_nulls_with
+        ).writerow(column_names)
+        header = res_io.getvalue()
+
+        stream = CopyOutStream(chunk_size)
+        conn = self.conn
+
+        def copy_out():
+            try:
+                cur.copy_expert(copy_sql, stream)
+                stream.close()
+            except Exception as e:
+                stream.close(e)
+
+        thread = Thread(target=copy_out)
+        thread.daemon = True
+        thread.start()
+
+        # Wait for the first row, so that the errors (raised by the execution
+        # of the query) can still be reported.
+        chunks = iter(stream)
+        try:
+            first_chunk = next(chunks, None)
+        except psycopg2.Error as pe:
+            thread.join()
+            cur.close()
+            return False, self._formatted_exception_msg(
+                pe, formatted_exception_msg
+            )
+
+        quote = quote_char.encode(self.python_encoding)
+
+        def crlf(data, in_quotes):
+            # The values containing a line feed are always quoted by COPY,
+            # hence - only the line feeds outside the quotes terminate the
+            # lines. A doubled quote toggles the state twice.
+            parts = data.split(quote)
+            for idx in range(1 if in_quotes else 0, len(parts), 2):
+                parts[idx] = parts[idx].replace(b'\n', b'\r\n')
+            return quote.join(parts), in_quotes != (len(parts) % 2 == 0)
+
+        def stop():
+            if thread.is_alive():
+                # The download has been interrupted, stop the COPY on the
+                # server.
+                stream.abort()
+                try:
+                    conn.cancel()
+                except psycopg2.Error:
+                    pass
+                thread.join()
+            if not cur.closed:
+                cur.close()
+
+        def gen():
+            try:
+                if first_chunk is None:
+                    yield gettext(
+                        'The query executed did not return any data.'
+                    ).encode(self.python_encoding)
+                    return
+
+                yield header.encode(self.python_encoding)
+                data, in_quotes = crlf(first_chunk, False)
+                yield data
+                for data in chunks:
+                    data, in_quotes = crlf(data, in_quotes)
+                    yield data
+            finally:
+                stop()
+
+        return True, CopyOutResult(gen(), stop)
+
     def execute_scalar(self, query, params=None,
                        formatted_exception_msg=False):
         status, cur = self.__cursor()
@@ -1325,22 +1683,18 @@ WHERE
             )
 
         if self.row_count > 0:
-            result = []
             # For DDL operation, we may not have result.
             #
             # Because - there is not direct way to differentiate DML and
             # DDL operations, we need to rely on exception to figure
             # that out at the moment.
             try:
+                # Rows are fetched as list of values in the order of the
+                # columns, hence - no need to look up each column by name.
                 if records == -1:
-                    res = cur.fetchall()
+                    result = cur.fetchall_2darray()
                 else:
-                    res = cur.fetchmany(records)
-                for row in res:
-                    new_row = []
-                    for col in self.column_info:
-                        new_row.append(row[col['name']])
-                    result.append(new_row)
+                    result = cur.fetchmany_2darray(records)
             except psycopg2.ProgrammingError as e:
                 result = None
         else:
@@ -1351,6 +1705,50 @@ WHERE
 
         return True, result
 
+    def async_fetch_2darray_chunks(self, records=2000):
+        """
+        User should poll and check if status is ASYNC_OK before calling this
+        function.
+
+        Returns a generator, which fetches the remaining rows of the result
+        (as 2 dimensional arrays) in the chunks of the given number of
+        records. Only one chunk is held in the memory at a time, hence - the
+        caller can send them to the client, as they are fetched.
+
+        Args:
+          records: no of records to fetch in each chunk.
+
+        Returns:
+            status, generator (or error message)
+        """
+        cur = self.__async_cursor
+        if not cur:
+            return False, gettext(
+                "Cursor could not be found for the async connection."
+            )
+
+        if self.conn.isexecuting():
+            return False, gettext(
+                "Asynchronous query execution/operation underway."
+            )
+
+        def gen():
+            # User performed operation which dose not produce record/s as
+            # result. (i.e. DDL operations)
+            if self.row_count <= 0:
+                return
+
+            while True:
+                try:
+                    result = cur.fetchmany_2darray(records)
+                except psycopg2.ProgrammingError:
+                    return
+                if not result:
+                    return
+                yield result
+
+        return True, gen()
+
     def connected(self):
         if self.conn:
             if not self.conn.closed:
@@ -1463,47 +1861,67 @@ Failed to reset the connection to the server due to following error:
                 raise psycopg2.OperationalError(
                     "poll() returned %s from _wait function" % state)
 
-    def _wait_timeout(self, conn):
+    def _wait_timeout(self, conn, timeout=None):
         """
         This function is used for the asynchronous connection,
         it will call poll method and return the status. If state is
         psycopg2.extensions.POLL_WRITE and psycopg2.extensions.POLL_READ
         function will wait for the given timeout.This is not a blocking call.
 
+        When the timeout is given (long polling), it waits until the query
+        has finished, or the notices/notifications have been received, or
+        the timeout is reached.
+
         Args:
             conn: connection object
-            time: wait time
+            timeout: maximum wait time (in seconds)
         """
+        if timeout is not None:
+            deadline = time.time() + timeout
+            num_notices = len(conn.notices)
+            num_notifies = len(conn.notifies)
 
         while 1:
             state = conn.poll()
 
             if state == psycopg2.extensions.POLL_OK:
                 return self.ASYNC_OK
-            elif state == psycopg2.extensions.POLL_WRITE:
-                # Wait for the given time and then check the return status
-                # If three empty lists are returned then the time-out is
-                # reached.
-                timeout_status = select.select(
-                    [], [conn.fileno()], [], self.ASYNC_TIMEOUT
-                )
-                if timeout_status == ([], [], []):
-                    return self.ASYNC_WRITE_TIMEOUT
-            elif state == psycopg2.extensions.POLL_READ:
-                # Wait for the given time and then check the return status
-                # If three empty lists are returned then the time-out is
-                # reached.
-                timeout_status = select.select(
-                    [conn.fileno()], [], [], self.ASYNC_TIMEOUT
-                )
-                if timeout_status == ([], [], []):
-                    return self.ASYNC_READ_TIMEOUT
-            else:
+            elif state not in (psycopg2.extensions.POLL_WRITE,
+                               psycopg2.extensions.POLL_READ):
                 raise psycopg2.OperationalError(
                     "poll() returned %s from _wait_timeout function" % state
                 )
 
-    def poll(self, formatted_exception_msg=False, no_result=False):
+            timeout_status = self.ASYNC_WRITE_TIMEOUT \
+                if state == psycopg2.extensions.POLL_WRITE \
+                else self.ASYNC_READ_TIMEOUT
+            wait_time = self.ASYNC_TIMEOUT
+
+            if timeout is not None:
+                # Let the client show the notices/notifications received
+                # while the query is running.
+                if len(conn.notices) != num_notices or \
+                        len(conn.notifies) != num_notifies:
+                    return timeout_status
+
+                wait_time = deadline - time.time()
+                if wait_time <= 0:
+                    return timeout_status
+
+            # Wait for the given time and then check the return status
+            # If three empty lists are returned then the time-out is
+            # reached.
+            if state == psycopg2.extensions.POLL_WRITE:
+                ready = select.select([], [conn.fileno()], [], wait_time)
+            else:
+                ready = select.select([conn.fileno()], [], [], wait_time)
+
+            if ready == ([], [], []):
+                if timeout is None or time.time() >= deadline:
+                    return timeout_status
+
+    def poll(self, formatted_exception_msg=False, no_result=False,
+             timeout=None):
         """
         This function is a wrapper around connection's poll function.
         It internally uses the _wait_timeout method to poll the
@@ -1514,6 +1932,8 @@ Failed to reset the connection to the server due to following error:
             formatted_exception_msg: if True then function return the formatted
                                      exception message, otherwise error string.
             no_result: If True then only poll status will be returned.
+            timeout: If given, wait for the result of the query up to the
+                     given time (in seconds).
         """
 
         cur = self.__async_cursor
@@ -1531,7 +1951,7 @@ Failed to reset the connection to the server due to following error:
 
         is_error = False
         try:
-            status = self._wait_timeout(self.conn)
+            status = self._wait_timeout(self.conn, timeout)
         except psycopg2.Error as pe:
             if self.conn.closed:
                 raise ConnectionLost(
@@ -1581,18 +2001,13 @@ Failed to reset the connection to the server due to following error:
             self.row_count = cur.rowcount
             if not no_result:
                 if cur.rowcount > 0:
-                    result = []
                     # For DDL operation, we may not have result.
                     #
                     # Because - there is not direct way to differentiate DML
                     # and DDL operations, we need to rely on exception to
                     # figure that out at the moment.
                     try:
-                        for row in cur:
-                            new_row = []
-                            for col in self.column_info:
-                                new_row.append(row[col['name']])
-                            result.append(new_row)
+                        result = cur.fetchall_2darray()
 
                     except psycopg2.ProgrammingError:
                         result = None
@@ -138,6 +138,10 @@ class DictCursor(_cursor):
     * _ordered_description()
     - Generates the _WrapperColumn object from the description column, and
       identifies duplicate column name
+
+    * fetchmany_2darray(size), fetchall_2darray()
+    - Fetch the rows as list of lists (2D array) without generating the
+      dictionary for each of them
     """
 
     def __init__(self, *args, **kwargs):
@@ -232,6 +236,26 @@ class DictCursor(_cursor):
         if tuples is not None:
             return [self._dict_tuple(t) for t in tuples]
 
+    def fetchmany_2darray(self, size=None):
+        """
+        Fetch many tuples as list of lists (2D array), in the order of the
+        columns in the description. It does not generate a dictionary for
+        each row, hence - the duplicate column names do not matter here.
+        """
+        tuples = _cursor.fetchmany(self, size)
+        if tuples is not None:
+            return [list(t) for t in tuples]
+        return None
+
+    def fetchall_2darray(self):
+        """
+        Fetch all tuples as list of lists (2D array), in the order of the
+        columns in the description.
+        """
+        tuples = _cursor.fetchall(self)
+        if tuples is not None:
+            return [list(t) for t in tuples]
+
     def __iter__(self):
         it = _cursor.__iter__(self)
         try:
@@ -103,6 +103,15 @@ ALL_JSON_TYPES = PSYCOPG_SUPPORTED_JSON_TYPES +\
     PSYCOPG_SUPPORTED_JSON_ARRAY_TYPES
 
 
+# OIDs of data types, which are typecast to python numbers (i.e. the
+# others are not numeric for the CSV output, as they are typecast to string).
+# bool, smallint, integer, oid
+NUMBER_DATATYPES = (16, 21, 23, 26)
+
+# OID of the bool data type
+BOOL_DATATYPE = 16
+
+
 # INET[], CIDR[]
 # OID reference psycopg2/lib/_ipaddress.py
 PSYCOPG_SUPPORTED_IPADDRESS_ARRAY_TYPES = (1041, 651)
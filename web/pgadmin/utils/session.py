@@ -21,19 +21,20 @@ import hmac
 import hashlib
 import os
 import random
+import sqlite3
 import string
 import time
 import config
 from uuid import uuid4
-from threading import Lock
+from threading import Lock, local
 from flask import current_app, request, flash, redirect
 from flask_login import login_url
 from pgadmin.utils.ajax import make_json_response
 
 try:
-    from cPickle import dump, load
+    from cPickle import dump, dumps, load, loads
 except ImportError:
-    from pickle import dump, load
+    from pickle import dump, dumps, load, loads
 
 try:
     from collections import OrderedDict
@@ -285,6 +286,175 @@ class FileBackedSessionManager(SessionManager):
             )
 
 
+class SQLiteSessionManager(SessionManager):
+    """
+    Stores the sessions in a single SQLite database, which can be shared by
+    multiple (worker) processes.
+
+    The recently used sessions are kept in a bounded LRU cache, which is
+    validated against the version of the session stored in the database (an
+    indexed lookup), hence - a session updated by another process is never
+    served stale. A session is written back only when its data has changed,
+    or to extend its expiry time, and the expired sessions are removed using
+    an index on the expiry time.
+    """
+
+    def __init__(self, path, secret, lifetime, num_to_store, skip_paths=[]):
+        self.path = path
+        self.secret = secret
+        self.lifetime = lifetime
+        self.num_to_store = num_to_store
+        self.skip_paths = skip_paths
+        # sid -> (version, session, checksum, last write time)
+        self._cache = OrderedDict()
+        self._lock = Lock()
+        self._local = local()
+
+        dirname = os.path.dirname(self.path)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS session ('
+            'sid TEXT PRIMARY KEY, version TEXT NOT NULL, randval TEXT, '
+            'hmac_digest TEXT, data BLOB, expires REAL NOT NULL)'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS session_expires ON session (expires)'
+        )
+
+    def _connection(self):
+        # SQLite connections can not be shared among the threads, or the
+        # processes forked after creating them.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _skip_path(self):
+        for sp in self.skip_paths:
+            if request.path.startswith(sp):
+                return True
+        return False
+
+    def _cache_session(self, sid, entry):
+        with self._lock:
+            self._cache.pop(sid, None)
+            self._cache[sid] = entry
+            while len(self._cache) > self.num_to_store:
+                self._cache.popitem(False)
+
+    def _version(self, sid):
+        row = self._connection().execute(
+            'SELECT version FROM session WHERE sid = ? AND expires > ?',
+            (sid, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def exists(self, sid):
+        return self._version(sid) is not None
+
+    def remove(self, sid):
+        with self._lock:
+            self._cache.pop(sid, None)
+        self._connection().execute(
+            'DELETE FROM session WHERE sid = ?', (sid,)
+        )
+
+    def new_session(self):
+        return ManagedSession(sid=str(uuid4()))
+
+    def get(self, sid, digest):
+        'Retrieve a managed session by session-id, checking the HMAC digest'
+        version = self._version(sid)
+        if version is None:
+            return self.new_session()
+
+        with self._lock:
+            entry = self._cache.get(sid)
+
+        if entry is not None and entry[0] == version:
+            session = entry[1]
+        else:
+            row = self._connection().execute(
+                'SELECT version, randval, hmac_digest, data FROM session '
+                'WHERE sid = ?', (sid,)
+            ).fetchone()
+            if not row:
+                return self.new_session()
+
+            blob = bytes(row[3])
+            try:
+                data = loads(blob)
+            except Exception:
+                return self.new_session()
+
+            session = ManagedSession(
+                data, sid=sid, randval=row[1], hmac_digest=row[2]
+            )
+            if not self._skip_path():
+                self._cache_session(sid, (
+                    row[0], session, hashlib.sha1(blob).digest(), time.time()
+                ))
+
+        if session.hmac_digest != digest:
+            return self.new_session()
+
+        return session
+
+    def put(self, session):
+        """Store a managed session"""
+        if not session.hmac_digest:
+            session.sign(self.secret)
+
+        # Do not store the session if skip paths
+        if self._skip_path():
+            return
+
+        data = dumps(dict(session), -1)
+        checksum = hashlib.sha1(data).digest()
+        current_time = time.time()
+
+        with self._lock:
+            entry = self._cache.get(session.sid)
+
+        # Coalesce the writes of an unchanged session, unless its expiry
+        # time needs to be extended.
+        if entry is not None and entry[2] == checksum and \
+                not session.force_write and \
+                current_time - entry[3] < self.lifetime * 0.1:
+            return
+
+        # Same as the session files, keep the session for one more day after
+        # its lifetime.
+        version = uuid4().hex
+        self._connection().execute(
+            'INSERT OR REPLACE INTO session '
+            '(sid, version, randval, hmac_digest, data, expires) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (session.sid, version, session.randval, session.hmac_digest,
+             sqlite3.Binary(data), current_time + self.lifetime + 86400)
+        )
+        session.last_write = current_time
+        session.force_write = False
+
+        self._cache_session(
+            session.sid, (version, session, checksum, current_time)
+        )
+
+    def cleanup(self):
+        """Remove the expired sessions"""
+        self._connection().execute(
+            'DELETE FROM session WHERE expires <= ?', (time.time(),)
+        )
+
+
 class ManagedSessionInterface(SessionInterface):
     def __init__(self, manager):
         self.manager = manager
@@ -328,6 +498,16 @@ class ManagedSessionInterface(SessionInterface):
 
 
 def create_session_interface(app, skip_paths=[]):
+    if app.config.get('SESSION_STORE', 'file') == 'sqlite':
+        return ManagedSessionInterface(
+            SQLiteSessionManager(
+                os.path.join(app.config['SESSION_DB_PATH'], 'sessions.db'),
+                app.config['SECRET_KEY'],
+                app.permanent_session_lifetime.total_seconds(),
+                1000,
+                skip_paths
+            ))
+
     return ManagedSessionInterface(
         CachingSessionManager(
             FileBackedSessionManager(
@@ -392,6 +572,13 @@ def cleanup_session_files():
             LAST_CHECK_SESSION_FILES = datetime.datetime.now()
 
     if iterate_session_files:
+        # Expired sessions are removed by the session manager itself (if
+        # supported), instead of iterating through the session files.
+        manager = getattr(current_app.session_interface, 'manager', None)
+        if hasattr(manager, 'cleanup'):
+            manager.cleanup()
+            return
+
         for root, dirs, files in os.walk(
                 current_app.config['SESSION_DB_PATH']):
             for file_name in files:
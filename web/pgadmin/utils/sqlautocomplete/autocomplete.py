@@ -12,6 +12,7 @@
 import re
 import operator
 import sys
+import time
 from itertools import count, repeat, chain
 from .completion import Completion
 from collections import namedtuple, defaultdict, OrderedDict
@@ -23,6 +24,8 @@ from .parseutils.meta import FunctionMetadata, ColumnMetadata, ForeignKey
 from .parseutils.utils import last_word
 from .parseutils.tables import TableReference
 from .prioritization import PrevalenceCounter
+from .metadata_cache import autocomplete_cache
+from .matchindex import FuzzyMatchIndex, fuzzy_pattern
 from flask import render_template
 from pgadmin.utils.driver import get_driver
 from config import PG_DEFAULT_DRIVER
@@ -95,6 +98,7 @@ class SQLAutoComplete(object):
         """
 
         self.sid = kwargs['sid'] if 'sid' in kwargs else None
+        self.did = kwargs['did'] if 'did' in kwargs else None
         self.conn = kwargs['conn'] if 'conn' in kwargs else None
         self.keywords = []
         self.databases = []
@@ -102,6 +106,11 @@ class SQLAutoComplete(object):
         self.datatypes = []
         self.dbmetadata = {'tables': {}, 'views': {}, 'functions': {},
                            'datatypes': {}}
+        self.fetched_schemas = {'tables': set(), 'views': set(),
+                                'functions': set(), 'datatypes': set()}
+        self._arg_list_cache = {}
+        self.catalog_signatures = {}
+        self.fuzzy_index = FuzzyMatchIndex()
         self.text_before_cursor = None
         self.name_pattern = re.compile("^[_a-z][_a-z0-9\$]*$")
 
@@ -112,6 +121,10 @@ class SQLAutoComplete(object):
 
         self.search_path = []
         schema_names = []
+        pref = Preferences.module('sqleditor')
+        keywords_in_uppercase = \
+            pref.preference('keywords_in_uppercase').get()
+
         if self.conn.connected():
             # Fetch the search path
             query = render_template(
@@ -121,42 +134,60 @@ class SQLAutoComplete(object):
                 for record in res['rows']:
                     self.search_path.append(record['schema'])
 
-            # Fetch the schema names
-            query = render_template("/".join([self.sql_path, 'schema.sql']))
-            status, res = self.conn.execute_dict(query)
-            if status:
-                for record in res['rows']:
-                    schema_names.append(record['schema'])
-
-            pref = Preferences.module('sqleditor')
-            keywords_in_uppercase = \
-                pref.preference('keywords_in_uppercase').get()
+        # Reuse the metadata already fetched for this server, database and
+        # search_path (if any).
+        self.cache_key = autocomplete_cache.make_key(
+            self.sid, self.did, self.search_path, keywords_in_uppercase
+        )
+        self.cache_entry = autocomplete_cache.get(self.cache_key)
 
-            # Fetch the keywords
-            query = render_template("/".join([self.sql_path, 'keywords.sql']))
-            # If setting 'Keywords in uppercase' is set to True in
-            # Preferences then fetch the keywords in upper case.
-            if keywords_in_uppercase:
+        if self.cache_entry is not None:
+            self._load_state(self.cache_entry.state)
+        else:
+            if self.conn.connected():
+                # Fetch the schema names
                 query = render_template(
-                    "/".join([self.sql_path, 'keywords.sql']), upper_case=True)
-            status, res = self.conn.execute_dict(query)
-            if status:
-                for record in res['rows']:
-                    # 'public' is a keyword in EPAS database server. Don't add
-                    # this into the list of keywords.
-                    # This is a hack to fix the issue in autocomplete.
-                    if record['word'].lower() == 'public':
-                        continue
-                    self.keywords.append(record['word'])
-
-        self.prioritizer = PrevalenceCounter(self.keywords)
-
-        self.reserved_words = set()
-        for x in self.keywords:
-            self.reserved_words.update(x.split())
+                    "/".join([self.sql_path, 'schema.sql']))
+                status, res = self.conn.execute_dict(query)
+                if status:
+                    for record in res['rows']:
+                        schema_names.append(record['schema'])
 
-        self.all_completions = set(self.keywords)
-        self.extend_schemata(schema_names)
+                # Fetch the keywords
+                query = render_template(
+                    "/".join([self.sql_path, 'keywords.sql']))
+                # If setting 'Keywords in uppercase' is set to True in
+                # Preferences then fetch the keywords in upper case.
+                if keywords_in_uppercase:
+                    query = render_template(
+                        "/".join([self.sql_path, 'keywords.sql']),
+                        upper_case=True)
+                status, res = self.conn.execute_dict(query)
+                if status:
+                    for record in res['rows']:
+                        # 'public' is a keyword in EPAS database server.
+                        # Don't add this into the list of keywords.
+                        # This is a hack to fix the issue in autocomplete.
+                        if record['word'].lower() == 'public':
+                            continue
+                        self.keywords.append(record['word'])
+
+            self.prioritizer = PrevalenceCounter(self.keywords)
+
+            self.reserved_words = set()
+            for x in self.keywords:
+                self.reserved_words.update(x.split())
+
+            self.all_completions = set(self.keywords)
+            self.extend_schemata(schema_names)
+
+            # Do not cache the incomplete metadata, when we could not talk to
+            # the database server.
+            if self.conn.connected():
+                self.cache_entry = autocomplete_cache.put(
+                    self.cache_key, self._dump_state()
+                )
+                self._record_catalog_signatures([], None)
 
         # Below are the configurable options in pgcli which we don't have
         # in pgAdmin4 at the moment. Setting the default value from the pgcli's
@@ -173,6 +204,186 @@ class SQLAutoComplete(object):
         self.qualify_columns = 'if_more_than_one_table'
         self.asterisk_column_order = 'table_order'
 
+        # Forget the cached objects changed since they were fetched.
+        self._refresh_changed_objects()
+
+    # Attributes shared through the metadata cache between the
+    # SQLAutoComplete objects for the same server, database and search_path.
+    _cached_attributes = (
+        'keywords', 'prioritizer', 'reserved_words', 'all_completions',
+        'dbmetadata', 'fetched_schemas', '_arg_list_cache',
+        'catalog_signatures', 'fuzzy_index'
+    )
+
+    def _dump_state(self):
+        return dict(
+            (attr, getattr(self, attr)) for attr in self._cached_attributes
+        )
+
+    def _load_state(self, state):
+        for attr in self._cached_attributes:
+            setattr(self, attr, state[attr])
+
+    def _schemas_to_fetch(self, schema, obj_type):
+        """
+        Returns the list of schemas, for which the objects of the given type
+        have not been fetched yet.
+
+        :param schema is the schema qualification input by the user (if any)
+
+        """
+        schemas = [schema] if schema else self.search_path
+        fetched = self.fetched_schemas[obj_type]
+        return [sch for sch in schemas if sch not in fetched]
+
+    def _mark_as_fetched(self, schemas, obj_type):
+        self.fetched_schemas[obj_type].update(schemas)
+        self._update_cache_entry()
+
+    def _update_cache_entry(self):
+        if self.cache_entry is not None:
+            # Some of the attributes are replaced (not modified in-place)
+            # while extending the metadata.
+            self.cache_entry.state.update(self._dump_state())
+
+    def _fetch_catalog_signatures(self, schemas):
+        """
+        Fetch the signature of the catalog objects in the given schemas, and
+        of the list of schemas.
+
+        :return: {(schema_name, object_type): signature}, or None on error
+
+        """
+        query = render_template(
+            "/".join([self.sql_path, 'catalog_signature.sql']),
+            schema_names=self._in_clause(schemas))
+        status, res = self.conn.execute_dict(query)
+        if not status:
+            return None
+
+        signatures = dict()
+        for row in res['rows']:
+            key = (row['schema_name'], row['object_type'])
+            signatures[key] = signatures.get(key, '') + row['signature'] + ';'
+        return signatures
+
+    def _record_catalog_signatures(self, schemas, obj_type):
+        """
+        Record the signature of the catalog objects of the given type, before
+        they are fetched for the cache. The signature of the list of schemas
+        is recorded only once, when the metadata is cached first.
+        """
+        if self.cache_entry is None:
+            return
+
+        signatures = self._fetch_catalog_signatures(schemas)
+        if signatures is None:
+            return
+
+        for sch in schemas:
+            self.catalog_signatures[(sch, obj_type)] = \
+                signatures.get((sch, obj_type))
+
+        key = (None, 'schemas')
+        if key not in self.catalog_signatures:
+            self.catalog_signatures[key] = signatures.get(key)
+
+    def _refresh_changed_objects(self):
+        """
+        Compare the signature of the catalog with the one recorded, when the
+        metadata was cached, and forget the objects of the changed schemas.
+        Those will be fetched again, only when required.
+        """
+        entry = self.cache_entry
+        if entry is None or not self.conn.connected() or \
+                not entry.needs_check(autocomplete_cache.check_interval):
+            return
+
+        with entry.lock:
+            entry.checked_at = time.time()
+
+            schemas = set()
+            for fetched in self.fetched_schemas.values():
+                schemas.update(fetched)
+
+            signatures = self._fetch_catalog_signatures(sorted(schemas))
+            if signatures is None:
+                return
+
+            key = (None, 'schemas')
+            if signatures.get(key) != self.catalog_signatures.get(key):
+                if self._refresh_schemata():
+                    self.catalog_signatures[key] = signatures.get(key)
+
+            for obj_type, fetched in self.fetched_schemas.items():
+                for sch in list(fetched):
+                    key = (sch, obj_type)
+                    if signatures.get(key) != \
+                            self.catalog_signatures.get(key):
+                        self._forget_schema_objects(sch, obj_type)
+
+            self._update_cache_entry()
+
+    def _refresh_schemata(self):
+        """
+        Add the newly created schemas, and forget the dropped (or renamed)
+        ones.
+        """
+        query = render_template("/".join([self.sql_path, 'schema.sql']))
+        status, res = self.conn.execute_dict(query)
+        if not status:
+            return False
+
+        schema_names = [record['schema'] for record in res['rows']]
+        escaped = set(self.escaped_names(schema_names))
+
+        for obj_type, fetched in self.fetched_schemas.items():
+            for sch in list(fetched):
+                if self.escape_name(sch) not in escaped:
+                    self._forget_schema_objects(sch, obj_type)
+
+        for metadata in self.dbmetadata.values():
+            for sch in list(metadata.keys()):
+                if sch not in escaped:
+                    del metadata[sch]
+
+        self.extend_schemata([
+            sch for sch in schema_names
+            if self.escape_name(sch) not in self.dbmetadata['tables']
+        ])
+        return True
+
+    def _forget_schema_objects(self, schema, obj_type):
+        """
+        Remove the objects of the given type in the given schema from the
+        metadata, so that those are fetched again when required.
+        """
+        metadata = self.dbmetadata[obj_type]
+        escaped = self.escape_name(schema)
+        if escaped in metadata:
+            metadata[escaped] = {}
+
+        self.fetched_schemas[obj_type].discard(schema)
+        self.catalog_signatures.pop((schema, obj_type), None)
+
+        if obj_type == 'tables':
+            # The foreign keys from/to the tables of this schema will be
+            # added again, when the tables are fetched again.
+            for tables in metadata.values():
+                for columns in tables.values():
+                    for col in columns.values():
+                        col.foreignkeys[:] = [
+                            fk for fk in col.foreignkeys
+                            if escaped not in (fk.parentschema,
+                                               fk.childschema)
+                        ]
+        elif obj_type == 'functions':
+            self._refresh_arg_list_cache()
+
+    @staticmethod
+    def _in_clause(schemas):
+        return ','.join('\'' + sch + '\'' for sch in schemas)
+
     def escape_name(self, name):
         if name and (
             (not self.name_pattern.match(name)) or
@@ -416,8 +627,13 @@ class SQLAutoComplete(object):
         # Note: higher priority values mean more important, so use negative
         # signs to flip the direction of the tuple
         if fuzzy:
-            regex = '.*?'.join(map(re.escape, text))
-            pat = re.compile('(%s)' % regex)
+            pat = fuzzy_pattern(text)
+            # Matches of the known names are looked up in the index, only the
+            # other items (e.g. aliases, join conditions) are matched with the
+            # regular expression. Each item of the collection (built for each
+            # request) is still looked at, but not matched again.
+            index = self._get_fuzzy_index()
+            indexed = index.search(text)
 
             def _match(item):
                 if item.lower()[:len(text) + 1] in (text, text + ' '):
@@ -426,6 +642,8 @@ class SQLAutoComplete(object):
                     # E.g. for input `e`, 'Entries E' should be on top
                     # (before e.g. `EndUsers EU`)
                     return float('Infinity'), -1
+                if item in index:
+                    return indexed.get(item)
                 r = pat.search(self.unescape_name(item.lower()))
                 if r:
                     return -len(r.group()), -r.start()
@@ -494,6 +712,19 @@ class SQLAutoComplete(object):
                 )
         return matches
 
+    def _get_fuzzy_index(self):
+        """
+        Returns the index of all the known names, after adding the names
+        fetched since it was last used.
+        """
+        if self.cache_entry is None:
+            # Not worth building the index for a single request
+            return FuzzyMatchIndex()
+
+        if len(self.fuzzy_index) < len(self.all_completions):
+            self.fuzzy_index.update(self.all_completions)
+        return self.fuzzy_index
+
     def get_completions(self, text, text_before_cursor):
         self.text_before_cursor = text_before_cursor
 
@@ -1061,20 +1292,27 @@ class SQLAutoComplete(object):
     def fetch_schema_objects(self, schema, obj_type):
         """
         This function is used to fetch schema objects like tables, views, etc..
+        The objects already fetched (and cached) for a schema are not fetched
+        again.
         :return:
         """
-        in_clause = ''
+        if self.cache_entry is None:
+            self._fetch_schema_objects(schema, obj_type)
+            return
+
+        with self.cache_entry.lock:
+            self._fetch_schema_objects(schema, obj_type)
+
+    def _fetch_schema_objects(self, schema, obj_type):
         query = ''
         data = []
 
-        if schema:
-            in_clause = '\'' + schema + '\''
-        else:
-            for r in self.search_path:
-                in_clause += '\'' + r + '\','
-            # Remove extra comma
-            if len(in_clause) > 0:
-                in_clause = in_clause[:-1]
+        schemas = self._schemas_to_fetch(schema, obj_type)
+        if len(schemas) == 0 or not self.conn.connected():
+            return
+
+        self._record_catalog_signatures(schemas, obj_type)
+        in_clause = self._in_clause(schemas)
 
         if obj_type == 'tables':
             query = render_template("/".join([self.sql_path, 'tableview.sql']),
@@ -1088,13 +1326,14 @@ class SQLAutoComplete(object):
             query = render_template("/".join([self.sql_path, 'datatypes.sql']),
                                     schema_names=in_clause)
 
-        if self.conn.connected():
-            status, res = self.conn.execute_dict(query)
-            if status:
-                for record in res['rows']:
-                    data.append(
-                        (record['schema_name'], record['object_name'])
-                    )
+        status, res = self.conn.execute_dict(query)
+        if not status:
+            return
+
+        for record in res['rows']:
+            data.append(
+                (record['schema_name'], record['object_name'])
+            )
 
         if (obj_type == 'tables' or obj_type == 'views') and len(data) > 0:
             self.extend_relations(data, obj_type)
@@ -1108,55 +1347,65 @@ class SQLAutoComplete(object):
         elif obj_type == 'datatypes' and len(data) > 0:
             self.extend_datatypes(data)
 
+        self._mark_as_fetched(schemas, obj_type)
+
     def fetch_functions(self, schema):
         """
         This function is used to fecth the list of functions.
+        The functions already fetched (and cached) for a schema are not
+        fetched again.
         :param schema:
         :return:
         """
-        in_clause = ''
+        if self.cache_entry is None:
+            self._fetch_functions(schema)
+            return
+
+        with self.cache_entry.lock:
+            self._fetch_functions(schema)
+
+    def _fetch_functions(self, schema):
         data = []
 
-        if schema:
-            in_clause = '\'' + schema + '\''
-        else:
-            for r in self.search_path:
-                in_clause += '\'' + r + '\','
-            # Remove extra comma
-            if len(in_clause) > 0:
-                in_clause = in_clause[:-1]
+        schemas = self._schemas_to_fetch(schema, 'functions')
+        if len(schemas) == 0 or not self.conn.connected():
+            return
 
+        self._record_catalog_signatures(schemas, 'functions')
         query = render_template("/".join([self.sql_path, 'functions.sql']),
-                                schema_names=in_clause)
-
-        if self.conn.connected():
-            status, res = self.conn.execute_dict(query)
-            if status:
-                for row in res['rows']:
-                    data.append(FunctionMetadata(
-                        row['schema_name'],
-                        row['func_name'],
-                        row['arg_names'].strip('{}').split(',')
-                        if row['arg_names'] is not None
-                        else row['arg_names'],
-                        row['arg_types'].strip('{}').split(',')
-                        if row['arg_types'] is not None
-                        else row['arg_types'],
-                        row['arg_modes'].strip('{}').split(',')
-                        if row['arg_modes'] is not None
-                        else row['arg_modes'],
-                        row['return_type'],
-                        row['is_aggregate'],
-                        row['is_window'],
-                        row['is_set_returning'],
-                        row['arg_defaults'].strip('{}').split(',')
-                        if row['arg_defaults'] is not None
-                        else row['arg_defaults']
-                    ))
+                                schema_names=self._in_clause(schemas))
+
+        status, res = self.conn.execute_dict(query)
+        if not status:
+            return
+
+        for row in res['rows']:
+            data.append(FunctionMetadata(
+                row['schema_name'],
+                row['func_name'],
+                row['arg_names'].strip('{}').split(',')
+                if row['arg_names'] is not None
+                else row['arg_names'],
+                row['arg_types'].strip('{}').split(',')
+                if row['arg_types'] is not None
+                else row['arg_types'],
+                row['arg_modes'].strip('{}').split(',')
+                if row['arg_modes'] is not None
+                else row['arg_modes'],
+                row['return_type'],
+                row['is_aggregate'],
+                row['is_window'],
+                row['is_set_returning'],
+                row['arg_defaults'].strip('{}').split(',')
+                if row['arg_defaults'] is not None
+                else row['arg_defaults']
+            ))
 
         if len(data) > 0:
             self.extend_functions(data)
 
+        self._mark_as_fetched(schemas, 'functions')
+
     def fetch_columns(self, schemas, obj_type):
         """
         This function is used to fetch the columns for the given schema name
@@ -0,0 +1,154 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Index over the names known to the SQL auto complete feature, used for the
+fuzzy matching of the text typed by the user.
+"""
+
+import re
+from threading import Lock
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+
+
+def unescape_name(name):
+    """ Unquote a string."""
+    if name and name[0] == '"' and name[-1] == '"':
+        name = name[1:-1]
+
+    return name
+
+
+def fuzzy_pattern(text):
+    """
+    Returns the compiled regular expression used for the fuzzy matching of
+    the given (lowercase) text.
+    """
+    return re.compile('(%s)' % '.*?'.join(map(re.escape, text)))
+
+
+class FuzzyMatchIndex(object):
+    """
+    class FuzzyMatchIndex
+
+        Index of the names (tables, columns, functions, etc) fetched for the
+        auto complete, which returns the fuzzy matches of a text without
+        matching it against each of the names.
+
+        Every name, matching a text, contains all of its characters, hence -
+        only the names present in the posting lists of all these characters
+        are matched. As the user types, the matches of the text typed so far
+        are remembered, and the matches of the extended text are searched
+        only among them.
+
+        The sort key of a match is same as computed by
+        SQLAutoComplete.find_matches, i.e. the negative length and the
+        negative start position of the matched characters.
+    """
+
+    def __init__(self, names=None, max_results=32):
+        self.max_results = max_results
+        self._names = []
+        self._lowered = []
+        self._ids = dict()
+        self._postings = dict()
+        self._results = OrderedDict()
+        self._lock = Lock()
+
+        if names:
+            self.update(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def update(self, names):
+        """
+        Add the given names to the index (if not already present).
+        """
+        with self._lock:
+            added = False
+            for name in names:
+                if name in self._ids:
+                    continue
+
+                idx = len(self._names)
+                lowered = unescape_name(name.lower())
+                self._ids[name] = idx
+                self._names.append(name)
+                self._lowered.append(lowered)
+
+                for char in set(lowered):
+                    posting = self._postings.get(char)
+                    if posting is None:
+                        posting = self._postings[char] = set()
+                    posting.add(idx)
+                added = True
+
+            if added:
+                # Remembered results do not contain the new names.
+                self._results.clear()
+
+    def search(self, text):
+        """
+        Find the names matching the given (lowercase) text.
+
+        Returns:
+            dict of the matching names, and their sort keys
+        """
+        with self._lock:
+            result = self._results.pop(text, None)
+            if result is None:
+                result = self._search(text)
+
+            self._results[text] = result
+            while len(self._results) > self.max_results:
+                self._results.popitem(False)
+
+        return result
+
+    def _candidates(self, text):
+        # Matches of the text typed so far (if remembered)
+        for length in range(len(text) - 1, 0, -1):
+            previous = self._results.get(text[:length])
+            if previous is not None:
+                return (self._ids[name] for name in previous)
+
+        postings = [self._postings.get(char) for char in set(text)]
+        if not postings:
+            return range(len(self._names))
+        if None in postings:
+            return []
+
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def _search(self, text):
+        result = dict()
+        names = self._names
+        lowered = self._lowered
+
+        if not text:
+            for idx in range(len(names)):
+                result[names[idx]] = (0, 0)
+            return result
+
+        pat = fuzzy_pattern(text)
+        for idx in self._candidates(text):
+            r = pat.search(lowered[idx])
+            if r:
+                result[names[idx]] = (-len(r.group()), -r.start())
+
+        return result
@@ -0,0 +1,157 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Process wide cache of the catalog metadata used by the SQL auto complete
+feature.
+
+Fetching the keywords, schemas, tables, columns, functions and datatypes
+from the database server is by far the most expensive part of a completion
+request. The metadata is cached per (server, database, search_path) so that
+subsequent requests only have to do the in-memory matching.
+"""
+
+import re
+import time
+from threading import Lock, RLock
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+
+from config import AUTOCOMPLETE_CACHE_MAX_ENTRIES, AUTOCOMPLETE_CACHE_TTL, \
+    AUTOCOMPLETE_CACHE_CHECK_INTERVAL
+
+# Command tags (and leading statement keywords) which may change the catalog
+# objects known to the auto complete feature.
+DDL_COMMAND_RE = re.compile(
+    r'\b(CREATE|ALTER|DROP|COMMENT|IMPORT\s+FOREIGN\s+SCHEMA)\b',
+    re.IGNORECASE
+)
+
+
+class CompletionMetadata(object):
+    """
+    class CompletionMetadata
+
+        Holds the state of a SQLAutoComplete object, which is shared by all
+        the completion requests for the same server, database and
+        search_path.
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self.lock = RLock()
+        self.created_at = time.time()
+        self.checked_at = self.created_at
+
+    def is_expired(self, ttl):
+        return (time.time() - self.created_at) > ttl
+
+    def needs_check(self, interval):
+        """
+        Returns True, if the catalog was not checked for the changes within
+        the given interval (in seconds).
+        """
+        return (time.time() - self.checked_at) >= interval
+
+
+class AutoCompleteCache(object):
+    """
+    class AutoCompleteCache
+
+        LRU cache of the CompletionMetadata objects with time based
+        expiry.
+    """
+
+    def __init__(self, max_entries, ttl, check_interval=0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_entries > 0
+
+    @staticmethod
+    def make_key(sid, did, search_path, keywords_in_uppercase=False):
+        return sid, did, tuple(search_path), bool(keywords_in_uppercase)
+
+    def get(self, key):
+        """
+        Returns the CompletionMetadata for the given key, or None if it was
+        never cached or has expired.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry.is_expired(self.ttl):
+                return None
+
+            # Mark it as the most recently used
+            self._entries[key] = entry
+
+        return entry
+
+    def put(self, key, state):
+        """
+        Caches the given SQLAutoComplete state, and returns the
+        CompletionMetadata object wrapping it.
+        """
+        entry = CompletionMetadata(state)
+
+        if not self.enabled:
+            return entry
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(False)
+
+        return entry
+
+    def invalidate(self, sid, did=None):
+        """
+        Removes all the cached metadata for the given server, and optionally
+        only for the given database.
+        """
+        with self._lock:
+            for key in list(self._entries.keys()):
+                if key[0] == sid and (did is None or key[1] == did):
+                    del self._entries[key]
+
+    def invalidate_if_ddl(self, sid, did, sql):
+        """
+        Removes the cached metadata for the given database, if the given
+        SQL statement (or command status tag) may have changed the catalog.
+
+        Returns:
+            True if the cache was invalidated
+        """
+        if sql and DDL_COMMAND_RE.search(sql):
+            self.invalidate(sid, did)
+            return True
+        return False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+autocomplete_cache = AutoCompleteCache(
+    AUTOCOMPLETE_CACHE_MAX_ENTRIES, AUTOCOMPLETE_CACHE_TTL,
+    AUTOCOMPLETE_CACHE_CHECK_INTERVAL
+)
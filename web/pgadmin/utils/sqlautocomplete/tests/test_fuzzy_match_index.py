@@ -0,0 +1,116 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.utils.sqlautocomplete.autocomplete import SQLAutoComplete, \
+    Candidate
+from pgadmin.utils.sqlautocomplete.matchindex import FuzzyMatchIndex, \
+    fuzzy_pattern, unescape_name
+from pgadmin.utils.sqlautocomplete.prioritization import PrevalenceCounter
+
+
+def linear_search(names, text):
+    """Match each of the names, as done by SQLAutoComplete.find_matches"""
+    pat = fuzzy_pattern(text)
+    result = dict()
+    for name in names:
+        r = pat.search(unescape_name(name.lower()))
+        if r:
+            result[name] = (-len(r.group()), -r.start())
+    return result
+
+
+class TestFuzzyMatchIndex(BaseTestGenerator):
+    """
+    Check the fuzzy match index returns the same matches as matching each
+    of the names, while typing the text.
+    """
+    scenarios = [
+        (
+            'Index returns the same matches for the quoted names',
+            dict(names=['users', '"Users"', 'user_roles', 'EndUsers',
+                        'orders', '"order items"'],
+                 texts=['', 'u', 'us', 'usr', 'ord', 'ri', 'z'])
+        ),
+        (
+            'Index returns the same matches while typing the text',
+            dict(names=['customer_id', 'customer_name', 'order_customer',
+                        'invoice_total', 'cust', 'account_status'],
+                 texts=['c', 'cu', 'cus', 'cust', 'custo', 'custom',
+                        'customer_i', 'customer_id', 'ct'])
+        ),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        index = FuzzyMatchIndex(self.names)
+
+        for text in self.texts:
+            self.assertEqual(
+                index.search(text), linear_search(self.names, text)
+            )
+
+
+def auto_complete(names, indexed):
+    """Auto complete over the given names, without a connection"""
+    completer = SQLAutoComplete.__new__(SQLAutoComplete)
+    completer.prioritizer = PrevalenceCounter([])
+    completer.all_completions = set(names)
+    completer.fuzzy_index = FuzzyMatchIndex()
+    # The index is only used for the cached auto complete metadata
+    completer.cache_entry = object() if indexed else None
+    return completer
+
+
+class TestFindMatches(BaseTestGenerator):
+    """
+    Check SQLAutoComplete.find_matches returns the same matches from the
+    index, as when matching each of the items.
+    """
+    scenarios = [
+        (
+            'Fuzzy matches of the names, and of the items not indexed',
+            dict(names=['users', '"Users"', 'user_roles', 'EndUsers',
+                        'orders', '"order items"', 'entries'],
+                 collection=['users', '"Users"', 'EndUsers', 'orders',
+                             'entries', 'Entries E', 'ur'],
+                 texts=['', 'e', 'u', 'us', 'usr', 'ord', 'ri', 'z'])
+        ),
+        (
+            'Fuzzy matches of the names, and of the candidates',
+            dict(names=['users', 'user_roles', 'orders'],
+                 collection=[Candidate('user_roles ur', synonyms=['ur']),
+                             'users', 'orders', Candidate('orders o')],
+                 texts=['', 'u', 'ur', 'ord', 'z'])
+        ),
+        (
+            'No matches of an empty collection',
+            dict(names=['users'], collection=iter([]), texts=['', 'u'])
+        ),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        def matches(completer, text):
+            return sorted(
+                (m.completion.text, m.priority)
+                for m in completer.find_matches(text, self.collection)
+            )
+
+        indexed = auto_complete(self.names, True)
+        linear = auto_complete(self.names, False)
+
+        for text in self.texts:
+            self.assertEqual(
+                matches(indexed, text), matches(linear, text)
+            )
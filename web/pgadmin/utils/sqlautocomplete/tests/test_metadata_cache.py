@@ -0,0 +1,90 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.utils.sqlautocomplete.metadata_cache import AutoCompleteCache
+
+
+class TestAutoCompleteMetadataCache(BaseTestGenerator):
+    """
+    Check the auto complete metadata cache lookup, eviction and
+    invalidation.
+    """
+    scenarios = [
+        (
+            'Cached metadata is returned for the same key',
+            dict(scenario=1)
+        ),
+        (
+            'Least recently used metadata is evicted',
+            dict(scenario=2)
+        ),
+        (
+            'Expired metadata is not returned',
+            dict(scenario=3)
+        ),
+        (
+            'Metadata is invalidated for the DDL statements only',
+            dict(scenario=4)
+        ),
+        (
+            'Catalog is checked for the changes after the check interval',
+            dict(scenario=5)
+        ),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        cache = AutoCompleteCache(2, 300)
+        key1 = cache.make_key(1, 10, ['public'])
+        key2 = cache.make_key(1, 11, ['public'])
+        key3 = cache.make_key(2, 10, ['pg_catalog', 'public'])
+
+        if self.scenario == 1:
+            entry = cache.put(key1, {'keywords': ['SELECT']})
+            self.assertIs(cache.get(cache.make_key(1, 10, ('public',))),
+                          entry)
+            self.assertIsNone(cache.get(key2))
+
+        if self.scenario == 2:
+            cache.put(key1, {})
+            cache.put(key2, {})
+            # Mark the first entry as recently used
+            cache.get(key1)
+            cache.put(key3, {})
+
+            self.assertIsNotNone(cache.get(key1))
+            self.assertIsNone(cache.get(key2))
+            self.assertIsNotNone(cache.get(key3))
+
+        if self.scenario == 3:
+            entry = cache.put(key1, {})
+            entry.created_at -= 301
+            self.assertIsNone(cache.get(key1))
+
+        if self.scenario == 4:
+            cache.put(key1, {})
+            cache.put(key2, {})
+
+            self.assertFalse(
+                cache.invalidate_if_ddl(1, 10, 'SELECT created FROM t')
+            )
+            self.assertIsNotNone(cache.get(key1))
+
+            self.assertTrue(cache.invalidate_if_ddl(1, 10, 'DROP TABLE t'))
+            self.assertIsNone(cache.get(key1))
+            self.assertIsNotNone(cache.get(key2))
+
+        if self.scenario == 5:
+            entry = cache.put(key1, {})
+            self.assertFalse(entry.needs_check(5))
+            entry.checked_at -= 5
+            self.assertTrue(entry.needs_check(5))
@@ -0,0 +1,84 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+from pgadmin.utils import csv
+from pgadmin.utils.route import BaseTestGenerator
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+ROWS = [
+    [1, u'text', 1.5, None, True],
+    [-20, u'with,separator', 0.0, u'x', False],
+    [300, u'with "quote"', -2.25, u'', None],
+    [None, u'', 1e20, u'multi\nline', True],
+    [4, u'NULL', 3, {'a': 1}, False],
+]
+COLUMN_KINDS = [
+    csv.NUMBER_COLUMN, csv.TEXT_COLUMN, csv.NUMBER_COLUMN, csv.TEXT_COLUMN,
+    csv.NUMBER_COLUMN
+]
+
+
+class CSVWriterRowsBlockTest(BaseTestGenerator):
+    """
+    Test the output of writer.writerows_block matches writer.writerows
+    (i.e. the fields prepared by the quote strategy), including the quoting,
+    the nulls and the booleans.
+    """
+    scenarios = [
+        ('Quote non numeric', dict(
+            options=dict(quoting=csv.QUOTE_NONNUMERIC, quotechar='"')
+        )),
+        ('Quote all with single quotes', dict(
+            options=dict(quoting=csv.QUOTE_ALL, quotechar="'",
+                         delimiter=';')
+        )),
+        ('Quote minimal', dict(
+            options=dict(quoting=csv.QUOTE_MINIMAL, quotechar='"')
+        )),
+        ('Quote non numeric with nulls replaced', dict(
+            options=dict(quoting=csv.QUOTE_NONNUMERIC, quotechar='"',
+                         replace_nulls_with='NULL')
+        )),
+        ('Quote all with escape character', dict(
+            options=dict(quoting=csv.QUOTE_ALL, quotechar='"',
+                         doublequote=False, escapechar='\\')
+        )),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        self._check(ROWS, COLUMN_KINDS)
+        # The column kinds not known
+        self._check(ROWS, None)
+        # A single column (the empty values are quoted)
+        self._check([[row[1]] for row in ROWS], [csv.TEXT_COLUMN])
+        self._check([[row[0]] for row in ROWS], [csv.NUMBER_COLUMN])
+
+    def _check(self, rows, column_kinds):
+        replace_nulls_with = self.options.get('replace_nulls_with')
+
+        expected = StringIO()
+        csv.writer(expected, **self.options).writerows(
+            [[replace_nulls_with if v is None else v for v in row]
+             for row in rows]
+        )
+
+        output = StringIO()
+        writer = csv.writer(output, **self.options)
+        # Twice, to use the cached formatters for the second block
+        writer.writerows_block(rows[:2], column_kinds)
+        writer.writerows_block(rows[2:], column_kinds)
+
+        self.assertEqual(output.getvalue(), expected.getvalue())
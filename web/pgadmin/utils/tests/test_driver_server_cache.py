@@ -0,0 +1,54 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import sys
+
+from pgadmin.utils.driver.psycopg2 import Driver
+from pgadmin.utils.route import BaseTestGenerator
+
+if sys.version_info < (3, 3):
+    from mock import patch, MagicMock
+else:
+    from unittest.mock import patch, MagicMock
+
+
+class TestDriverServerCache(BaseTestGenerator):
+    """
+    Check the existence of a server is looked up from the configuration
+    database only until it is cached, and again after invalidation.
+    """
+    scenarios = [
+        ('Invalidate the given server',
+         dict(invalidate_sid=1, expected_queries=3)),
+        ('Invalidate all the servers',
+         dict(invalidate_sid=None, expected_queries=3)),
+        ('Invalidate another server',
+         dict(invalidate_sid=2, expected_queries=2)),
+    ]
+
+    def setUp(self):
+        pass
+
+    @patch('pgadmin.utils.driver.psycopg2.Server')
+    def runTest(self, server_mock):
+        driver = Driver()
+
+        query = server_mock.query.filter_by.return_value
+        query.first.return_value = None
+        # Server does not exist (not cached)
+        self.assertFalse(driver._server_exists(1))
+
+        query.first.return_value = MagicMock(id=1)
+        self.assertTrue(driver._server_exists(1))
+        self.assertTrue(driver._server_exists(1))
+
+        driver.invalidate_server_cache(self.invalidate_sid)
+        self.assertTrue(driver._server_exists(1))
+
+        self.assertEqual(query.first.call_count, self.expected_queries)
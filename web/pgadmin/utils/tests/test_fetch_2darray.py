@@ -0,0 +1,100 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import time
+
+from pgadmin.utils.driver.psycopg2.cursor import DictCursor
+from pgadmin.utils.route import BaseTestGenerator
+from regression.python_test_utils import test_utils
+
+
+class TestFetch2DArray(BaseTestGenerator):
+    """
+    Check the rows fetched as 2D array by the DictCursor are same as the
+    rows generated from the dictionaries (as done earlier by the query
+    tool), and benchmark the rows fetched per second by both.
+    """
+    scenarios = [
+        (
+            'Fetch the pages of 1000 rows of a wide result with the '
+            'duplicate column names',
+            dict(num_columns=40, num_rows=20000, page_size=1000)
+        ),
+    ]
+
+    def setUp(self):
+        self.connection = test_utils.get_db_connection(
+            self.server['db'],
+            self.server['username'],
+            self.server['db_password'],
+            self.server['host'],
+            self.server['port'],
+            self.server['sslmode']
+        )
+        # Every column name is used twice
+        self.sql = 'SELECT {0} FROM generate_series(1, {1}) g'.format(
+            ', '.join(
+                "g + {0} AS c{1}, 'text ' || g AS t{1}".format(
+                    idx, idx % (self.num_columns // 4)
+                ) for idx in range(self.num_columns // 2)
+            ),
+            self.num_rows
+        )
+
+    def fetch_dict_rows(self):
+        cur = self.connection.cursor(cursor_factory=DictCursor)
+        cur.execute(self.sql)
+        # Names of the columns (with the duplicates renamed)
+        column_names = [desc[0] for desc in cur.ordered_description()]
+
+        result = []
+        while True:
+            rows = cur.fetchmany(self.page_size)
+            if not rows:
+                break
+            for row in rows:
+                new_row = []
+                for name in column_names:
+                    new_row.append(row[name])
+                result.append(new_row)
+        cur.close()
+        return result
+
+    def fetch_2darray(self):
+        cur = self.connection.cursor(cursor_factory=DictCursor)
+        cur.execute(self.sql)
+
+        result = []
+        while True:
+            rows = cur.fetchmany_2darray(self.page_size)
+            if not rows:
+                break
+            result.extend(rows)
+        cur.close()
+        return result
+
+    def runTest(self):
+        start = time.time()
+        expected = self.fetch_dict_rows()
+        dict_rate = self.num_rows / (time.time() - start)
+
+        start = time.time()
+        result = self.fetch_2darray()
+        array_rate = self.num_rows / (time.time() - start)
+
+        self.assertEqual(len(result), self.num_rows)
+        self.assertEqual(result, expected)
+        self.assertGreater(
+            array_rate, dict_rate,
+            '2D array: {0:.0f} rows/sec, Dictionary: {1:.0f} rows/sec'.format(
+                array_rate, dict_rate)
+        )
+
+    def tearDown(self):
+        self.connection.close()
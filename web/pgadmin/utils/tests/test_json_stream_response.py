@@ -0,0 +1,74 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import datetime
+import decimal
+
+import simplejson as json
+
+from pgadmin.utils.ajax import make_json_response, make_json_stream_response
+from pgadmin.utils.route import BaseTestGenerator
+
+
+class TestJSONStreamResponse(BaseTestGenerator):
+    """
+    Check the JSON document generated by make_json_stream_response is same
+    as the one generated by make_json_response.
+    """
+    scenarios = [
+        (
+            'Rows streamed in multiple chunks',
+            dict(
+                chunks=[
+                    [[1, 'a', None], [2, 'b', True]],
+                    [[3, u'é', decimal.Decimal('1.5')]],
+                    [[4, datetime.date(2019, 1, 1), [1, 2]]]
+                ],
+                expected=[
+                    [1, 'a', None], [2, 'b', True],
+                    [3, u'é', 1.5], [4, '2019-01-01', [1, 2]]
+                ]
+            )
+        ),
+        (
+            'Empty chunks are skipped',
+            dict(
+                chunks=[[], [[1]], [], [[2]]],
+                expected=[[1], [2]]
+            )
+        ),
+        (
+            'No chunks at all',
+            dict(chunks=[], expected=[])
+        ),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        data = {
+            'status': 'Success',
+            'has_more_rows': False,
+            'rows_fetched_from': 1,
+            'rows_fetched_to': len(self.expected)
+        }
+
+        response = make_json_stream_response(
+            'result', iter(self.chunks), data=data
+        )
+        self.assertEqual(response.mimetype, 'application/json')
+        streamed = json.loads(response.get_data(as_text=True))
+
+        data['result'] = self.expected
+        expected = json.loads(
+            make_json_response(data=data).get_data(as_text=True)
+        )
+
+        self.assertEqual(streamed, expected)
@@ -0,0 +1,83 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import time
+
+import psycopg2
+
+from pgadmin.utils.driver.psycopg2.connection import Connection
+from pgadmin.utils.route import BaseTestGenerator
+
+
+class TestLongPoll(BaseTestGenerator):
+    """
+    Check the poll of the asynchronous query waits for the result up to the
+    given timeout, and returns early when the query has finished or a notice
+    has been received.
+    """
+    scenarios = [
+        ('Query finishing before the timeout', dict(
+            sql='SELECT pg_sleep(0.5)',
+            timeout=5,
+            expected_status=Connection.ASYNC_OK,
+            min_time=0.5, max_time=3
+        )),
+        ('Query running longer than the timeout', dict(
+            sql='SELECT pg_sleep(5)',
+            timeout=1,
+            expected_status=Connection.ASYNC_READ_TIMEOUT,
+            min_time=1, max_time=3
+        )),
+        ('Query raising a notice before the timeout', dict(
+            sql="DO $$ BEGIN PERFORM pg_sleep(0.5); "
+                "RAISE NOTICE 'long poll'; PERFORM pg_sleep(5); END $$",
+            timeout=5,
+            expected_status=Connection.ASYNC_READ_TIMEOUT,
+            min_time=0.5, max_time=3
+        )),
+        ('Poll without the timeout', dict(
+            sql='SELECT pg_sleep(5)',
+            timeout=None,
+            expected_status=Connection.ASYNC_READ_TIMEOUT,
+            min_time=0, max_time=1
+        )),
+    ]
+
+    def setUp(self):
+        self.conn = psycopg2.connect(
+            database=self.server['db'],
+            user=self.server['username'],
+            password=self.server['db_password'],
+            host=self.server['host'],
+            port=self.server['port'],
+            sslmode=self.server['sslmode'],
+            async_=1
+        )
+        # Only the constants of the connection are used to wait
+        self.pg_conn = Connection.__new__(Connection)
+        self.pg_conn._wait(self.conn)
+
+    def runTest(self):
+        cur = self.conn.cursor()
+        cur.execute(self.sql)
+
+        start = time.time()
+        status = self.pg_conn._wait_timeout(self.conn, self.timeout)
+        elapsed = time.time() - start
+
+        self.assertEqual(status, self.expected_status)
+        self.assertGreaterEqual(elapsed, self.min_time)
+        self.assertLess(elapsed, self.max_time)
+
+        if 'NOTICE' in self.sql:
+            self.assertIn('long poll', ''.join(self.conn.notices))
+
+    def tearDown(self):
+        self.conn.cancel()
+        self.conn.close()
@@ -0,0 +1,159 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from flask import Flask
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.utils.session import SQLiteSessionManager
+
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
+
+class TestSQLiteSessionManager(BaseTestGenerator):
+    """
+    Check the sessions stored by the SQLiteSessionManager, and shared by
+    multiple processes.
+    """
+    scenarios = [
+        ('Store and validate the sessions shared by two processes',
+         dict(scenario='shared_sessions')),
+        ('Serve the cached session only if its version is current',
+         dict(scenario='version_invalidation')),
+        ('Write the session only if changed, or to extend its expiry',
+         dict(scenario='write_coalescing')),
+        ('Remove the expired sessions',
+         dict(scenario='expired_cleanup')),
+    ]
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+
+    def create_sqlite_manager(self):
+        return SQLiteSessionManager(
+            os.path.join(self.path, 'sessions.db'), 'secret', 3600, 1000
+        )
+
+    def runTest(self):
+        self.manager = self.create_sqlite_manager()
+        # Another worker process sharing the same database
+        self.other = self.create_sqlite_manager()
+
+        with self.app.test_request_context('/browser/'):
+            getattr(self, self.scenario)()
+
+    def _new_session(self, manager):
+        session = manager.new_session()
+        session['gridData'] = {'1': {'transaction_ref': 'abc'}}
+        manager.put(session)
+        return session
+
+    def _count_sessions(self):
+        return self.manager._connection().execute(
+            'SELECT count(*) FROM session').fetchone()[0]
+
+    def shared_sessions(self):
+        session = self.manager.new_session()
+        self.assertFalse(self.manager.exists(session.sid))
+        session['gridData'] = {'1': {'transaction_ref': 'abc'}}
+        self.manager.put(session)
+
+        self.assertTrue(self.other.exists(session.sid))
+        other_session = self.other.get(session.sid, session.hmac_digest)
+        self.assertEqual(dict(other_session), dict(session))
+
+        # Wrong digest results in a new session
+        self.assertNotEqual(
+            self.other.get(session.sid, 'wrong').sid, session.sid
+        )
+
+        self.manager.remove(session.sid)
+        self.assertFalse(self.other.exists(session.sid))
+
+    def version_invalidation(self):
+        session = self._new_session(self.manager)
+        digest = session.hmac_digest
+
+        # The cached session is served while its version is current
+        self.assertIs(self.manager.get(session.sid, digest), session)
+
+        # Changes made by the other process change the version, hence - the
+        # cached session is not served stale
+        other_session = self.other.get(session.sid, digest)
+        other_session['auth_token'] = 'token'
+        self.other.put(other_session)
+        self.assertNotEqual(
+            self.manager._version(session.sid),
+            self.manager._cache[session.sid][0]
+        )
+
+        session = self.manager.get(session.sid, digest)
+        self.assertEqual(session['auth_token'], 'token')
+        self.assertIs(self.manager.get(session.sid, digest), session)
+
+    def write_coalescing(self):
+        session = self._new_session(self.manager)
+        digest = session.hmac_digest
+        version = self.manager._version(session.sid)
+
+        # Unchanged session is not written again
+        self.manager.put(self.manager.get(session.sid, digest))
+        self.assertEqual(self.manager._version(session.sid), version)
+
+        # Unless forced to
+        session.force_write = True
+        self.manager.put(session)
+        self.assertNotEqual(self.manager._version(session.sid), version)
+        version = self.manager._version(session.sid)
+
+        # Changed session is written
+        session['auth_token'] = 'token'
+        self.manager.put(session)
+        self.assertNotEqual(self.manager._version(session.sid), version)
+        version = self.manager._version(session.sid)
+
+        # Unchanged session is written to extend its expiry, once a tenth
+        # of its lifetime has passed since written
+        now = time.time()
+        with patch('pgadmin.utils.session.time.time',
+                   return_value=now + 3600 * 0.1 + 1):
+            self.manager.put(session)
+        self.assertNotEqual(self.manager._version(session.sid), version)
+
+    def expired_cleanup(self):
+        expired = self._new_session(self.manager)
+        current = self._new_session(self.manager)
+
+        self.manager._connection().execute(
+            'UPDATE session SET expires = ? WHERE sid = ?',
+            (time.time() - 1, expired.sid)
+        )
+        # The expired session is not served, even if cached
+        self.assertFalse(self.manager.exists(expired.sid))
+        self.assertNotEqual(
+            self.manager.get(expired.sid, expired.hmac_digest).sid,
+            expired.sid
+        )
+
+        self.assertEqual(self._count_sessions(), 2)
+        self.other.cleanup()
+        self.assertEqual(self._count_sessions(), 1)
+        self.assertTrue(self.manager.exists(current.sid))
+
+    def tearDown(self):
+        shutil.rmtree(self.path, True)
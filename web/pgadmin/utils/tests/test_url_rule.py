@@ -0,0 +1,115 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import sys
+
+from werkzeug.routing import Map, Rule
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.utils.url_rule import LazyBuilderRule
+
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
+
+class TestLazyBuilderRule(BaseTestGenerator):
+    """
+    Build the URLs using the rules compiling the URL builders on first use.
+    """
+    scenarios = [
+        (
+            'Build the URL without any argument',
+            dict(
+                rule='/browser/', values=dict(),
+                expected='/browser/'
+            )
+        ),
+        (
+            'Build the URL with the arguments',
+            dict(
+                rule='/browser/table/obj/<int:gid>/<int:sid>/<int:did>/'
+                     '<int:scid>/<int:tid>',
+                values=dict(gid=1, sid=2, did=3, scid=4, tid=5),
+                expected='/browser/table/obj/1/2/3/4/5'
+            )
+        ),
+        (
+            'Build the URL with the unknown arguments',
+            dict(
+                rule='/sqleditor/poll/<int:trans_id>',
+                values=dict(trans_id=7, long_poll=1),
+                expected='/sqleditor/poll/7?long_poll=1'
+            )
+        ),
+        (
+            'Build the URL with the default argument',
+            dict(
+                rule='/misc/<path:filename>',
+                values=dict(),
+                defaults=dict(filename='index.html'),
+                expected='/misc/index.html'
+            )
+        ),
+        (
+            'Compile the URL builder on first use',
+            dict(compile_on_first_use=True)
+        ),
+    ]
+
+    def setUp(self):
+        pass
+
+    def runTest(self):
+        if getattr(self, 'compile_on_first_use', False):
+            return self._compile_on_first_use()
+
+        defaults = getattr(self, 'defaults', None)
+        url_map = Map()
+        rule = LazyBuilderRule(self.rule, endpoint='test', defaults=defaults)
+        url_map.add(rule)
+        expected_rule = Rule(self.rule, endpoint='test', defaults=defaults)
+        Map().add(expected_rule)
+
+        adapter = url_map.bind('localhost')
+        self.assertEqual(adapter.build('test', self.values), self.expected)
+
+        for append_unknown in (True, False):
+            self.assertEqual(
+                rule.build(self.values, append_unknown),
+                expected_rule.build(self.values, append_unknown)
+            )
+
+        # The URL is matched by the rule too
+        if not defaults:
+            self.assertEqual(
+                adapter.match(self.expected.split('?')[0])[1],
+                dict((k, v) for k, v in self.values.items()
+                     if k in rule.arguments)
+            )
+
+    def _compile_on_first_use(self):
+        compile_builder = Rule._compile_builder
+        with patch.object(Rule, '_compile_builder', autospec=True,
+                          side_effect=compile_builder) as compiled:
+            url_map = Map()
+            rule = LazyBuilderRule('/browser/table/obj/<int:tid>',
+                                   endpoint='test')
+            url_map.add(rule)
+            self.assertEqual(compiled.call_count, 0)
+
+            adapter = url_map.bind('localhost')
+            self.assertEqual(adapter.build('test', dict(tid=1)),
+                             '/browser/table/obj/1')
+            self.assertEqual(compiled.call_count, 1)
+
+            self.assertEqual(adapter.build('test', dict(tid=2)),
+                             '/browser/table/obj/2')
+            self.assertEqual(compiled.call_count, 1)
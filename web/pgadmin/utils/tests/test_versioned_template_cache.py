@@ -0,0 +1,187 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import os
+import shutil
+import tempfile
+
+from flask import Blueprint, Flask
+from jinja2 import FileSystemLoader
+from jinja2 import TemplateNotFound
+
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.utils.versioned_template_loader import VersionedTemplateLoader
+
+NUMBER_OF_BLUEPRINTS = 3
+# Version mapping directories of the templates of the blueprints
+VERSION_DIRECTORIES = ('default', '9.5_plus', '11_plus', 'gpdb_5.0_plus')
+
+
+class TestVersionedTemplateCache(BaseTestGenerator):
+    """
+    Resolve the versioned templates using the index of the templates, and the
+    cache of the resolved paths.
+    """
+    scenarios = [
+        (
+            'Resolve the templates same as without the cache',
+            dict(scenario='same_as_uncached')
+        ),
+        (
+            'Resolve the template added after indexing the templates',
+            dict(scenario='added_template')
+        ),
+        (
+            'Index the templates again when a blueprint is registered',
+            dict(scenario='new_blueprint')
+        ),
+        (
+            'Resolve the templates of the blueprints for each server version '
+            'same as without the cache',
+            dict(scenario='indexed_same_as_uncached')
+        ),
+    ]
+
+    def setUp(self):
+        self.template_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.template_dir, ignore_errors=True)
+
+    def runTest(self):
+        getattr(self, self.scenario)()
+
+    def _write_template(self, path, content):
+        path = os.path.join(self.template_dir, path)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as fp:
+            fp.write(content)
+
+    def _make_app(self, blueprints=0):
+        app = FakeApp()
+        for idx in range(blueprints):
+            folder = os.path.join(self.template_dir, 'bp{0}'.format(idx))
+            for version_dir in VERSION_DIRECTORIES:
+                self._write_template(
+                    os.path.join('bp{0}'.format(idx),
+                                 'module{0}'.format(idx), 'sql',
+                                 version_dir, 'nodes.sql'),
+                    'SELECT {0} -- {1}'.format(idx, version_dir)
+                )
+            app.register_blueprint(
+                Blueprint('bp{0}'.format(idx), __name__,
+                          template_folder=folder)
+            )
+        return app
+
+    def same_as_uncached(self):
+        app = FakeApp()
+        loader = VersionedTemplateLoader(app)
+        uncached = VersionedTemplateLoader(app)
+
+        for template in (
+            "some_feature/sql/#90100#/some_action.sql",
+            "some_feature/sql/#90200#/some_action.sql",
+            "some_feature/sql/#100000#/some_action.sql",
+            "some_feature/sql/#90000#/some_action_with_default.sql",
+            "some_feature/sql/#gpdb#80323#/some_action_with_gpdb_5_0.sql",
+            "some_feature/sql/#gpdb#80323#/some_action_with_default.sql",
+            "some_feature/sql/9.1_plus/some_action.sql",
+        ):
+            # Twice, i.e. the resolved path from the cache too
+            for _ in range(2):
+                self.assertEqual(
+                    loader.get_source(None, template)[:2],
+                    uncached._get_source_uncached(None, template)[:2]
+                )
+
+        for template in (
+            "some_feature/sql/#90000#/some_action.sql",
+            "some_feature/sql/#gpdb#50100#/some_action.sql",
+        ):
+            self.assertRaises(
+                TemplateNotFound, loader.get_source, None, template
+            )
+
+    def added_template(self):
+        app = FakeApp()
+        app.jinja_loader = FileSystemLoader(self.template_dir)
+        loader = VersionedTemplateLoader(app)
+        loader.build_index()
+
+        self.assertRaises(
+            TemplateNotFound, loader.get_source, None,
+            "feature/sql/#90600#/nodes.sql"
+        )
+
+        self._write_template(
+            'feature/sql/9.5_plus/nodes.sql', 'SELECT 95'
+        )
+        self.assertEqual(
+            loader.get_source(None, "feature/sql/#90600#/nodes.sql")[0],
+            'SELECT 95'
+        )
+
+    def new_blueprint(self):
+        app = self._make_app(blueprints=1)
+        loader = VersionedTemplateLoader(app)
+        loader.build_index()
+
+        self._write_template(
+            'late/late_module/sql/11_plus/nodes.sql', 'SELECT 11'
+        )
+        app.register_blueprint(Blueprint(
+            'late', __name__,
+            template_folder=os.path.join(self.template_dir, 'late')
+        ))
+
+        source, filename, _ = loader.get_source(
+            None, "late_module/sql/#120000#/nodes.sql"
+        )
+        self.assertEqual(source, 'SELECT 11')
+        self.assertIn('late_module/sql/11_plus/nodes.sql', filename)
+
+    def indexed_same_as_uncached(self):
+        app = self._make_app(blueprints=NUMBER_OF_BLUEPRINTS)
+        loader = VersionedTemplateLoader(app)
+        uncached = VersionedTemplateLoader(app)
+        index = loader.build_index()
+
+        for idx in range(NUMBER_OF_BLUEPRINTS):
+            for version_dir in VERSION_DIRECTORIES:
+                self.assertIn(
+                    'module{0}/sql/{1}/nodes.sql'.format(idx, version_dir),
+                    index
+                )
+
+            for version in ('#90400#', '#90500#', '#100000#', '#110000#',
+                            '#120000#', '#gpdb#80323#', '#gpdb#80000#'):
+                template = 'module{0}/sql/{1}/nodes.sql'.format(idx, version)
+                source, filename, _ = uncached._get_source_uncached(
+                    None, template
+                )
+
+                # Twice, i.e. the resolved path from the cache too
+                for _ in range(2):
+                    self.assertEqual(
+                        loader.get_source(None, template)[:2],
+                        (source, filename)
+                    )
+                self.assertTrue(filename.replace(os.sep, '/').endswith(
+                    loader._resolved[template]
+                ))
+
+
+class FakeApp(Flask):
+    def __init__(self):
+        super(FakeApp, self).__init__("")
+        self.jinja_loader = FileSystemLoader(
+            os.path.dirname(os.path.realpath(__file__)) + "/templates"
+        )
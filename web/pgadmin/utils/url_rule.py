@@ -0,0 +1,46 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2019, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+URL rule of the application, compiling the URL builder functions of the
+rule on first use.
+
+Werkzeug compiles two URL builder functions (Python code generated, and
+compiled, per rule) when a rule is added to the URL map, which is most of
+the time taken by the application creation, while only a few of the rules
+are ever used to build the URLs (i.e. url_for) in a worker.
+"""
+
+from threading import Lock
+
+from werkzeug.routing import Rule
+
+
+class LazyBuilderRule(Rule):
+    """
+    class LazyBuilderRule
+
+        Rule compiling its URL builder functions, when used first time.
+    """
+
+    def _compile_builder(self, append_unknown=True):
+        compile_builder = super(LazyBuilderRule, self)._compile_builder
+        builder = []
+        lock = Lock()
+
+        def build(rule, *args, **kwargs):
+            if not builder:
+                with lock:
+                    if not builder:
+                        builder.append(
+                            compile_builder(append_unknown).__get__(rule, None)
+                        )
+            return builder[0](*args, **kwargs)
+
+        return build
@@ -6,30 +6,130 @@
 # This software is released under the PostgreSQL Licence
 #
 ##########################################################################
+
+"""
+Jinja loader resolving the versioned template paths (i.e.
+'<dir>/#<version>#/<file>' or '<dir>/#<server type>#<version>#/<file>') to
+the template of the most recent version mapping directory, not newer than
+the given version.
+
+The names of all the templates of the application, and its blueprints, are
+indexed (against their loader) once, and the resolved paths are cached
+against the versioned template paths, so that resolving a template does not
+need to look for it in each version mapping directory (and each loader).
+"""
+
+from threading import Lock
+
 from flask.templating import DispatchingJinjaLoader
 from jinja2 import TemplateNotFound
 
 
 class VersionedTemplateLoader(DispatchingJinjaLoader):
+    def __init__(self, app):
+        super(VersionedTemplateLoader, self).__init__(app)
+        # template name => loader having the template
+        self._index = None
+        # Number of the blueprints, when the templates were indexed
+        self._indexed_blueprints = 0
+        # versioned template path => resolved template path
+        self._resolved = dict()
+        self._lock = Lock()
+
+    @property
+    def use_cache(self):
+        # Look for the templates on every render, when the templates are
+        # reloaded on change (i.e. the new templates must be found too).
+        return not self.app.config['EXPLAIN_TEMPLATE_LOADING'] and \
+            not self.app.templates_auto_reload
+
+    def build_index(self):
+        """
+        Index the names of the templates of the application, and its
+        blueprints, against the (first) loader having them.
+        """
+        index = dict()
+        blueprints = len(self.app.blueprints)
+
+        for _, loader in self._iter_loaders(None):
+            for name in loader.list_templates():
+                if name not in index:
+                    index[name] = loader
+
+        with self._lock:
+            self._index = index
+            self._indexed_blueprints = blueprints
+            self._resolved.clear()
+
+        return index
+
+    def _template_index(self):
+        index = self._index
+        # Index again, when a blueprint has been registered since
+        if index is None or \
+                self._indexed_blueprints != len(self.app.blueprints):
+            index = self.build_index()
+        return index
+
     def get_source(self, environment, template):
+        if not self.use_cache:
+            return self._get_source_uncached(environment, template)
+
+        index = self._template_index()
+        template_path = self._resolved.get(template)
+
+        if template_path is None:
+            template_path = self._resolve(environment, template, index)
+            self._resolved[template] = template_path
+
+        loader = index.get(template_path)
+        if loader is not None:
+            try:
+                return loader.get_source(environment, template_path)
+            except TemplateNotFound:
+                # Removed after indexing the templates
+                self._resolved.pop(template, None)
+
+        return super(VersionedTemplateLoader, self).get_source(
+            environment, template_path
+        )
+
+    def _resolve(self, environment, template, index):
+        """
+        Returns the path of the template to be used for the given (versioned)
+        template path.
+        """
         specified_version_number, exists = parse_version(template)
         if not exists:
-            return super(VersionedTemplateLoader, self).get_source(
-                environment, template
-            )
+            return template
 
-        template_dir, file_name = parse_template(template)
+        candidates = get_template_paths(template, specified_version_number)
 
-        for version_mapping in get_version_mapping(template):
-            if version_mapping['number'] > specified_version_number:
+        for template_path in candidates:
+            if template_path in index:
+                return template_path
+
+        # The template may have been added after indexing the templates
+        for template_path in candidates:
+            try:
+                super(VersionedTemplateLoader, self).get_source(
+                    environment, template_path
+                )
+                return template_path
+            except TemplateNotFound:
                 continue
+        raise TemplateNotFound(template)
 
-            template_path = '/'.join([
-                template_dir,
-                version_mapping['name'],
-                file_name
-            ])
+    def _get_source_uncached(self, environment, template):
+        specified_version_number, exists = parse_version(template)
+        if not exists:
+            return super(VersionedTemplateLoader, self).get_source(
+                environment, template
+            )
 
+        for template_path in get_template_paths(
+            template, specified_version_number
+        ):
             try:
                 return super(VersionedTemplateLoader, self).get_source(
                     environment, template_path
@@ -39,6 +139,20 @@ class VersionedTemplateLoader(DispatchingJinjaLoader):
         raise TemplateNotFound(template)
 
 
+def get_template_paths(template, specified_version_number):
+    """
+    Returns the paths of the given template in the version mapping
+    directories not newer than the specified version, the most recent first.
+    """
+    template_dir, file_name = parse_template(template)
+
+    return [
+        '/'.join([template_dir, version_mapping['name'], file_name])
+        for version_mapping in get_version_mapping(template)
+        if version_mapping['number'] <= specified_version_number
+    ]
+
+
 def parse_version(template):
     template_path_parts = template.split("#", 3)
     if len(template_path_parts) == 1:
@@ -226,6 +226,39 @@ describe('ExecuteQuery', () => {
               }, 0);
             });
           });
+
+          context('when the server has waited for the query', () => {
+            beforeEach(() => {
+              response = {
+                data: {
+                  status: 'Busy',
+                  long_poll: true,
+                },
+              };
+
+              networkMock.onGet('/sqleditor/query_tool/poll/123').reply(200, response);
+              executeQuery.poll();
+              executeQuery.poll = jasmine.createSpy('ExecuteQuery.poll');
+            });
+
+            it('should ask the server to wait for the query', (done) => {
+              setTimeout(() => {
+                expect(networkMock.history.get[0].params)
+                  .toEqual({'long_poll': 1});
+                done();
+              }, 0);
+            });
+
+            it('should poll again without a delay', (done) => {
+              setTimeout(() => {
+                expect(executeQuery.poll)
+                  .toHaveBeenCalled();
+                expect(executeQuery.delayedPoll)
+                  .not.toHaveBeenCalled();
+                done();
+              }, 0);
+            });
+          });
         });
 
         describe('when the application lost connection with the database', () => {
@@ -9,22 +9,28 @@
 
 from jinja2 import BaseLoader
 from jinja2 import Environment
+from jinja2 import FileSystemLoader
 
 
 class SimpleTemplateLoader(BaseLoader):
     """ This class pretends to load whatever file content it is initialized
-    with"""
+    with, the templates it imports (e.g. the macros) are loaded from the
+    search path, if given"""
 
-    def __init__(self, file_content):
+    def __init__(self, file_content, search_path=None):
         self.file_content = file_content
+        self.loader = FileSystemLoader(search_path) \
+            if search_path is not None else None
 
-    def get_source(self, *args):
-        return self.file_content, "fake-file-name", True
+    def get_source(self, environment, template):
+        if template and self.loader is not None:
+            return self.loader.get_source(environment, template)
+        return self.file_content, "fake-file-name", lambda: True
 
 
-def file_as_template(file_path):
+def file_as_template(file_path, search_path=None):
     """This method returns a jinja template for the given filepath """
     file_content = open(file_path, 'r').read()
-    env = Environment(loader=SimpleTemplateLoader(file_content))
+    env = Environment(loader=SimpleTemplateLoader(file_content, search_path))
     template = env.get_template("")
     return template